@@ -4,6 +4,8 @@
 ##################################################
 
 import csv
+import io
+import os
 
 ## Fonctions de lecture et ecriture d'un repertoire (dictionnaire) dans un fichier csv
 
@@ -41,6 +43,63 @@ Verse le contenu du repertoite rep (dictionnaire) dans le fichier nomf.csv
     myfile.close()
 
 
+## Fonctions du journal (modifications ajoutées à la fin d'un fichier au lieu de réécrire tout le repertoire)
+
+def append_journal(modifications:dict,nomf:str,deplacees:set=frozenset())-> None:
+    """
+append_journal(modifications:dict,nomf:str,deplacees:set=frozenset())->None
+Ajoute les modifications ({nom: [numero, email, favori] ou None si supprimé}) à la fin du journal nomf
+Chaque ligne : '+;nom;numero;email;favori' (ajout/modification) ou '-;nom;;;' (suppression)
+Les noms de deplacees sont supprimés avant d'être ajoutés (l'entrée passe à la fin du répertoire en rechargeant)
+    """
+    # Ouverture du journal en ajout (créé s'il n'existe pas)
+    myfile = open(nomf,'a', encoding="utf-8", newline='')
+    mywriter = csv.writer(myfile, delimiter=';', dialect='excel', lineterminator='\n')
+
+    # Ecriture des modifications
+    for n,t in modifications.items():
+        if t is None or n in deplacees:
+            mywriter.writerow(['-',n,'','',''])
+        if t is not None:
+            mywriter.writerow(['+',n,t[0],t[1],t[2]])
+
+    # Ecriture sur le disque avant de fermer (le journal doit survivre à un arrêt brutal)
+    myfile.flush()
+    os.fsync(myfile.fileno())
+    myfile.close()
+
+def read_journal(rep:dict,nomf:str)-> int:
+    """
+read_journal(rep:dict,nomf:str)->int
+Rejoue les modifications du journal nomf sur le repertoire rep et retourne le nombre de lignes rejouées
+(0 si le journal n'existe pas, une dernière ligne incomplète après un arrêt brutal est ignorée)
+    """
+    try:
+        myfile = open(nomf,'rt', encoding="utf-8", newline='')
+    except FileNotFoundError:
+        return 0
+    contenu = myfile.read()
+    myfile.close()
+
+    # Ligne incomplète à la fin : écriture interrompue, ignorée
+    if not contenu.endswith('\n'):
+        contenu = contenu[:contenu.rfind('\n') + 1]
+
+    nb_lignes = 0
+    for row in csv.reader(io.StringIO(contenu, newline=''), delimiter=';', dialect='excel', lineterminator='\n'):
+        if len(row) != 5:
+            continue
+        if row[0] == '+':
+            rep[row[1]]=[row[2],row[3],row[4]]
+        elif row[0] == '-':
+            rep.pop(row[1], None)
+        else:
+            continue
+        nb_lignes += 1
+
+    return nb_lignes
+
+
 ## Fonctionnalités
 
 
@@ -0,0 +1,384 @@
+"""
+Fichier : ES_sqlite.py
+Date de création : 18 octobre 2026
+Description : Module pour stocker un répertoire dans une base SQLite (pour les très grands répertoires)
+Le répertoire s'utilise comme un dictionnaire {nom: [numero, email, favori]} mais n'est pas chargé en mémoire
+"""
+
+from collections.abc import Mapping, MutableMapping
+import argparse
+import csv
+import re
+import sqlite3
+
+EXTENSIONS = (".db", ".sqlite", ".sqlite3") # Extensions des fichiers ouverts avec SQLite
+COLONNES = ("nom", "numero", "email")       # Colonnes dans lesquelles on peut chercher du texte
+CHAMPS_REQUETE = COLONNES + ("favori",)     # Champs acceptés dans une requête composée
+MODES_REQUETE = ("exact", "prefixe", "contient", "regex")
+TAILLE_LOT = 10000                          # Nombre d'entrées insérées à la fois pendant l'importation d'un CSV
+FIN_PREFIXE = "\U0010ffff"                  # Plus grand caractère : prefixe + FIN_PREFIXE est après tous les textes commençant par prefixe
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    id INTEGER PRIMARY KEY,
+    nom TEXT NOT NULL UNIQUE,
+    numero TEXT NOT NULL DEFAULT '',
+    email TEXT NOT NULL DEFAULT '',
+    favori TEXT NOT NULL DEFAULT '',
+    numero_normalise TEXT
+);
+CREATE INDEX IF NOT EXISTS contacts_numero ON contacts(numero);
+CREATE INDEX IF NOT EXISTS contacts_email ON contacts(email);
+CREATE INDEX IF NOT EXISTS contacts_favori ON contacts(favori);
+"""
+INDEX_NUMERO_NORMALISE = "CREATE INDEX IF NOT EXISTS contacts_numero_normalise ON contacts(numero_normalise)"
+
+# Index plein texte par trigrammes (recherche de sous-chaînes), tenu à jour par des triggers
+TRIGGERS_FTS = {
+    "contacts_ajout": """CREATE TRIGGER IF NOT EXISTS contacts_ajout AFTER INSERT ON contacts BEGIN
+    INSERT INTO contacts_fts(rowid, nom, numero, email) VALUES (new.id, new.nom, new.numero, new.email);
+END""",
+    "contacts_suppression": """CREATE TRIGGER IF NOT EXISTS contacts_suppression AFTER DELETE ON contacts BEGIN
+    INSERT INTO contacts_fts(contacts_fts, rowid, nom, numero, email) VALUES ('delete', old.id, old.nom, old.numero, old.email);
+END""",
+    "contacts_modification": """CREATE TRIGGER IF NOT EXISTS contacts_modification AFTER UPDATE ON contacts BEGIN
+    INSERT INTO contacts_fts(contacts_fts, rowid, nom, numero, email) VALUES ('delete', old.id, old.nom, old.numero, old.email);
+    INSERT INTO contacts_fts(rowid, nom, numero, email) VALUES (new.id, new.nom, new.numero, new.email);
+END"""}
+SCHEMA_FTS = ("CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5(nom, numero, email, content='contacts', content_rowid='id', tokenize='trigram case_sensitive 1');\n"
+              + ";\n".join(TRIGGERS_FTS.values()) + ";")
+
+
+def _regexp(motif:str, texte:str)->bool:
+    return re.search(motif, texte) is not None # Fonction appelée par SQLite pour "texte REGEXP motif"
+
+
+def est_base_sqlite(nomf:str)->bool:
+    '''
+    Savoir si un fichier doit être ouvert avec SQLite (d'après son extension)
+
+    Paramètres :
+    nomf (str) : Chemin d'accès du fichier
+
+    Renvoie :
+    (bool) : True si l'extension est dans EXTENSIONS
+    '''
+
+    return nomf.lower().endswith(EXTENSIONS)
+
+
+class SelectionSQLite(Mapping):
+    '''
+    Résultat d'une recherche dans une base SQLite, utilisable comme un dictionnaire {nom: [numero, email, favori]} (lecture seule)
+    Les entrées ne sont pas chargées en mémoire : chaque utilisation refait la requête
+    (len() compte les entrées, items() les lit au fur et à mesure)
+    '''
+
+    def __init__(self, connexion, condition:str, parametres:tuple):
+        self.connexion = connexion
+        self.condition = condition
+        self.parametres = parametres
+
+    def __getitem__(self, nom:str)->list:
+        ligne = self.connexion.execute(f"SELECT numero, email, favori FROM contacts WHERE nom = ? AND {self.condition}",
+                                       (nom,) + self.parametres).fetchone()
+        if ligne is None:
+            raise KeyError(nom)
+        return list(ligne)
+
+    def __contains__(self, nom)->bool:
+        return self.connexion.execute(f"SELECT 1 FROM contacts WHERE nom = ? AND {self.condition}", (nom,) + self.parametres).fetchone() is not None
+
+    def __iter__(self):
+        for (nom,) in self.connexion.execute(f"SELECT nom FROM contacts WHERE {self.condition} ORDER BY id", self.parametres):
+            yield nom
+
+    def __len__(self)->int:
+        return self.connexion.execute(f"SELECT count(*) FROM contacts WHERE {self.condition}", self.parametres).fetchone()[0]
+
+    def items(self):
+        '''
+        Entrées trouvées (nom, [numero, email, favori]) dans l'ordre d'ajout, lues au fur et à mesure
+        '''
+
+        requete = f"SELECT nom, numero, email, favori FROM contacts WHERE {self.condition} ORDER BY id"
+        for nom, numero, email, favori in self.connexion.execute(requete, self.parametres):
+            yield nom, [numero, email, favori]
+
+
+class RepertoireSQLite(MutableMapping):
+    '''
+    Répertoire stocké dans une base SQLite, utilisable comme un dictionnaire {nom: [numero, email, favori]}
+    Les modifications sont faites dans une transaction : elles sont écrites dans le fichier par commit()
+    et perdues si le répertoire est fermé sans commit()
+    normaliser (fonction ou None) : fonction qui donne la forme normalisée d'un numéro, pour rechercher_numero()
+    (les numéros ajoutés sans cette fonction sont normalisés à la prochaine ouverture avec)
+
+    Exemple :
+    >>> repertoire = RepertoireSQLite("repertoire.db")
+    >>> repertoire["Foo"] = ["123", "foo@bar.com", "★"]
+    >>> repertoire.commit()
+    >>> print(dict(repertoire.rechercher("nom", "Fo"))) # Résultat lu seulement quand il est utilisé
+    {"Foo": ["123", "foo@bar.com", "★"]}
+    '''
+
+    def __init__(self, nomf:str, normaliser=None):
+        self.nomf = nomf
+        self.normaliser = normaliser
+        self.connexion = sqlite3.connect(nomf)
+        self.connexion.create_function("regexp", 2, _regexp, deterministic=True)
+        self.connexion.executescript(SCHEMA)
+        if "numero_normalise" not in [colonne[1] for colonne in self.connexion.execute("PRAGMA table_info(contacts)")]:
+            self.connexion.execute("ALTER TABLE contacts ADD COLUMN numero_normalise TEXT") # Base créée par une version précédente
+        self.connexion.execute(INDEX_NUMERO_NORMALISE)
+        if normaliser is not None: # Normaliser les numéros qui ne le sont pas encore
+            self.connexion.create_function("normaliser_numero", 1, normaliser, deterministic=True)
+            self.connexion.execute("UPDATE contacts SET numero_normalise = normaliser_numero(numero) WHERE numero_normalise IS NULL")
+        try:
+            self.connexion.executescript(SCHEMA_FTS)
+            self.fts = True
+        except sqlite3.OperationalError: # SQLite compilé sans FTS5 ou trop ancien (trigrammes : version 3.34)
+            self.fts = False
+        self.connexion.commit()
+
+    ## Fonctions d'un dictionnaire
+
+    def __getitem__(self, nom:str)->list:
+        ligne = self.connexion.execute("SELECT numero, email, favori FROM contacts WHERE nom = ?", (nom,)).fetchone()
+        if ligne is None:
+            raise KeyError(nom)
+        return list(ligne)
+
+    def __setitem__(self, nom:str, valeur:list)->None:
+        numero_normalise = None if self.normaliser is None else self.normaliser(valeur[0])
+        self.connexion.execute("INSERT INTO contacts(nom, numero, email, favori, numero_normalise) VALUES (?, ?, ?, ?, ?) "
+                               "ON CONFLICT(nom) DO UPDATE SET numero = excluded.numero, email = excluded.email, favori = excluded.favori, "
+                               "numero_normalise = excluded.numero_normalise",
+                               (nom, valeur[0], valeur[1], valeur[2], numero_normalise))
+
+    def __delitem__(self, nom:str)->None:
+        if self.connexion.execute("DELETE FROM contacts WHERE nom = ?", (nom,)).rowcount == 0:
+            raise KeyError(nom)
+
+    def __contains__(self, nom)->bool:
+        return self.connexion.execute("SELECT 1 FROM contacts WHERE nom = ?", (nom,)).fetchone() is not None
+
+    def __iter__(self):
+        for (nom,) in self.connexion.execute("SELECT nom FROM contacts ORDER BY id"):
+            yield nom
+
+    def __len__(self)->int:
+        return self.connexion.execute("SELECT count(*) FROM contacts").fetchone()[0]
+
+    def items(self):
+        '''
+        Toutes les entrées (nom, [numero, email, favori]) dans l'ordre d'ajout, lues au fur et à mesure
+        '''
+
+        for nom, numero, email, favori in self.connexion.execute("SELECT nom, numero, email, favori FROM contacts ORDER BY id"):
+            yield nom, [numero, email, favori]
+
+    ## Recherches (avec les index)
+
+    def _selectionner(self, condition:str, parametres:tuple)->SelectionSQLite:
+        return SelectionSQLite(self.connexion, condition, parametres) # Rien n'est lu avant d'utiliser le résultat
+
+    def rechercher(self, colonne:str, texte:str, mode:str="contient")->dict:
+        '''
+        Chercher les entrées dont une colonne contient/commence par/est égale à un texte
+
+        Paramètres :
+        colonne (str) : "nom", "numero" ou "email"
+        texte (str) : Texte cherché
+        mode (str) : "contient" (index plein texte), "prefixe" ou "exact" (index de la colonne)
+
+        Renvoie :
+        resultat (SelectionSQLite) : Entrées correspondantes (lues seulement quand elles sont utilisées)
+        '''
+
+        if colonne not in COLONNES:
+            raise ValueError(f"Colonne inconnue : {colonne}")
+        if mode == "exact":
+            return self._selectionner(f"{colonne} = ?", (texte,))
+        if mode == "prefixe":
+            return self._selectionner(f"{colonne} >= ? AND {colonne} < ?", (texte, texte + FIN_PREFIXE))
+        if mode != "contient":
+            raise ValueError(f"Mode de recherche inconnu : {mode}")
+        parametres = []
+        return self._selectionner(self._condition_contient(colonne, texte, parametres), tuple(parametres))
+
+    def _condition_contient(self, colonne:str, texte:str, parametres:list)->str:
+        if not texte:                    # Texte vide : aucun filtre
+            return "1"
+        if self.fts and len(texte) >= 3: # Un trigramme au moins : l'index plein texte donne les candidats
+            phrase = '"' + texte.replace('"', '""') + '"'
+            parametres += [f"{colonne} : {phrase}", texte]
+            return f"(id IN (SELECT rowid FROM contacts_fts WHERE contacts_fts MATCH ?) AND instr({colonne}, ?) > 0)"
+        parametres.append(texte)
+        return f"instr({colonne}, ?) > 0" # Texte trop court : parcours de la table
+
+    def rechercher_requete(self, requete:tuple)->dict:
+        '''
+        Chercher les entrées qui vérifient une requête composée (voir rep_func.search_query), traduite en condition SQL
+        (SQLite choisit lui-même l'index le plus sélectif)
+
+        Paramètres :
+        requete (tuple) : (champ, mode, valeur), ("et", [requêtes]) ou ("ou", [requêtes])
+
+        Renvoie :
+        resultat (SelectionSQLite) : Entrées correspondantes (lues seulement quand elles sont utilisées)
+        '''
+
+        parametres = []
+        condition = self._condition_requete(requete, parametres)
+        return self._selectionner(condition, tuple(parametres))
+
+    def _condition_requete(self, requete:tuple, parametres:list)->str:
+        # Les champs et modes sont écrits dans le SQL : seuls ceux des listes sont acceptés (les valeurs sont des paramètres)
+        if not isinstance(requete, (tuple, list)) or len(requete) not in (2, 3):
+            raise ValueError(f"Requête invalide : {requete!r}")
+        if len(requete) == 2: # Combinaison
+            operateur, sous_requetes = requete
+            if operateur not in ("et", "ou"):
+                raise ValueError(f"Opérateur inconnu : {operateur} (\"et\" ou \"ou\")")
+            if not sous_requetes:
+                return "1" if operateur == "et" else "0"
+            conditions = [self._condition_requete(sous_requete, parametres) for sous_requete in sous_requetes]
+            return "(" + (" AND " if operateur == "et" else " OR ").join(conditions) + ")"
+        champ, mode, valeur = requete
+        if champ not in CHAMPS_REQUETE:
+            raise ValueError(f"Champ inconnu : {champ}")
+        if mode not in MODES_REQUETE:
+            raise ValueError(f"Mode de recherche inconnu : {mode}")
+        if champ == "favori":
+            return "favori != ''" if valeur else "favori = ''"
+        if champ == "numero" and mode in ("exact", "prefixe"): # Numéros comparés une fois normalisés
+            if self.normaliser is None:
+                raise ValueError("Base ouverte sans fonction de normalisation des numéros")
+            champ, valeur = "numero_normalise", self.normaliser(valeur)
+        if mode == "exact":
+            parametres.append(valeur)
+            return f"{champ} = ?"
+        if mode == "prefixe":
+            parametres += [valeur, valeur + FIN_PREFIXE]
+            return f"({champ} >= ? AND {champ} < ?)"
+        if mode == "regex":
+            parametres.append(valeur)
+            return f"{champ} REGEXP ?"
+        return self._condition_contient(champ, valeur, parametres)
+
+    def rechercher_numero(self, numero_normalise:str, mode:str="exact")->dict:
+        '''
+        Chercher les entrées dont le numéro normalisé est égal à/commence par un numéro déjà normalisé
+
+        Paramètres :
+        numero_normalise (str) : Numéro normalisé (avec la fonction normaliser donnée à l'ouverture)
+        mode (str) : "exact" ou "prefixe"
+
+        Renvoie :
+        resultat (SelectionSQLite) : Entrées correspondantes (lues seulement quand elles sont utilisées)
+        '''
+
+        if self.normaliser is None:
+            raise ValueError("Base ouverte sans fonction de normalisation des numéros")
+        if mode == "exact":
+            return self._selectionner("numero_normalise = ?", (numero_normalise,))
+        if mode == "prefixe":
+            return self._selectionner("numero_normalise >= ? AND numero_normalise < ?", (numero_normalise, numero_normalise + FIN_PREFIXE))
+        raise ValueError(f"Mode de recherche inconnu : {mode}")
+
+    def rechercher_favori(self, est_favori:bool)->dict:
+        '''
+        Chercher les entrées qui font partie des favoris (ou pas)
+        '''
+
+        return self._selectionner("favori != ''" if est_favori else "favori = ''", ())
+
+    ## Transactions
+
+    def commit(self)->None:
+        self.connexion.commit()
+
+    def close(self)->None:
+        self.connexion.close() # Les modifications sans commit() sont annulées
+
+
+## Importation/exportation au format CSV (même format que ES_csv)
+
+def import_csv(nomf_csv:str, nomf_db:str)->int:
+    '''
+    Ajouter les entrées d'un fichier CSV dans une base SQLite (les entrées de même nom sont remplacées)
+    Le fichier est lu au fur et à mesure : il n'est jamais chargé entièrement en mémoire
+
+    Paramètres :
+    nomf_csv (str) : Chemin d'accès du fichier CSV
+    nomf_db (str) : Chemin d'accès de la base (créée si elle n'existe pas)
+
+    Renvoie :
+    nb_entrees (int) : Nombre d'entrées lues
+    '''
+
+    repertoire = RepertoireSQLite(nomf_db)
+    repertoire.connexion.execute("BEGIN") # Importation en une seule transaction (rien n'est importé en cas d'erreur)
+    if repertoire.fts: # Index plein texte reconstruit une seule fois à la fin (plus rapide que ligne par ligne)
+        for trigger in TRIGGERS_FTS:
+            repertoire.connexion.execute(f"DROP TRIGGER {trigger}")
+    # Numéro normalisé remis à NULL : recalculé à la prochaine ouverture avec RepertoireSQLite (comme pour les nouvelles entrées)
+    requete = ("INSERT INTO contacts(nom, numero, email, favori) VALUES (?, ?, ?, ?) "
+               "ON CONFLICT(nom) DO UPDATE SET numero = excluded.numero, email = excluded.email, favori = excluded.favori, "
+               "numero_normalise = NULL")
+    nb_entrees = 0
+    with open(nomf_csv, 'rt', encoding="utf-8", newline='') as myfile:
+        lot = []
+        for row in csv.reader(myfile, delimiter=';', dialect='excel', lineterminator='\n'):
+            lot.append((row[0], row[1], row[2], row[3]))
+            if len(lot) == TAILLE_LOT:
+                repertoire.connexion.executemany(requete, lot)
+                nb_entrees += len(lot)
+                lot = []
+        repertoire.connexion.executemany(requete, lot)
+        nb_entrees += len(lot)
+    if repertoire.fts:
+        repertoire.connexion.execute("INSERT INTO contacts_fts(contacts_fts) VALUES ('rebuild')")
+        for trigger in TRIGGERS_FTS.values():
+            repertoire.connexion.execute(trigger) # Dans la même transaction : index et triggers restent cohérents
+    repertoire.commit()
+    repertoire.close()
+    return nb_entrees
+
+
+def export_csv(nomf_db:str, nomf_csv:str)->int:
+    '''
+    Ecrire toutes les entrées d'une base SQLite dans un fichier CSV (lisible par ES_csv.read_rep)
+
+    Paramètres :
+    nomf_db (str) : Chemin d'accès de la base
+    nomf_csv (str) : Chemin d'accès du fichier CSV (écrasé)
+
+    Renvoie :
+    nb_entrees (int) : Nombre d'entrées écrites
+    '''
+
+    repertoire = RepertoireSQLite(nomf_db)
+    nb_entrees = 0
+    with open(nomf_csv, 'w', encoding="utf-8", newline='') as myfile:
+        mywriter = csv.writer(myfile, delimiter=';', dialect='excel', lineterminator='\n')
+        for n, t in repertoire.items():
+            mywriter.writerow([n, t[0], t[1], t[2]])
+            nb_entrees += 1
+    repertoire.close()
+    return nb_entrees
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Importer/exporter un répertoire entre un fichier CSV et une base SQLite")
+    parser.add_argument("operation", choices=["import", "export"], help="import : CSV vers SQLite, export : SQLite vers CSV")
+    parser.add_argument("source", help="fichier lu")
+    parser.add_argument("destination", help="fichier écrit")
+    arguments = parser.parse_args()
+
+    if arguments.operation == "import":
+        nb_entrees = import_csv(arguments.source, arguments.destination)
+    else:
+        nb_entrees = export_csv(arguments.source, arguments.destination)
+    print(f"{nb_entrees} entrées copiées dans {arguments.destination}")
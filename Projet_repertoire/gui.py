@@ -11,6 +11,7 @@ from tkinter import ttk # Pour le tableau
 from pygame import mixer # Pour le son
 import rep_func as rep # Fonctions du répertoire
 import re # Pour vérifier e-mail
+from itertools import islice # Pour afficher seulement le début des très grands répertoires
 import webbrowser # Easter egg
 
 # Variables modifiables dans toutes les fonctions de façon globale
@@ -19,6 +20,15 @@ repertoire_ouvert = False
 changements_effectues = False
 est_dans_recherche = False
 
+# Nombre maximum d'entrées affichées dans le tableau (au-delà, utiliser la recherche)
+NB_ENTREES_AFFICHEES_MAX = 5000
+
+# Modes de recherche affichés dans la fenêtre de recherche et mode correspondant pour rep.search_query
+MODES_RECHERCHE = {"contient": "contient", "commence par": "prefixe", "exact": "exact", "regex": "regex"}
+
+# Types de fichiers des répertoires (CSV ou base SQLite pour les très grands répertoires)
+TYPES_FICHIERS = [("Répertoires", "*.csv *.db *.sqlite *.sqlite3"), ("CSV files", "*.csv"), ("Base SQLite", "*.db *.sqlite *.sqlite3")]
+
 # Chemins d'accès aux images et sons
 REPYRTOIRE_DIR = __file__.rstrip(basename(__file__)) # Obtenir le chemin d'accès absolu des fichiers pour pouvoir exécuter peu importe le répertoire de travail courant
 
@@ -149,8 +159,15 @@ def effacer_tableau_et_inserer(dic:dict)->None:
     for entree in entrees_tableau.get_children():
       entrees_tableau.delete(entree)
 
+    # Nombre d'entrées affichées (les très grands répertoires ne sont pas affichés entièrement)
+    nb_entrees = len(dic)
+    if nb_entrees > NB_ENTREES_AFFICHEES_MAX:
+        fenetre_principale.wm_title(f"Repyrtoire ({NB_ENTREES_AFFICHEES_MAX} entrées affichées sur {nb_entrees}, utilisez la recherche)")
+    else:
+        fenetre_principale.wm_title("Repyrtoire")
+
     # Rajouter toutes les entrées dans le dictionnaire donné
-    for nom, valeur in dic.items(): # Pour chaque entrée dans le dictionnaire
+    for nom, valeur in islice(dic.items(), NB_ENTREES_AFFICHEES_MAX): # Pour chaque entrée dans le dictionnaire (au plus NB_ENTREES_AFFICHEES_MAX)
         numero = valeur[0]
         email = valeur[1]
         favori = valeur[2]
@@ -176,7 +193,7 @@ def nouveau_repertoire()->None:
         return
 
     # Obtenir un chemin d'accès au fichier à créer
-    filename = filedialog.asksaveasfilename(initialfile=".csv", filetypes=[("CSV files", "*.csv")]) # Boîte de dialogue de fichier
+    filename = filedialog.asksaveasfilename(initialfile=".csv", filetypes=TYPES_FICHIERS) # Boîte de dialogue de fichier
     if not filename: return # Si la boîte de dialogue a été fermée en annulant
 
     # Créer le répertoire et réinitialiser le tableau des entrées
@@ -206,7 +223,7 @@ def ouvrir_repertoire()->None:
         return
 
     # Obtenir le chemin d'accès au répertoire
-    filename = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")]) # Boîte de dialogue de fichier affichant les fichiers CSV disponibles
+    filename = filedialog.askopenfilename(filetypes=TYPES_FICHIERS) # Boîte de dialogue de fichier affichant les fichiers CSV disponibles
     if not filename: return # Si la boîte de dialogue a été fermée sans ouvrir de fichier
 
     # Ouvrir le répertoire, réinitialiser le tableau des entrées et insérer le contenu du répertoire dedans
@@ -488,35 +505,29 @@ def reinitialiser_recherche()->None:
     est_dans_recherche = False
 
 
-def rechercher_et_inserer(critere:str, nom:str, numero:str, email:str, est_favori:bool)->None:
+def rechercher_et_inserer(criteres:list, combinaison:str)->None:
     '''
-    Rechercher selon le nom/numero/email/favori et affiche les résultats dans le tableau des entrées
+    Rechercher selon une combinaison de critères (nom/numero/email/favori) et affiche les résultats dans le tableau des entrées
 
     Paramètres :
-    - critere (str) : "nom" ou "numero" ou "email" ou "favori"
-    - nom (str) : Nom
-    - numero (str) : Numéro
-    - email (str) : E-mail
-    - est_favori (bool) : Favori/non-favori (True/False)
+    - criteres (list) : Critères sélectionnés, chacun (champ, mode, valeur) (voir rep.search_query)
+    - combinaison (str) : "et" (tous les critères vérifiés) ou "ou" (au moins un critère vérifié)
 
     Renvoie :
     None
     '''
 
     # Si aucun critère n'est sélectionné
-    if not critere:
+    if not criteres:
         message_popup("Erreur", ERROR_ICON_FILEPATH, "Aucun critère n'est sélectionné!", ERROR_SFX_FILEPATH) # Afficher un message d'erreur via une fenêtre popup
         return # Ne pas effectuer de recherche
 
-    # Rechercher en fonction du critère sélectionné
-    if critere == "nom":
-        resultat_recherche = rep.search_name(repertoire, nom) # Rechercher en fonction du nom
-    elif critere == "numero":
-        resultat_recherche = rep.search_number(repertoire, numero) # Rechercher en fonction du numéro
-    elif critere == "email":
-        resultat_recherche = rep.search_email(repertoire, email) # Rechercher en fonction de l'e-mail
-    elif critere == "favori":
-        resultat_recherche = rep.search_favorite(repertoire, est_favori) # Rechercher en fonction du favori/non-favori
+    # Rechercher en fonction de tous les critères sélectionnés en une seule fois
+    try:
+        resultat_recherche = rep.search_query(repertoire, (combinaison, criteres))
+    except ValueError as erreur: # Expression régulière invalide
+        message_popup("Erreur", ERROR_ICON_FILEPATH, str(erreur), ERROR_SFX_FILEPATH) # Afficher un message d'erreur via une fenêtre popup
+        return # Ne pas afficher de résultat
 
     # Afficher les résultats de la recherche dans le tableau d'entrées
     effacer_tableau_et_inserer(resultat_recherche)
@@ -545,18 +556,21 @@ def ouvrir_fenetre_rechercher()->None:
     fenetre_rechercher.title("Rechercher")
     fenetre_rechercher.resizable(0, 0)
 
-    # Bouton radio pour sélectionner le critère de recherche
-    critere_recherche = StringVar()
-    nom_bouton_radio = Radiobutton(fenetre_rechercher, variable=critere_recherche, value="nom")
-    numero_bouton_radio = Radiobutton(fenetre_rechercher, variable=critere_recherche, value="numero")
-    email_bouton_radio = Radiobutton(fenetre_rechercher, variable=critere_recherche, value="email")
-    favori_bouton_radio = Radiobutton(fenetre_rechercher, variable=critere_recherche, value="favori")
-
-    # Placer les boutons radio tout à gauche sur la même colonne
-    nom_bouton_radio.grid(row=0, column=0, padx=5)
-    numero_bouton_radio.grid(row=1, column=0, padx=5)
-    email_bouton_radio.grid(row=2, column=0, padx=5)
-    favori_bouton_radio.grid(row=3, column=0, padx=5)
+    # Cases à cocher pour sélectionner les critères de recherche (plusieurs possibles)
+    nom_selectionne = BooleanVar()
+    numero_selectionne = BooleanVar()
+    email_selectionne = BooleanVar()
+    favori_selectionne = BooleanVar()
+    nom_case_critere = Checkbutton(fenetre_rechercher, variable=nom_selectionne)
+    numero_case_critere = Checkbutton(fenetre_rechercher, variable=numero_selectionne)
+    email_case_critere = Checkbutton(fenetre_rechercher, variable=email_selectionne)
+    favori_case_critere = Checkbutton(fenetre_rechercher, variable=favori_selectionne)
+
+    # Placer les cases des critères tout à gauche sur la même colonne
+    nom_case_critere.grid(row=0, column=0, padx=5)
+    numero_case_critere.grid(row=1, column=0, padx=5)
+    email_case_critere.grid(row=2, column=0, padx=5)
+    favori_case_critere.grid(row=3, column=0, padx=5)
 
     # Texte à côté des champs de saisie
     nom_texte = Label(fenetre_rechercher, text="Nom :")
@@ -564,7 +578,7 @@ def ouvrir_fenetre_rechercher()->None:
     email_texte = Label(fenetre_rechercher, text="E-mail :")
     favori_texte = Label(fenetre_rechercher, text="Favori ?")
 
-    # Placer les textes entres les boutons radios et les champs de saisie
+    # Placer les textes entres les cases des critères et les champs de saisie
     nom_texte.grid(row=0, column=1, padx=(0,5))
     numero_texte.grid(row=1, column=1, padx=(0,5))
     email_texte.grid(row=2, column=1, padx=(0,5))
@@ -579,18 +593,53 @@ def ouvrir_fenetre_rechercher()->None:
     est_favori = StringVar()
     favori_case_a_cocher = Checkbutton(fenetre_rechercher, variable=est_favori, onvalue='★', offvalue='')
 
-    # Placer les champs de saisie et la case à cocher dans la même colonne tout à droite    
+    # Placer les champs de saisie et la case à cocher dans la même colonne
     nom_champ_de_saisie.grid(row=0, column=2, padx=5, pady=5)
     numero_champ_de_saisie.grid(row=1, column=2, padx=5, pady=(0,5))
     email_champ_de_saisie.grid(row=2, column=2, padx=5, pady=(0,5))
     favori_case_a_cocher.grid(row=3, column=2, padx=5, pady=(0,5), sticky='w')
 
+    # Listes pour choisir comment comparer le texte saisi (le numéro exact ou son début est cherché peu importe son écriture)
+    nom_mode = ttk.Combobox(fenetre_rechercher, values=list(MODES_RECHERCHE), state="readonly", width=13)
+    numero_mode = ttk.Combobox(fenetre_rechercher, values=list(MODES_RECHERCHE), state="readonly", width=13)
+    email_mode = ttk.Combobox(fenetre_rechercher, values=list(MODES_RECHERCHE), state="readonly", width=13)
+    for mode in (nom_mode, numero_mode, email_mode):
+        mode.current(0) # "contient" par défaut (comme avant)
+
+    # Placer les listes tout à droite
+    nom_mode.grid(row=0, column=3, padx=(0,5), pady=5)
+    numero_mode.grid(row=1, column=3, padx=(0,5), pady=(0,5))
+    email_mode.grid(row=2, column=3, padx=(0,5), pady=(0,5))
+
+    # Boutons radio pour combiner les critères
+    combinaison = StringVar(value="et")
+    et_bouton_radio = Radiobutton(fenetre_rechercher, variable=combinaison, value="et", text="Tous les critères")
+    ou_bouton_radio = Radiobutton(fenetre_rechercher, variable=combinaison, value="ou", text="Au moins un critère")
+    et_bouton_radio.grid(row=4, column=0, columnspan=2, padx=5, sticky='w')
+    ou_bouton_radio.grid(row=4, column=2, columnspan=2, padx=5, sticky='w')
+
+    def criteres_selectionnes()->list:
+        '''
+        Critères cochés sous forme (champ, mode, valeur) pour rep.search_query
+        '''
+
+        criteres = []
+        if nom_selectionne.get():
+            criteres.append(("nom", MODES_RECHERCHE[nom_mode.get()], nom_champ_de_saisie.get()))
+        if numero_selectionne.get():
+            criteres.append(("numero", MODES_RECHERCHE[numero_mode.get()], numero_champ_de_saisie.get()))
+        if email_selectionne.get():
+            criteres.append(("email", MODES_RECHERCHE[email_mode.get()], email_champ_de_saisie.get()))
+        if favori_selectionne.get():
+            criteres.append(("favori", "exact", bool(est_favori.get())))
+        return criteres
+
     # Cadre pour les boutons standards
     bouton_cadre = Frame(fenetre_rechercher) 
-    bouton_cadre.grid(row=4, column=0, columnspan=3, padx=5, pady=5) # Placer le cadre en bas
+    bouton_cadre.grid(row=5, column=0, columnspan=4, padx=5, pady=5) # Placer le cadre en bas
 
     # Boutons de recherche et de réinitialisation de recherche
-    rechercher_bouton = Button(bouton_cadre, text="Rechercher", command=lambda: rechercher_et_inserer(critere_recherche.get(), nom_champ_de_saisie.get(), numero_champ_de_saisie.get(), email_champ_de_saisie.get(), bool(est_favori.get())))
+    rechercher_bouton = Button(bouton_cadre, text="Rechercher", command=lambda: rechercher_et_inserer(criteres_selectionnes(), combinaison.get()))
     reinitialiser_bouton = Button(bouton_cadre, text="Réinitialiser", command=reinitialiser_recherche)
 
     # Placer les boutons sur la même ligne dans le cadre et centre les boutons
@@ -660,13 +709,13 @@ def ouvrir_fenetre_aide()->None:
     explication_texte.grid(row=2, columnspan=8, pady=(0,8)) # Placer le texte au centre en bas
 
     # Explications pour chaque bouton d'action
-    nouveau_repertoire_explication = "Créer un nouveau répertoire dans un fichier au format CSV"
-    ouvrir_repertoire_explication = "Ouvrir un répertoire à partir d'un fichier au format CSV"
+    nouveau_repertoire_explication = "Créer un nouveau répertoire dans un fichier au format CSV (ou .db pour une base SQLite)"
+    ouvrir_repertoire_explication = "Ouvrir un répertoire à partir d'un fichier au format CSV (ou d'une base SQLite)"
     enregistrer_explication = "Enregistrer les modifications faites au répertoire"
     ajouter_explication = "Ajouter une entrée au répertoire"
     supprimer_explication = "Supprimer une entrée du répertoire"
     modifier_explication = "Modifier une entrée du répertoire"
-    rechercher_explication = "Chercher des entrées à partir du nom/numéro/e-mail/favoris"
+    rechercher_explication = "Chercher des entrées en combinant nom/numéro/e-mail/favoris (numéro exact : à qui est un numéro)"
     aide_explication = "Ouvrir cette fenêtre"
 
 
@@ -2,14 +2,48 @@
 Fichier : rep_func.py
 Date de création : 27 mars 2024
 Description : Module contenant les fonctions pour effectuer des opérations sur un répertoire sous forme de fichier CSV
+(ou de base SQLite pour les très grands répertoires, voir ES_sqlite)
 """
 
 import ES_csv
+import ES_sqlite
+from array import array
+import os
+import re
+import threading
+
+TAILLE_MAX_JOURNAL = 4 << 20 # Taille du journal (en octets) à partir de laquelle il est fusionné dans le fichier CSV
+
+_modifications = {} # Entrées modifiées depuis le dernier enregistrement : {nom: [numero, email, favori] ou None si supprimée}
+_deplacees = set()  # Entrées supprimées puis ajoutées de nouveau depuis le dernier enregistrement (placées à la fin du répertoire)
+_compactage = None  # Thread du compactage en cours (ou None)
+_base = None        # Base SQLite ouverte (ou None)
+
+# Index de trigrammes (sous-chaînes de 3 caractères) du répertoire chargé par init_rep, pour les recherches
+_repertoire_indexe = None   # Répertoire indexé (les autres dictionnaires sont parcourus entièrement)
+_identifiants = {}          # {nom: identifiant de l'entrée}
+_noms = []                  # Nom de chaque identifiant (None si l'entrée a été supprimée)
+_index = [None, None, None] # Pour le nom, le numéro et l'e-mail : {trigramme: array des identifiants} (None si pas encore construit)
+_nb_obsoletes = 0           # Nombre d'entrées supprimées ou modifiées depuis la construction (identifiants restés dans l'index)
+
+# Index des numéros normalisés du répertoire chargé par init_rep (recherche de l'appelant, début de numéro)
+INDICATIF_PAYS = "33"       # Indicatif ajouté aux numéros nationaux (commençant par un seul 0)
+TAILLE_SEAU = 64            # Nombre de numéros dans une feuille de l'arbre avant de la découper
+_NON_CHIFFRES = re.compile(r"[^0-9]")
+
+# Requêtes composées (search_query)
+CHAMPS_REQUETE = ("nom", "numero", "email", "favori")
+COUT_MODES = {"exact": 1, "prefixe": 2, "contient": 3, "regex": 5} # Coût relatif d'un test, les moins coûteux sont faits en premier
+_proprietaires = None       # {numéro normalisé: liste des noms} (None si pas encore construit)
+_arbre_numeros = None       # Arbre des préfixes des numéros normalisés (None si pas encore construit)
 
 def init_rep(filename:str)->dict:
     '''
     Initialiser le répertoire à partir d'un fichier CSV déjà existant ou en créer un si le fichier n'existe pas
     Obligatoire pour utiliser les autres fonctions (stocke le chemin d'accès de façon permanente pour éviter redondance)
+    Les modifications enregistrées dans le journal (fichier "<filename>.journal") sont rejouées sur le fichier CSV
+    Si l'extension du fichier est .db, .sqlite ou .sqlite3, le répertoire est une base SQLite (ES_sqlite.RepertoireSQLite)
+    qui s'utilise comme un dictionnaire mais n'est pas chargée en mémoire
 
     Paramètres :
     filename (str) : Chemin d'accès du fichier
@@ -27,15 +61,34 @@ def init_rep(filename:str)->dict:
     {"Foo": ["123", "foo@bar.com", "★"], "Spam": ["456", "spam@eggs.com", ""]}
     '''
 
-    global _csv_filename                    # Variable permanente pour stocker le chemin d'accès au fichier
+    global _csv_filename, _base             # Variables permanentes pour stocker le chemin d'accès au fichier et la base SQLite ouverte
+    _attendre_compactage()                  # Terminer l'enregistrement du répertoire précédent
+    _modifications.clear()                  # Oublier les modifications non enregistrées du répertoire précédent
+    _deplacees.clear()
+    _fermer_base()                          # Fermer la base SQLite précédente (modifications non enregistrées annulées)
+    _indexer(None)                          # Oublier l'index du répertoire précédent
+    if ES_sqlite.est_base_sqlite(filename): # Si le répertoire est une base SQLite
+        _base = ES_sqlite.RepertoireSQLite(filename, normaliser_numero) # Ouvrir la base (créée si elle n'existe pas)
+        _csv_filename = filename
+        return _base
     try:                                    # Essayer de...
         donnees = ES_csv.read_rep(filename) # Lire les données du fichier à partir du chemin donné
         _csv_filename = filename            # Stocker le chemin du fichier de façon permanente
+        ES_csv.read_journal(donnees, _ancien_journal())   # Rejouer un compactage interrompu
+        ES_csv.read_journal(donnees, _journal())          # Rejouer les modifications enregistrées depuis
+        if os.path.exists(_ancien_journal()) or _taille_journal() > TAILLE_MAX_JOURNAL:
+            compact_rep(donnees)            # Fusionner le journal dans le fichier CSV (en arrière-plan)
+        _indexer(donnees)                   # Préparer l'index de trigrammes pour les recherches
         return donnees                      # Renvoyer les données du répertoire (en dictionnaire)
     except FileNotFoundError:               # Mais si le fichier n'existe pas
         ES_csv.write_rep({}, filename)      # Créer un répertoire (fichier) vide
         _csv_filename = filename            # Stocker le chemin du fichier de façon permanente
-        return {}                           # Renvoyer un dictionnaire vide
+        for journal in (_journal(), _ancien_journal()):
+            if os.path.exists(journal):     # Supprimer les journaux d'un ancien fichier du même nom
+                os.remove(journal)
+        donnees = {}
+        _indexer(donnees)                   # Préparer l'index de trigrammes pour les recherches
+        return donnees                      # Renvoyer un dictionnaire vide
     except Exception as e:                  # Mais si d'autres erreurs se produisent
         print(e)                            # Afficher un message d'erreur
         exit()                              # Arrêter l'exécution
@@ -44,6 +97,8 @@ def init_rep(filename:str)->dict:
 def save_rep(repertoire:dict)->None:
     '''
     Enregistrer le répertoire (modifié ou pas)
+    Seules les entrées ajoutées, modifiées ou supprimées depuis le dernier enregistrement sont écrites, à la fin du journal
+    Le journal est fusionné dans le fichier CSV en arrière-plan quand il dépasse TAILLE_MAX_JOURNAL octets
 
     Paramètres:
     repertoire (dict) : Répertoire
@@ -52,7 +107,95 @@ def save_rep(repertoire:dict)->None:
     None
     '''
 
-    ES_csv.write_rep(repertoire, _csv_filename)
+    if isinstance(repertoire, ES_sqlite.RepertoireSQLite): # Base SQLite : valider la transaction
+        repertoire.commit()
+        _modifications.clear()
+        _deplacees.clear()
+        return
+    _ecrire_modifications()                               # Ajouter les modifications à la fin du journal
+    if _taille_journal() > TAILLE_MAX_JOURNAL:            # Si le journal est devenu trop grand
+        compact_rep(repertoire)                           # Le fusionner dans le fichier CSV
+
+
+def compact_rep(repertoire:dict, attendre:bool=False)->None:
+    '''
+    Enregistrer le répertoire, réécrire le fichier CSV avec tout le répertoire et vider le journal
+    La réécriture se fait dans un thread : le répertoire peut continuer à être modifié et enregistré pendant ce temps
+    (les nouveaux enregistrements vont dans un nouveau journal)
+
+    Paramètres :
+    repertoire (dict) : Répertoire
+    attendre (bool) : Attendre la fin de la réécriture
+
+    Renvoie :
+    None
+    '''
+
+    global _compactage
+    _ecrire_modifications()                               # Enregistrer d'abord les modifications en attente
+    _attendre_compactage()                                # Un seul compactage à la fois
+    donnees = dict(repertoire)                            # Copie du répertoire (les entrées modifiées sont remplacées, pas modifiées)
+    if os.path.exists(_ancien_journal()):                 # Compactage précédent interrompu : tout réécrire sans thread
+        _ecrire_instantane(donnees, _csv_filename, [_journal(), _ancien_journal()])
+        return
+    if os.path.exists(_journal()):
+        os.replace(_journal(), _ancien_journal())         # Les enregistrements suivants iront dans un nouveau journal
+    _compactage = threading.Thread(target=_ecrire_instantane, args=(donnees, _csv_filename, [_ancien_journal()]))
+    _compactage.start()                                   # Thread non-daemon : terminé avant la fin du programme
+    if attendre:
+        _attendre_compactage()
+
+
+def _ecrire_instantane(donnees:dict, filename:str, journaux:list)->None:
+    '''
+    Réécrire le fichier CSV (dans un fichier temporaire remplacé d'un coup) puis supprimer les journaux fusionnés
+    '''
+
+    temporaire = filename + ".tmp"
+    ES_csv.write_rep(donnees, temporaire)   # Un arrêt brutal pendant l'écriture laisse l'ancien fichier intact
+    with open(temporaire, 'rb+') as fichier:
+        os.fsync(fichier.fileno())          # Ecrire sur le disque avant de remplacer
+    os.replace(temporaire, filename)
+    for journal in journaux:
+        if os.path.exists(journal):
+            os.remove(journal)
+
+
+def _ecrire_modifications()->None:
+    # Ajouter les modifications en attente à la fin du journal
+    if _modifications:
+        ES_csv.append_journal(_modifications, _journal(), _deplacees)
+        _modifications.clear()
+        _deplacees.clear()
+
+
+def _fermer_base()->None:
+    global _base
+    if _base is not None:
+        _base.close()
+        _base = None
+
+
+def _attendre_compactage()->None:
+    global _compactage
+    if _compactage is not None:
+        _compactage.join()
+        _compactage = None
+
+
+def _journal()->str:
+    return _csv_filename + ".journal"
+
+
+def _ancien_journal()->str:
+    return _csv_filename + ".journal.old" # Journal en cours de fusion dans le fichier CSV
+
+
+def _taille_journal()->int:
+    try:
+        return os.path.getsize(_journal())
+    except FileNotFoundError:
+        return 0
 
 
 def add_edit_rep(repertoire:dict, nom:str, numero:str, email:str, favori:str)->None:
@@ -82,11 +225,14 @@ def add_edit_rep(repertoire:dict, nom:str, numero:str, email:str, favori:str)->N
     {"Foo": ["789", "foo.bar@baz.com", ""], "Spam": ["456", "spam@eggs.com", ""]}
     '''
 
-    nom = str(nom)                     # Fix pour nom contenant que des chiffres
-    repertoire[nom] = ['', '', '', ''] # Si entrée non existante -> Ajouter l'entrée (sinon écraser les données)
-    repertoire[nom][0] = numero        # Ajouter/modifier le numéro
-    repertoire[nom][1] = email         # Ajouter/modifier l'e-mail
-    repertoire[nom][2] = favori        # Ajouter/modifier si favori ou non
+    nom = str(nom)                             # Fix pour nom contenant que des chiffres
+    if repertoire is _repertoire_indexe:
+        _indexer_entree(nom, repertoire.get(nom), [numero, email, favori]) # Mettre à jour l'index de trigrammes
+    repertoire[nom] = [numero, email, favori]  # Ajouter l'entrée si non existante (sinon écraser les données), en une seule affectation (base SQLite)
+    if nom in _modifications and _modifications[nom] is None: # Entrée supprimée puis ajoutée de nouveau : elle est maintenant à la fin
+        del _modifications[nom]                # Ecrite après les autres modifications, comme dans le répertoire
+        _deplacees.add(nom)                    # Et supprimée avant d'être ajoutée (sinon modifiée sur place en rechargeant)
+    _modifications[nom] = [numero, email, favori] # A écrire dans le journal au prochain enregistrement
 
 
 def rem_rep(repertoire:dict, nom:str)->None:
@@ -108,7 +254,11 @@ def rem_rep(repertoire:dict, nom:str)->None:
     '''
 
     nom = str(nom)      # Fix pour nom contenant que des chiffres
+    valeur = repertoire[nom]
     del repertoire[nom] # Supprimer l'entrée du dictionnaire
+    if repertoire is _repertoire_indexe:
+        _desindexer_entree(nom, valeur) # Mettre à jour les index
+    _modifications[nom] = None # A écrire dans le journal au prochain enregistrement
 
 
 def search_name(repertoire:dict, nom:str)->dict:
@@ -129,8 +279,13 @@ def search_name(repertoire:dict, nom:str)->dict:
     {"Foo": ["123", "foo@bar.com", "★"]}
     '''
 
-    resultat = {}                          # Créer le dictionnaire des recherches
     nom = str(nom)                         # Fix pour nom contenant que des chiffres
+    if isinstance(repertoire, ES_sqlite.RepertoireSQLite):
+        return repertoire.rechercher("nom", nom)        # Recherche avec l'index plein texte
+    resultat = _rechercher_index(repertoire, 0, nom)
+    if resultat is not None:               # Recherche avec l'index de trigrammes
+        return resultat
+    resultat = {}                          # Créer le dictionnaire des recherches
     for cle, valeur in repertoire.items(): # Pour chaque entrée dans le répertoire
         if nom in cle:                     # Si le nom de l'entrée contient la chaîne donnée
                 resultat[cle] = valeur     # Rajouter cette entrée au dictionnaire des résultats
@@ -155,6 +310,11 @@ def search_number(repertoire:dict, numero:str)->dict:
     {"Spam": ["456", "spam@eggs.com", ""]}
     '''
 
+    if isinstance(repertoire, ES_sqlite.RepertoireSQLite):
+        return repertoire.rechercher("numero", numero)  # Recherche avec l'index plein texte
+    resultat = _rechercher_index(repertoire, 1, numero)
+    if resultat is not None:               # Recherche avec l'index de trigrammes
+        return resultat
     resultat = {}
     for cle, valeur in repertoire.items(): # Pour chaque entrée dans le répertoire
         if numero in valeur[0]:            # Si le numéro de l'entrée contient les chiffres donnés
@@ -162,6 +322,89 @@ def search_number(repertoire:dict, numero:str)->dict:
     return resultat
 
 
+def search_number_exact(repertoire:dict, numero:str)->dict:
+    '''
+    Chercher toutes les entrées dont le numéro est un numéro donné, peu importe son écriture (recherche de l'appelant)
+    Les numéros sont comparés une fois normalisés (voir normaliser_numero) : "06 12 34 56 78", "+33612345678"
+    et "0033 6 12 34 56 78" sont le même numéro
+
+    Paramètres :
+    repertoire (dict) : Répertoire
+    numero (str) : Numéro de téléphone
+
+    Renvoie :
+    resultat (dict) : Résultat de la recherche contenant les entrées correspondantes
+
+    Exemple :
+    >>> repertoire = {"Foo": ["+33 6 12 34 56 78", "foo@bar.com", "★"], "Spam": ["456", "spam@eggs.com", ""]}
+    >>> recherche = search_number_exact(repertoire, "0612345678")
+    >>> print(recherche)
+    {"Foo": ["+33 6 12 34 56 78", "foo@bar.com", "★"]}
+    '''
+
+    numero = normaliser_numero(numero)
+    if isinstance(repertoire, ES_sqlite.RepertoireSQLite):
+        return repertoire.rechercher_numero(numero, "exact") # Recherche avec l'index des numéros normalisés
+    if repertoire is _repertoire_indexe:
+        _construire_index_numeros()
+        return _entrees_triees(repertoire, _proprietaires.get(numero, ()))
+    return {cle: valeur for cle, valeur in repertoire.items() if normaliser_numero(valeur[0]) == numero} # Autre dictionnaire : parcours
+
+
+def search_number_prefix(repertoire:dict, prefixe:str)->dict:
+    '''
+    Chercher toutes les entrées dont le numéro commence par un début de numéro donné, peu importe son écriture
+    (ex : "06" pour les portables en France, "+44" pour le Royaume-Uni)
+
+    Paramètres :
+    repertoire (dict) : Répertoire
+    prefixe (str) : Début du numéro de téléphone
+
+    Renvoie :
+    resultat (dict) : Résultat de la recherche contenant les entrées correspondantes
+
+    Exemple :
+    >>> repertoire = {"Foo": ["+33 6 12 34 56 78", "foo@bar.com", "★"], "Spam": ["0145", "spam@eggs.com", ""]}
+    >>> recherche = search_number_prefix(repertoire, "06")
+    >>> print(recherche)
+    {"Foo": ["+33 6 12 34 56 78", "foo@bar.com", "★"]}
+    '''
+
+    prefixe = normaliser_numero(prefixe)
+    if isinstance(repertoire, ES_sqlite.RepertoireSQLite):
+        return repertoire.rechercher_numero(prefixe, "prefixe") # Recherche avec l'index des numéros normalisés
+    if repertoire is _repertoire_indexe:
+        _construire_index_numeros()
+        return _entrees_triees(repertoire, _chercher_prefixe(prefixe))
+    return {cle: valeur for cle, valeur in repertoire.items() if normaliser_numero(valeur[0]).startswith(prefixe)} # Autre dictionnaire : parcours
+
+
+def normaliser_numero(numero:str)->str:
+    '''
+    Ecrire un numéro de téléphone sous une forme unique : chiffres de l'indicatif du pays puis du numéro, sans espaces ni symboles
+
+    Paramètres :
+    numero (str) : Numéro de téléphone (ex : "06 12 34 56 78", "+33 (0)6.12.34.56.78", "0033612345678")
+
+    Renvoie :
+    (str) : Numéro normalisé (ex : "33612345678"), les numéros courts sans 0 au début sont gardés tels quels
+
+    Exemple :
+    >>> normaliser_numero("06 12 34 56 78")
+    '33612345678'
+    '''
+
+    numero = numero.strip().replace("(0)", "")    # "+33 (0)6..." : le 0 entre parenthèses n'est pas composé depuis l'étranger
+    chiffres = _NON_CHIFFRES.sub("", numero)
+    if numero.startswith("+"):                   # Déjà international
+        return chiffres
+    if chiffres.startswith("00"):                # Préfixe international
+        return chiffres[2:]
+    if chiffres.startswith("0"):                 # Numéro national
+        return INDICATIF_PAYS + chiffres[1:]
+    return chiffres                              # Numéro court (ex : 3949)
+
+
 def search_email(repertoire:dict, email:str)->dict:
     '''
     Chercher toutes les entrées dans le répertoire dont l`e-mail contient une chaîne de caractères donnée
@@ -180,6 +423,11 @@ def search_email(repertoire:dict, email:str)->dict:
     {"Foo": ["123", "foo@bar.com", "★"]}
     '''
 
+    if isinstance(repertoire, ES_sqlite.RepertoireSQLite):
+        return repertoire.rechercher("email", email)    # Recherche avec l'index plein texte
+    resultat = _rechercher_index(repertoire, 2, email)
+    if resultat is not None:               # Recherche avec l'index de trigrammes
+        return resultat
     resultat = {}                          # Créer le dictionnaire des recherches
     for cle, valeur in repertoire.items(): # Pour chaque entrée dans le répertoire
         if email in valeur[1]:             # Si l'e-mail de l'entrée contient la chaîne donnée
@@ -205,8 +453,410 @@ def search_favorite(repertoire:dict, est_favori:bool)->dict:
     {"Spam": ["456", "spam@eggs.com", ""]}
     '''
 
+    if isinstance(repertoire, ES_sqlite.RepertoireSQLite):
+        return repertoire.rechercher_favori(est_favori) # Recherche avec l'index des favoris
     resultat = {}                          # Créer le dictionnaire des recherches
     for cle, valeur in repertoire.items(): # Pour chaque entrée dans le répertoire
         if bool(valeur[2]) == est_favori:  # Si l'entrée est favori/ne l'est pas (selon argument)
             resultat[cle] = valeur         # Rajouter cette entrée au dictionnaire des résultats
     return resultat                        # Renvoyer le résultat
+
+
+
+def search_query(repertoire:dict, requete:tuple)->dict:
+    '''
+    Chercher toutes les entrées dans le répertoire qui vérifient une combinaison de critères
+
+    Paramètres :
+    repertoire (dict) : Répertoire
+    requete (tuple) : Critère ou combinaison de critères
+        - critère : (champ, mode, valeur) avec champ "nom", "numero", "email" ou "favori"
+          et mode "exact", "prefixe" (commence par), "contient" ou "regex" (expression régulière)
+          Pour le numéro, "exact" et "prefixe" comparent les numéros normalisés (voir normaliser_numero)
+          Pour le favori, seulement ("favori", "exact", True/False)
+        - combinaison : ("et", [requêtes]) (toutes vérifiées) ou ("ou", [requêtes]) (au moins une vérifiée)
+
+    Renvoie :
+    resultat (dict) : Résultat de la recherche contenant les entrées correspondantes
+
+    Exemple :
+    >>> repertoire = {"Foo": ["123", "foo@bar.com", "★"], "Spam": ["456", "spam@eggs.com", ""], "Eggs": ["789", "", "★"]}
+    >>> recherche = search_query(repertoire, ("et", [("favori", "exact", True), ("ou", [("nom", "prefixe", "F"), ("email", "regex", "@eggs\\.")])]))
+    >>> print(recherche)
+    {"Foo": ["123", "foo@bar.com", "★"]}
+    '''
+
+    test, _ = _compiler_requete(requete)    # Vérifier la requête et préparer le test d'une entrée
+    if isinstance(repertoire, ES_sqlite.RepertoireSQLite):
+        return repertoire.rechercher_requete(requete) # Traduite en SQL : SQLite choisit l'index
+    if repertoire is _repertoire_indexe:
+        source = _planifier(requete, len(repertoire) // 2)
+        if source is not None:              # Les index donnent assez peu de candidats : ne tester qu'eux
+            candidats = sorted(source[1](), key=_identifiants.__getitem__) # Dans l'ordre du répertoire
+            return {nom: repertoire[nom] for nom in candidats if test(nom, repertoire[nom])}
+    return {nom: valeur for nom, valeur in repertoire.items() if test(nom, valeur)} # Un seul parcours pour tous les critères
+
+
+## Index de trigrammes
+# Chaque trigramme (sous-chaîne de 3 caractères) d'un champ donne la liste des entrées qui le contiennent
+# Une recherche d'au moins 3 caractères ne vérifie que les entrées présentes dans les listes de tous ses trigrammes
+# Les entrées supprimées ou modifiées restent dans les listes (vérification à chaque recherche) jusqu'à la reconstruction
+
+def _indexer(repertoire:dict)->None:
+    '''
+    Associer l'index de trigrammes à un répertoire (None : aucun répertoire indexé)
+    L'index de chaque champ est construit à la première recherche sur ce champ, puis mis à jour par add_edit_rep et rem_rep
+    '''
+
+    global _repertoire_indexe, _identifiants, _noms, _index, _nb_obsoletes
+    global _proprietaires, _arbre_numeros
+    _repertoire_indexe = repertoire
+    _proprietaires = None
+    _arbre_numeros = None
+    _identifiants = {} if repertoire is None else {nom: identifiant for identifiant, nom in enumerate(repertoire)}
+    _noms = [] if repertoire is None else list(repertoire)
+    _index = [None, None, None]
+    _nb_obsoletes = 0
+
+
+def _trigrammes(texte:str)->set:
+    return {texte[i:i + 3] for i in range(len(texte) - 2)}
+
+
+def _champ(nom:str, valeur:list, champ:int)->str:
+    return nom if champ == 0 else valeur[champ - 1] # 0 : nom, 1 : numéro, 2 : e-mail
+
+
+def _ajouter_trigrammes(champ:int, identifiant:int, trigrammes:set)->None:
+    index = _index[champ]
+    for trigramme in trigrammes:
+        liste = index.get(trigramme)
+        if liste is None:
+            index[trigramme] = array('I', (identifiant,))
+        else:
+            liste.append(identifiant)
+
+
+def _construire_index(champ:int)->None:
+    '''
+    Construire l'index de trigrammes d'un champ pour tout le répertoire indexé
+    '''
+
+    _index[champ] = {}
+    for identifiant, nom in enumerate(_noms):
+        if nom is not None:
+            _ajouter_trigrammes(champ, identifiant, _trigrammes(_champ(nom, _repertoire_indexe[nom], champ)))
+
+
+def _indexer_entree(nom:str, ancienne_valeur:list, valeur:list)->None:
+    '''
+    Mettre à jour l'index pour une entrée ajoutée (ancienne_valeur None) ou modifiée
+    '''
+
+    global _nb_obsoletes
+    if _proprietaires is not None:          # Index des numéros : retirer l'ancien numéro, ajouter le nouveau
+        if ancienne_valeur is not None:
+            _retirer_numero(normaliser_numero(ancienne_valeur[0]), nom)
+        _ajouter_numero(normaliser_numero(valeur[0]), nom)
+    identifiant = _identifiants.get(nom)
+    if identifiant is None:                 # Nouvelle entrée : nouvel identifiant (ajoutée à la fin comme dans le dictionnaire)
+        identifiant = len(_noms)
+        _identifiants[nom] = identifiant
+        _noms.append(nom)
+        for champ in range(3):
+            if _index[champ] is not None:
+                _ajouter_trigrammes(champ, identifiant, _trigrammes(_champ(nom, valeur, champ)))
+        return
+    for champ in (1, 2):                    # Entrée modifiée : même identifiant, seuls les nouveaux trigrammes sont ajoutés
+        if _index[champ] is not None:
+            _ajouter_trigrammes(champ, identifiant, _trigrammes(valeur[champ - 1]) - _trigrammes(ancienne_valeur[champ - 1] if ancienne_valeur else ''))
+    _nb_obsoletes += 1
+    _verifier_obsoletes()
+
+
+def _desindexer_entree(nom:str, valeur:list)->None:
+    global _nb_obsoletes
+    if _proprietaires is not None:
+        _retirer_numero(normaliser_numero(valeur[0]), nom)
+    identifiant = _identifiants.pop(nom, None)
+    if identifiant is not None:
+        _noms[identifiant] = None
+        _nb_obsoletes += 1
+        _verifier_obsoletes()
+
+
+def _verifier_obsoletes()->None:
+    if _nb_obsoletes > len(_identifiants) + 1000: # Plus d'entrées obsolètes que d'entrées : reconstruire
+        _indexer(_repertoire_indexe)
+
+
+def _listes_trigrammes(champ:int, texte:str)->list:
+    '''
+    Listes d'identifiants des trigrammes d'un texte (d'au moins 3 caractères) de la plus courte à la plus longue
+    (liste vide si un des trigrammes n'est dans aucune entrée : aucune entrée ne contient le texte)
+    '''
+
+    if _index[champ] is None:
+        _construire_index(champ)
+    listes = []
+    for trigramme in _trigrammes(texte):
+        liste = _index[champ].get(trigramme)
+        if liste is None:                   # Trigramme présent dans aucune entrée
+            return []
+        listes.append(liste)
+    listes.sort(key=len)
+    return listes
+
+
+def _candidats_trigrammes(champ:int, texte:str)->set:
+    '''
+    Identifiants des entrées dont le champ contient peut-être le texte (d'au moins 3 caractères), à vérifier
+    '''
+
+    listes = _listes_trigrammes(champ, texte)
+    if not listes:
+        return set()
+
+    # Intersection en commençant par la liste la plus courte ; les listes beaucoup plus longues
+    # que les candidats restants coûteraient plus cher que la vérification des candidats
+    candidats = set(listes[0])
+    for liste in listes[1:]:
+        if len(liste) > 8 * len(candidats):
+            break
+        candidats.intersection_update(liste)
+    return candidats
+
+
+def _rechercher_index(repertoire:dict, champ:int, texte:str):
+    '''
+    Chercher avec l'index de trigrammes les entrées dont un champ contient un texte
+
+    Paramètres :
+    repertoire (dict) : Répertoire
+    champ (int) : 0 (nom), 1 (numéro) ou 2 (e-mail)
+    texte (str) : Texte cherché
+
+    Renvoie :
+    resultat (dict) : Entrées correspondantes (dans l'ordre du répertoire)
+    ou None si l'index ne peut pas être utilisé (autre répertoire que celui d'init_rep ou moins de 3 caractères)
+    '''
+
+    if repertoire is not _repertoire_indexe or len(texte) < 3:
+        return None
+    candidats = _candidats_trigrammes(champ, texte)
+    resultat = {}
+    for identifiant in sorted(candidats):   # Ordre des identifiants = ordre du répertoire
+        nom = _noms[identifiant]
+        if nom is not None:
+            valeur = repertoire[nom]
+            if texte in _champ(nom, valeur, champ): # Vérifier (trigrammes dans le désordre ou entrée modifiée)
+                resultat[nom] = valeur
+    return resultat
+
+
+## Index des numéros normalisés
+# Dictionnaire {numéro: noms} pour trouver l'appelant, et arbre des préfixes pour les débuts de numéro
+# Noeud de l'arbre : dictionnaire {chiffre: enfant}, avec la clé "" pour les noms dont le numéro s'arrête à ce noeud
+# Enfant : noeud ou feuille (liste de (fin du numéro, nom)) découpée en noeud quand elle dépasse TAILLE_SEAU numéros
+
+def _construire_index_numeros()->None:
+    global _proprietaires, _arbre_numeros
+    if _proprietaires is not None:
+        return
+    _proprietaires = {}
+    _arbre_numeros = {}
+    for nom, valeur in _repertoire_indexe.items():
+        _ajouter_numero(normaliser_numero(valeur[0]), nom)
+
+
+def _ajouter_numero(numero:str, nom:str)->None:
+    _proprietaires.setdefault(numero, []).append(nom)
+    _inserer_arbre(_arbre_numeros, numero, nom)
+
+
+def _inserer_arbre(noeud:dict, numero:str, nom:str)->None:
+    for position, chiffre in enumerate(numero):
+        enfant = noeud.get(chiffre)
+        if enfant is None:                      # Nouvelle feuille
+            noeud[chiffre] = [(numero[position + 1:], nom)]
+            return
+        if isinstance(enfant, list):            # Feuille : ajouter le numéro, découper si trop grande
+            enfant.append((numero[position + 1:], nom))
+            if len(enfant) > TAILLE_SEAU:
+                noeud[chiffre] = {}
+                for fin, nom_feuille in enfant:
+                    _inserer_arbre(noeud[chiffre], fin, nom_feuille)
+            return
+        noeud = enfant
+    noeud.setdefault("", []).append(nom)        # Numéro qui s'arrête à ce noeud
+
+
+def _retirer_numero(numero:str, nom:str)->None:
+    noms = _proprietaires.get(numero)
+    if noms is None or nom not in noms:
+        return
+    noms.remove(nom)
+    if not noms:
+        del _proprietaires[numero]
+    noeud = _arbre_numeros
+    for position, chiffre in enumerate(numero):
+        enfant = noeud[chiffre]
+        if isinstance(enfant, list):
+            enfant.remove((numero[position + 1:], nom))
+            return
+        noeud = enfant
+    noeud[""].remove(nom)
+
+
+def _chercher_prefixe(prefixe:str, limite:int=None)->list:
+    '''
+    Noms des entrées dont le numéro normalisé commence par prefixe (parcours du préfixe puis du sous-arbre)
+    ou None s'il y en a plus que limite (le parcours s'arrête dès que la limite est dépassée)
+    '''
+
+    noeud = _arbre_numeros
+    for position, chiffre in enumerate(prefixe):
+        enfant = noeud.get(chiffre)
+        if enfant is None:
+            return []
+        if isinstance(enfant, list):            # Feuille : vérifier la fin du préfixe
+            fin_prefixe = prefixe[position + 1:]
+            return [nom for fin, nom in enfant if fin.startswith(fin_prefixe)]
+        noeud = enfant
+    noms = []
+    noeuds = [noeud]
+    while noeuds:
+        noeud = noeuds.pop()
+        for cle, enfant in noeud.items():
+            if cle == "":
+                noms.extend(enfant)
+            elif isinstance(enfant, list):
+                noms.extend(nom for _, nom in enfant)
+            else:
+                noeuds.append(enfant)
+        if limite is not None and len(noms) > limite:
+            return None
+    return noms
+
+
+def _entrees_triees(repertoire:dict, noms)->dict:
+    return {nom: repertoire[nom] for nom in sorted(noms, key=_identifiants.__getitem__)} # Dans l'ordre du répertoire
+
+
+## Requêtes composées
+# Chaque requête est d'abord transformée en fonction test(nom, valeur) ; dans un "et"/"ou", les critères les moins
+# coûteux sont testés en premier et le test s'arrête au premier critère faux/vrai
+# Planificateur : pour le répertoire indexé, un "et" prend ses candidats dans l'index du critère le plus sélectif,
+# un "ou" réunit les candidats de tous ses critères (s'ils ont tous un index) ; sinon tout le répertoire est parcouru
+
+def _compiler_requete(requete:tuple):
+    '''
+    Vérifier une requête (voir search_query) et la transformer en fonction de test
+
+    Paramètres :
+    requete (tuple) : Critère ou combinaison de critères
+
+    Renvoie :
+    (test, cout) : fonction test(nom, valeur) -> bool et coût estimé d'un test
+    '''
+
+    if not isinstance(requete, (tuple, list)) or len(requete) not in (2, 3):
+        raise ValueError(f"Requête invalide : {requete!r}")
+
+    if len(requete) == 2:                   # Combinaison
+        operateur, sous_requetes = requete
+        if operateur not in ("et", "ou"):
+            raise ValueError(f"Opérateur inconnu : {operateur} (\"et\" ou \"ou\")")
+        compilees = sorted((_compiler_requete(sous_requete) for sous_requete in sous_requetes), key=lambda compilee: compilee[1])
+        tests = [test for test, _ in compilees]
+        cout = sum(cout for _, cout in compilees)
+        if operateur == "et":
+            return (lambda nom, valeur: all(test(nom, valeur) for test in tests)), cout
+        return (lambda nom, valeur: any(test(nom, valeur) for test in tests)), cout
+
+    champ, mode, texte = requete            # Critère
+    if champ not in CHAMPS_REQUETE:
+        raise ValueError(f"Champ inconnu : {champ}")
+    if mode not in COUT_MODES:
+        raise ValueError(f"Mode de recherche inconnu : {mode}")
+    if champ == "favori":
+        if mode != "exact":
+            raise ValueError("Le favori se cherche seulement en mode exact (True/False)")
+        est_favori = bool(texte)
+        return (lambda nom, valeur: bool(valeur[2]) == est_favori), 0
+    if not isinstance(texte, str):
+        raise ValueError(f"Texte attendu pour le champ {champ}")
+
+    position = CHAMPS_REQUETE.index(champ)  # 0 : nom, 1 : numéro, 2 : e-mail (voir _champ)
+    if champ == "numero" and mode in ("exact", "prefixe"): # Numéros comparés une fois normalisés
+        numero = normaliser_numero(texte)
+        if mode == "exact":
+            return (lambda nom, valeur: normaliser_numero(valeur[0]) == numero), COUT_MODES[mode] + 3
+        return (lambda nom, valeur: normaliser_numero(valeur[0]).startswith(numero)), COUT_MODES[mode] + 3
+    if mode == "exact":
+        return (lambda nom, valeur: _champ(nom, valeur, position) == texte), COUT_MODES[mode]
+    if mode == "prefixe":
+        return (lambda nom, valeur: _champ(nom, valeur, position).startswith(texte)), COUT_MODES[mode]
+    if mode == "contient":
+        return (lambda nom, valeur: texte in _champ(nom, valeur, position)), COUT_MODES[mode]
+    try:
+        motif = re.compile(texte)
+    except re.error as erreur:
+        raise ValueError(f"Expression régulière invalide : {erreur}")
+    return (lambda nom, valeur: motif.search(_champ(nom, valeur, position)) is not None), COUT_MODES[mode]
+
+
+def _planifier(requete:tuple, limite:int):
+    '''
+    Trouver avec les index un ensemble de candidats qui contient toutes les entrées vérifiant la requête
+
+    Paramètres :
+    requete (tuple) : Requête déjà vérifiée par _compiler_requete
+    limite (int) : Nombre de candidats au-delà duquel parcourir le répertoire est plus intéressant
+
+    Renvoie :
+    (estimation, obtenir) : nombre estimé de candidats et fonction qui renvoie l'ensemble des noms candidats
+    ou None si aucun index n'est utilisable ou s'il y aurait plus de limite candidats
+    '''
+
+    if len(requete) == 2:
+        operateur, sous_requetes = requete
+        if operateur == "et":               # Le critère le plus sélectif suffit (les autres sont testés ensuite)
+            meilleure = None
+            for sous_requete in sous_requetes:
+                source = _planifier(sous_requete, limite if meilleure is None else meilleure[0] - 1)
+                if source is not None:
+                    meilleure = source
+                    if meilleure[0] == 0:   # Aucun candidat : inutile de chercher mieux
+                        break
+            return meilleure
+        sources = []                        # "ou" : tous les critères doivent avoir des candidats
+        total = 0
+        for sous_requete in sous_requetes:
+            source = _planifier(sous_requete, limite - total)
+            if source is None:
+                return None
+            sources.append(source)
+            total += source[0]
+        return total, lambda: set().union(*(obtenir() for _, obtenir in sources))
+
+    champ, mode, texte = requete
+    if champ == "favori" or mode == "regex":
+        return None
+    if champ == "nom" and mode == "exact":  # Clé du dictionnaire
+        return 1, lambda: {texte} if texte in _repertoire_indexe else set()
+    if champ == "numero" and mode in ("exact", "prefixe"): # Index des numéros normalisés
+        _construire_index_numeros()
+        numero = normaliser_numero(texte)
+        noms = _proprietaires.get(numero, []) if mode == "exact" else _chercher_prefixe(numero, limite)
+        if noms is None or len(noms) > limite:
+            return None
+        return len(noms), lambda: set(noms)
+    if len(texte) < 3:                      # Pas de trigramme
+        return None
+    position = CHAMPS_REQUETE.index(champ)
+    listes = _listes_trigrammes(position, texte)
+    estimation = len(listes[0]) if listes else 0 # Au plus la liste du trigramme le plus rare
+    if estimation > limite:
+        return None
+    return estimation, lambda: {_noms[identifiant] for identifiant in _candidats_trigrammes(position, texte)} - {None}
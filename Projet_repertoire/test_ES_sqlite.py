@@ -0,0 +1,44 @@
+"""
+Fichier : test_ES_sqlite.py
+Description : Tests de l'importation CSV dans une base SQLite (python -m unittest test_ES_sqlite)
+"""
+
+import os
+import tempfile
+import unittest
+
+import ES_sqlite
+import rep_func
+
+
+class TestImportCSV(unittest.TestCase):
+
+    def setUp(self):
+        self.dossier = tempfile.TemporaryDirectory()
+        self.nomf_db = os.path.join(self.dossier.name, "repertoire.db")
+        self.nomf_csv = os.path.join(self.dossier.name, "repertoire.csv")
+
+    def tearDown(self):
+        rep_func.init_rep(self.nomf_csv) # Fermer la base ouverte par init_rep
+        self.dossier.cleanup()
+
+    def test_reimportation_numero_modifie(self):
+        # Un numéro modifié par une nouvelle importation doit être retrouvé (numéro normalisé recalculé)
+        repertoire = rep_func.init_rep(self.nomf_db)
+        rep_func.add_edit_rep(repertoire, "Bob", "0612345678", "bob@exemple.fr", "")
+        rep_func.save_rep(repertoire)
+        rep_func.init_rep(self.nomf_csv) # Fermer la base avant l'importation
+
+        with open(self.nomf_csv, 'w', encoding="utf-8", newline='') as myfile:
+            myfile.write("Bob;0799999999;bob@exemple.fr;\n")
+        self.assertEqual(ES_sqlite.import_csv(self.nomf_csv, self.nomf_db), 1)
+
+        repertoire = rep_func.init_rep(self.nomf_db)
+        self.assertEqual(dict(rep_func.search_number_exact(repertoire, "0612345678")), {})
+        self.assertEqual(dict(rep_func.search_number_exact(repertoire, "0799999999")), {"Bob": ["0799999999", "bob@exemple.fr", ""]})
+        self.assertEqual(list(rep_func.search_number_prefix(repertoire, "+337")), ["Bob"])
+        self.assertEqual(list(rep_func.search_query(repertoire, ("numero", "exact", "+33 7 99 99 99 99"))), ["Bob"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,244 @@
+# Benchmark : Mesure du temps de conversion des fonctions de conversion.py
+# Par Nolan CACERES VASQUEZ et Merwan DE LA PENA TORTELLIER
+
+from conversion import *
+from random import getrandbits, randint, randrange
+from time import perf_counter
+from math import log
+from sys import exit
+import argparse
+import json
+import platform
+
+# Tailles testées (en nombre de chiffres de l'argument), de 1 à 10 millions de chiffres
+tailles = [10**puissance for puissance in range(8)]
+SEUIL_REGRESSION = 0.25 # Régression si le temps augmente de plus de 25 % par rapport à la référence
+TEMPS_MINIMUM = 1e-4 # Temps (s) en dessous duquel une mesure est trop imprécise pour être comparée
+TAILLE_MINIMUM_EXPOSANT = 1000 # Taille à partir de laquelle les mesures servent à estimer l'exposant
+
+# Fonctions mesurées, base des chiffres de l'argument et fonction pour générer l'argument à partir d'un entier
+fonctions = {"dec_to_bin": (dec_to_bin, 10, lambda nombre: nombre),
+             "dec_to_hexa": (dec_to_hexa, 10, lambda nombre: nombre),
+             "bin_to_dec": (bin_to_dec, 2, dec_to_bin),
+             "hexa_to_dec": (hexa_to_dec, 16, dec_to_hexa),
+             "bin_to_hexa": (bin_to_hexa, 2, dec_to_bin),
+             "hexa_to_bin": (hexa_to_bin, 16, dec_to_hexa),
+             "dec_to_base7": (lambda nombre: entier_vers_texte(nombre, 7), 10, lambda nombre: nombre),
+             "base7_to_dec": (lambda texte: texte_vers_entier(texte, 7), 7, lambda nombre: entier_vers_texte(nombre, 7))}
+
+## Anciennes versions (chiffre par chiffre) pour la vérification différentielle
+def ancien_bin_to_dec(binaire):
+    for chiffre in ["2", "3", "4", "5", "6", "7", "8", "9"]:
+        if chiffre in binaire:
+            raise ValueError("Chiffres invalides")
+    binaire = binaire[::-1]
+    decimal = 0
+    for i in range(len(binaire)):
+        decimal += int(binaire[i])*2**i
+    return decimal
+
+def ancien_hexa_to_dec(hexadecimal):
+    hexadecimal = hexadecimal[::-1].upper()
+    decimal = 0
+    for i in range(len(hexadecimal)):
+        decimal += "0123456789ABCDEF".index(hexadecimal[i])*16**i
+    return decimal
+
+def verifier(nb_nombres=500):
+    """
+    verifier : compare bin_to_dec, hexa_to_dec, bin_to_hexa et hexa_to_bin avec les anciennes versions sur des nombres aléatoires
+    Arguments :
+    - nb_nombres : nombre de nombres testés
+    Renvoie :
+    - None (déclenche AssertionError si un résultat diffère)
+    """
+
+    # Nombre vide : refusé par convert (l'interface en ligne de commande affiche "Nombre invalide!")
+    for texte in ("", " ", "\t\n"):
+        for base_origine, base_destination in ((10, 2), (2, 16), (16, 10), ("01", 10)):
+            try:
+                convert(texte, base_origine, base_destination)
+            except ValueError:
+                continue
+            raise AssertionError(f"convert({texte!r}, {base_origine!r}, {base_destination!r}) accepte un nombre vide")
+
+    corpus = ["0", "1", "0000", "10", "1111", "ff", "FF", "dEaDbEeF", "00ff"]
+    for _ in range(nb_nombres):
+        nombre = getrandbits(randint(1, 5000))
+        corpus.append(dec_to_bin(nombre))
+        corpus.append(dec_to_hexa(nombre).lower())
+        corpus.append("0" * randint(1, 10) + dec_to_hexa(nombre))
+
+    for texte in corpus:
+        if set(texte) <= set("01"):
+            assert bin_to_dec(texte) == ancien_bin_to_dec(texte), texte
+            assert bin_to_hexa(texte) == dec_to_hexa(ancien_bin_to_dec(texte)), texte
+        assert hexa_to_dec(texte) == ancien_hexa_to_dec(texte), texte
+        assert hexa_to_bin(texte) == dec_to_bin(ancien_hexa_to_dec(texte)), texte
+
+    # Bases qui ne sont pas des puissances de 2 : grands nombres découpés avec decimal.Decimal
+    for base in (3, 7, 10, 36):
+        for bits in (1000, BITS_DECOUPAGE_DECIMAL + 1, 3 * BITS_DECOUPAGE_DECIMAL):
+            nombre = getrandbits(bits) | (1 << (bits - 1))
+            texte = entier_vers_texte(nombre, base)
+            assert texte[0] != "0" and texte_vers_entier(texte, base) == nombre, (base, bits)
+            assert "".join(reversed(Chiffres(nombre, base))) == texte[::-1], (base, bits)
+
+    # convert_batch : chaque nombre complété jusqu'à largeur, sans dépendre des autres nombres du tableau
+    try:
+        convert_batch([0], 10)
+    except ImportError: # NumPy non installé
+        return
+    nombres = [0, 1, 255, 4096] + [getrandbits(randint(1, 63)) for _ in range(nb_nombres)]
+    for base in (2, 7, 10, 16, 36):
+        for largeur in (0, 1, 4, 20):
+            for nombre, texte in zip(nombres, convert_batch(nombres, base, largeur)):
+                attendu = entier_vers_texte(nombre, base).rjust(largeur, "0")
+                assert texte == attendu, (nombre, base, largeur, texte)
+
+def chronometrer(fonction, argument, repetitions=3):
+    """
+    chronometrer : mesure le meilleur temps d'exécution d'une fonction
+    Arguments :
+    - fonction : fonction à appeler
+    - argument : argument donné à la fonction
+    - repetitions : nombre de mesures
+    Renvoie :
+    - meilleur_temps : flottant (secondes)
+    """
+
+    meilleur_temps = None
+    for _ in range(repetitions):
+        debut = perf_counter()
+        fonction(argument)
+        temps = perf_counter() - debut
+        if meilleur_temps is None or temps < meilleur_temps:
+            meilleur_temps = temps
+    return meilleur_temps
+
+def nombre_aleatoire(nb_chiffres, base):
+    """
+    nombre_aleatoire : entier aléatoire ayant exactement nb_chiffres chiffres dans une base
+    Arguments :
+    - nb_chiffres : entier
+    - base : entier
+    Renvoie :
+    - nombre : entier
+    """
+
+    if base & (base - 1) == 0:
+        bits = (base.bit_length() - 1) * nb_chiffres
+        return getrandbits(bits) | (1 << (bits - 1))
+    minimum = base ** (nb_chiffres - 1)
+    return minimum + randrange(minimum * (base - 1))
+
+def exposant_complexite(tailles_mesurees, temps):
+    """
+    exposant_complexite : pente de la droite des moindres carrés de log(temps) en fonction de log(taille)
+    (1 = linéaire, 2 = quadratique)
+    Arguments :
+    - tailles_mesurees : liste d'entiers
+    - temps : liste de flottants
+    Renvoie :
+    - exposant : flottant (None si moins de 2 mesures utilisables)
+    """
+
+    points = [(log(taille), log(t)) for taille, t in zip(tailles_mesurees, temps) if taille >= TAILLE_MINIMUM_EXPOSANT and t > 0]
+    if len(points) < 2:
+        return None
+    moyenne_x = sum(x for x, _ in points) / len(points)
+    moyenne_y = sum(y for _, y in points) / len(points)
+    covariance = sum((x - moyenne_x) * (y - moyenne_y) for x, y in points)
+    variance = sum((x - moyenne_x) ** 2 for x, _ in points)
+    return covariance / variance
+
+def mesurer(noms, tailles_testees, repetitions):
+    """
+    mesurer : mesure chaque fonction pour chaque taille et affiche les résultats
+    Arguments :
+    - noms : liste des noms de fonctions à mesurer
+    - tailles_testees : liste de nombres de chiffres
+    - repetitions : nombre de mesures par taille (le meilleur temps est gardé)
+    Renvoie :
+    - resultats : dictionnaire nom -> {"tailles": [...], "temps": [...], "exposant": flottant}
+    """
+
+    resultats = {}
+    print(f"{'Fonction':<12} {'Chiffres':>10} {'Temps (s)':>12} {'Rapport':>8}")
+    for nom in noms:
+        fonction, base, generer_argument = fonctions[nom]
+        temps_mesures = []
+        for taille in tailles_testees:
+            argument = generer_argument(nombre_aleatoire(taille, base))
+            temps = chronometrer(fonction, argument, repetitions)
+
+            # Rapport avec la taille précédente (10 = linéaire, 100 = quadratique)
+            rapport = f"{temps / temps_mesures[-1]:.1f}" if temps_mesures and temps_mesures[-1] else "-"
+            print(f"{nom:<12} {taille:>10} {temps:>12.6f} {rapport:>8}")
+            temps_mesures.append(temps)
+
+        exposant = exposant_complexite(tailles_testees, temps_mesures)
+        if exposant is not None:
+            print(f"{nom:<12} exposant de complexité : {exposant:.2f}")
+        resultats[nom] = {"tailles": list(tailles_testees), "temps": temps_mesures, "exposant": exposant}
+    return resultats
+
+def comparer(resultats, reference, seuil):
+    """
+    comparer : compare les résultats avec une référence enregistrée
+    Arguments :
+    - resultats : dictionnaire renvoyé par mesurer()
+    - reference : dictionnaire chargé depuis un fichier JSON de référence
+    - seuil : augmentation relative du temps tolérée (0.25 = 25 %)
+    Renvoie :
+    - regressions : liste de chaînes de caractères décrivant chaque régression
+    """
+
+    regressions = []
+    for nom, resultat in resultats.items():
+        if nom not in reference["resultats"]:
+            continue
+        temps_reference = dict(zip(reference["resultats"][nom]["tailles"], reference["resultats"][nom]["temps"]))
+        for taille, temps in zip(resultat["tailles"], resultat["temps"]):
+            if taille not in temps_reference or temps_reference[taille] < TEMPS_MINIMUM:
+                continue
+            if temps > temps_reference[taille] * (1 + seuil):
+                regressions.append(f"{nom} ({taille} chiffres) : {temps:.6f} s au lieu de {temps_reference[taille]:.6f} s")
+    return regressions
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mesure les fonctions de conversion.py et détecte les régressions")
+    parser.add_argument("fonctions", nargs="*", help=f"fonctions à mesurer parmi {', '.join(fonctions)} (toutes par défaut)")
+    parser.add_argument("--max-chiffres", type=int, default=tailles[-1], help="taille maximum testée (en chiffres)")
+    parser.add_argument("--repetitions", type=int, default=3, help="nombre de mesures par taille")
+    parser.add_argument("--enregistrer", metavar="FICHIER", help="enregistrer les résultats comme référence (JSON)")
+    parser.add_argument("--comparer", metavar="FICHIER", help="échouer si les résultats sont plus lents que la référence (JSON)")
+    parser.add_argument("--seuil", type=float, default=SEUIL_REGRESSION, help="augmentation de temps tolérée (0.25 = 25 %%)")
+    parser.add_argument("--sans-verification", action="store_true", help="ne pas faire la vérification différentielle")
+    arguments = parser.parse_args()
+    for nom in arguments.fonctions:
+        if nom not in fonctions:
+            parser.error(f"fonction inconnue : {nom}")
+
+    if not arguments.sans_verification:
+        verifier()
+        print("Vérification différentielle : OK\n")
+
+    tailles_testees = [taille for taille in tailles if taille <= arguments.max_chiffres]
+    resultats = mesurer(arguments.fonctions or list(fonctions), tailles_testees, arguments.repetitions)
+
+    if arguments.enregistrer:
+        with open(arguments.enregistrer, "w", encoding="utf-8") as fichier:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(), "resultats": resultats}, fichier, indent=2)
+        print(f"\nRéférence enregistrée dans {arguments.enregistrer}")
+
+    if arguments.comparer:
+        with open(arguments.comparer, encoding="utf-8") as fichier:
+            reference = json.load(fichier)
+        regressions = comparer(resultats, reference, arguments.seuil)
+        if regressions:
+            print("\nRégressions :")
+            for regression in regressions:
+                print(f"- {regression}")
+            exit(1)
+        print("\nAucune régression")
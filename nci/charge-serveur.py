@@ -0,0 +1,124 @@
+# Test de charge : Mesure le débit et la latence de conversion-serveur.py
+# Par Nolan CACERES VASQUEZ et Merwan DE LA PENA TORTELLIER
+
+from conversion import convert, entier_vers_texte
+from random import getrandbits
+from time import perf_counter
+from sys import exit
+import argparse
+import asyncio
+import json
+
+def creer_lignes(nb_lignes, lot, nb_bits, base_origine, base_destination):
+    """
+    creer_lignes : lignes de requêtes aléatoires à envoyer au serveur
+    Arguments :
+    - nb_lignes : nombre de lignes
+    - lot : nombre de requêtes par ligne (1 : requête seule, sinon liste de requêtes)
+    - nb_bits : taille des nombres (en bits)
+    - base_origine, base_destination : entiers entre 2 et 36
+    Renvoie :
+    - lignes : liste de tuples (bytes de la ligne, liste des requêtes)
+    """
+    lignes = []
+    for numero in range(nb_lignes):
+        requetes = [{"id": numero * lot + i, "nombre": entier_vers_texte(getrandbits(nb_bits) | 1, base_origine),
+                     "base_origine": base_origine, "base_destination": base_destination} for i in range(lot)]
+        contenu = requetes if lot > 1 else requetes[0]
+        lignes.append((json.dumps(contenu).encode("utf-8") + b"\n", requetes))
+    return lignes
+
+async def connexion(ouvrir, lignes, profondeur, latences, verifier):
+    """
+    connexion : envoie des lignes sur une connexion en gardant au plus profondeur lignes sans réponse (pipelining)
+    Arguments :
+    - ouvrir : fonction asynchrone qui ouvre la connexion (renvoie lecteur, ecrivain)
+    - lignes : lignes de creer_lignes()
+    - profondeur : nombre maximum de lignes envoyées sans avoir reçu la réponse
+    - latences : liste complétée avec la latence (s) de chaque ligne
+    - verifier : comparer chaque résultat avec convert()
+    Renvoie :
+    - nb_erreurs : nombre de réponses avec une erreur ou un résultat faux
+    """
+    lecteur, ecrivain = await ouvrir()
+    places = asyncio.Semaphore(profondeur)
+    envois = asyncio.Queue() # Heures d'envoi, dans l'ordre des lignes
+
+    async def envoyer():
+        for ligne, _ in lignes:
+            await places.acquire()
+            await envois.put(perf_counter())
+            ecrivain.write(ligne)
+            await ecrivain.drain()
+
+    envoi = asyncio.create_task(envoyer())
+    nb_erreurs = 0
+    for _, requetes in lignes:
+        reponse = await lecteur.readline()
+        latences.append(perf_counter() - await envois.get())
+        places.release()
+        if not reponse:
+            raise ConnectionError("Connexion fermée par le serveur")
+        reponses = json.loads(reponse)
+        if not isinstance(reponses, list):
+            reponses = [reponses]
+        for requete, resultat in zip(requetes, reponses):
+            if "erreur" in resultat or resultat.get("id") != requete["id"]:
+                nb_erreurs += 1
+            elif verifier and resultat["resultat"] != convert(requete["nombre"], requete["base_origine"], requete["base_destination"]):
+                nb_erreurs += 1
+    await envoi
+    ecrivain.close()
+    await ecrivain.wait_closed()
+    return nb_erreurs
+
+def centile(valeurs_triees, pourcentage):
+    return valeurs_triees[min(len(valeurs_triees) - 1, int(len(valeurs_triees) * pourcentage / 100))]
+
+async def tester(arguments):
+    if arguments.unix:
+        ouvrir = lambda: asyncio.open_unix_connection(arguments.unix, limit=64 << 20)
+    else:
+        ouvrir = lambda: asyncio.open_connection(arguments.hote, arguments.port, limit=64 << 20)
+
+    # Lignes préparées à l'avance pour ne mesurer que le serveur
+    nb_lignes = max(arguments.requetes // arguments.lot // arguments.connexions, 1)
+    lignes = [creer_lignes(nb_lignes, arguments.lot, arguments.bits, arguments.base_origine, arguments.base_destination) for _ in range(arguments.connexions)]
+    latences = []
+    debut = perf_counter()
+    erreurs = await asyncio.gather(*(connexion(ouvrir, lignes_connexion, arguments.profondeur, latences, arguments.verifier) for lignes_connexion in lignes))
+    duree = perf_counter() - debut
+
+    nb_requetes = nb_lignes * arguments.lot * arguments.connexions
+    latences.sort()
+    print(f"Requêtes      : {nb_requetes} ({arguments.connexions} connexions, {arguments.lot} par ligne, {arguments.profondeur} lignes en attente au plus)")
+    print(f"Durée         : {duree:.3f} s")
+    print(f"Débit         : {nb_requetes / duree:.0f} requêtes/s")
+    print(f"Latence p50   : {centile(latences, 50) * 1000:.3f} ms (par ligne)")
+    print(f"Latence p99   : {centile(latences, 99) * 1000:.3f} ms (par ligne)")
+    print(f"Erreurs       : {sum(erreurs)}")
+    return sum(erreurs)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test de charge de conversion-serveur.py")
+    adresse = parser.add_mutually_exclusive_group()
+    adresse.add_argument("--unix", metavar="CHEMIN", help="socket Unix du serveur")
+    adresse.add_argument("--port", type=int, default=8462, help="port TCP du serveur (8462 par défaut)")
+    parser.add_argument("--hote", default="127.0.0.1", help="adresse TCP du serveur")
+    parser.add_argument("-n", "--requetes", type=int, default=100000, help="nombre total de requêtes")
+    parser.add_argument("-c", "--connexions", type=int, default=4, help="nombre de connexions en même temps")
+    parser.add_argument("--lot", type=int, default=1, help="nombre de requêtes par ligne")
+    parser.add_argument("--profondeur", type=int, default=64, help="nombre de lignes envoyées sans attendre la réponse, par connexion")
+    parser.add_argument("--bits", type=int, default=64, help="taille des nombres convertis (en bits)")
+    parser.add_argument("--from", dest="base_origine", type=int, default=10, help="base d'origine")
+    parser.add_argument("--to", dest="base_destination", type=int, default=16, help="base de destination")
+    parser.add_argument("--verifier", action="store_true", help="vérifier chaque résultat avec conversion.py")
+    arguments = parser.parse_args()
+    if min(arguments.requetes, arguments.connexions, arguments.lot, arguments.profondeur, arguments.bits) < 1:
+        parser.error("les nombres de requêtes, connexions, lots, la profondeur et la taille doivent être positifs")
+
+    try:
+        exit(1 if asyncio.run(tester(arguments)) else 0)
+    except OSError as erreur:
+        print(f"Connexion impossible : {erreur.strerror or erreur}")
+        exit(1)
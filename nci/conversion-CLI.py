@@ -7,6 +7,8 @@
 from conversion import *
 from os import system as command
 from platform import system
+from sys import argv, stdin, stdout, stderr
+import argparse # Pour le mode non interactif
 
 ascii_logo = '''===================
 
@@ -18,117 +20,236 @@ mm   m   mmm  mmmmm
 
 ===================\n'''
 
-# Utilisation de la bonne commande pour vider l'écran
-clear_commands = {"Windows": "cls",
-                  "Linux": "clear",
-                  "Darwin": "clear"}
-clear = clear_commands[system()]
-
-# Valeurs par défaut
-bases_listes = ["Base 10 (Décimal)", "Base 2 (Binaire)", "Base 16 (Hexadécimal)"]
-base_origine_index = None
-base_converti_index = None
-current_mode = 0
-
-while True:
-    # Sélection de la base d'origine
-    if current_mode == 0:
-        command(clear)
-        print(ascii_logo)
-        print("Pressez Ctrl-C pour quitter\n")
-        print("Choisissez votre base d'origine")
-        
-        # Affiche la liste des bases
-        index_liste = []
-        for position in range(len(bases_listes)):
-            print(f'{position+1}: {bases_listes[position]}')
-            index_liste.append(position)
-        
-        while True:
-            # Demande la base d'origine et vérifie si le choix est valide
+# Mode non interactif : conversion-CLI.py --from 10 --to 16 [fichiers...]
+#                       conversion-CLI.py --dump [--bin] fichier (ou --reverse [--bin] dump)
+def base_argument(texte):
+    """
+    base_argument : base donnée en argument
+    Arguments :
+    - texte : chaîne de caractères (entier entre 2 et 36 ou alphabet)
+    Renvoie :
+    - base : entier ou chaîne de caractères
+    """
+    if texte.isdigit() and not texte.startswith("0"): # "16" : base 16, "01" : alphabet
+        return int(texte)
+    return texte
+
+if __name__ == "__main__" and len(argv) > 1:
+    parser = argparse.ArgumentParser(description="Convertit un nombre par ligne depuis l'entrée standard ou des fichiers")
+    parser.add_argument("--from", dest="base_origine", type=base_argument, help="base d'origine (2 à 36) ou alphabet")
+    parser.add_argument("--to", dest="base_destination", type=base_argument, help="base de destination (2 à 36) ou alphabet")
+    mode_dump = parser.add_mutually_exclusive_group()
+    mode_dump.add_argument("--dump", action="store_true", help="afficher le contenu de fichiers binaires en hexadécimal (comme xxd)")
+    mode_dump.add_argument("--reverse", action="store_true", help="reconstruire un fichier binaire à partir d'un dump")
+    parser.add_argument("--bin", action="store_true", help="dump en binaire au lieu de l'hexadécimal")
+    parser.add_argument("--flux", action="store_true", help="l'entrée est un seul nombre (très long) converti morceau par morceau (binaire <-> hexadécimal)")
+    parser.add_argument("--cache", type=int, metavar="MO", default=0, help="garder les conversions récentes en cache (taille en Mo)")
+    parser.add_argument("--stats-cache", action="store_true", help="afficher les statistiques du cache à la fin (sur la sortie d'erreur)")
+    parser.add_argument("--groupe", type=int, default=0, metavar="N", help="séparer les chiffres des résultats par groupes de N (ex : 3 pour les milliers, 4 pour les quartets)")
+    parser.add_argument("--separateur", default=" ", help="séparateur des groupes de chiffres (espace par défaut)")
+    parser.add_argument("-j", "--processus", type=int, default=1, help="nombre de processus pour convertir les fichiers (0 : un par coeur)")
+    parser.add_argument("--profil", choices=["texte", "json"], help="mesurer les fonctions de conversion et afficher un rapport à la fin")
+    parser.add_argument("--profil-fichier", metavar="FICHIER", help="écrire le rapport dans un fichier (sortie d'erreur par défaut)")
+    parser.add_argument("--profil-memoire", action="store_true", help="ajouter le pic mémoire au rapport (tracemalloc, plus lent)")
+    parser.add_argument("fichiers", nargs="*", help="fichiers à convertir (entrée standard si aucun ou -)")
+    arguments = parser.parse_args()
+    stdin.reconfigure(errors="replace") # Octets non UTF-8 : lignes invalides au lieu d'une exception
+
+    # Instrumentation : remplace les fonctions du module, il faut donc les importer de nouveau
+    if arguments.profil or arguments.profil_fichier or arguments.profil_memoire:
+        activer_profil(arguments.profil or "texte", arguments.profil_fichier, arguments.profil_memoire)
+        from conversion import *
+    base_dump = 2 if arguments.bin else 16
+
+    # Dump d'un fichier binaire
+    if arguments.dump:
+        if not arguments.fichiers or "-" in arguments.fichiers:
+            parser.error("--dump nécessite un fichier")
+        sortie = open(stdout.fileno(), "w", encoding="utf-8", buffering=1 << 20, closefd=False)
+        try:
+            for fichier in arguments.fichiers:
+                dump_fichier(fichier, sortie, base_dump)
+            sortie.flush()
+        except OSError as erreur:
+            if isinstance(erreur, BrokenPipeError): # Sortie fermée (ex : | head)
+                exit(0)
+            stderr.write(f"{erreur.filename}: {erreur.strerror}\n")
+            exit(1)
+        exit(0)
+
+    # Reconstruction d'un fichier binaire à partir d'un dump
+    if arguments.reverse:
+        try:
+            for fichier in arguments.fichiers or ["-"]:
+                with (stdin if fichier == "-" else open(fichier, encoding="utf-8")) as entree:
+                    restaurer_dump(entree, stdout.buffer, base_dump)
+            stdout.buffer.flush()
+        except ValueError as erreur:
+            stderr.write(f"{fichier}: {erreur}\n")
+            exit(1)
+        except OSError as erreur:
+            stderr.write(f"{fichier}: {erreur.strerror}\n")
+            exit(1)
+        exit(0)
+
+    if arguments.base_origine is None or arguments.base_destination is None:
+        parser.error("--from et --to sont nécessaires")
+
+    # Un seul très grand nombre, converti sans le charger en mémoire
+    if arguments.flux:
+        if (arguments.base_origine, arguments.base_destination) not in ((2, 16), (16, 2)):
+            parser.error("--flux fonctionne uniquement entre binaire et hexadécimal")
+        sortie = open(stdout.fileno(), "w", encoding="utf-8", buffering=1 << 20, closefd=False)
+        try:
+            for fichier in arguments.fichiers or ["-"]:
+                with (stdin if fichier == "-" else open(fichier, encoding="utf-8", errors="replace")) as entree:
+                    transcoder_flux(entree, sortie, arguments.base_origine, arguments.base_destination)
+            sortie.flush()
+        except BrokenPipeError: # Sortie fermée (ex : | head)
+            exit(0)
+        except ValueError as erreur:
+            stderr.write(f"{fichier}: {erreur}\n")
+            exit(1)
+        except OSError as erreur:
+            stderr.write(f"{fichier}: {erreur.strerror}\n")
+            exit(1)
+        exit(0)
+
+    try:
+        plan_conversion(arguments.base_origine, arguments.base_destination)
+    except ValueError as erreur:
+        parser.error(str(erreur))
+
+    if arguments.cache:
+        activer_cache(arguments.cache << 20)
+
+    # Sortie avec un grand tampon (écritures groupées)
+    sortie = open(stdout.fileno(), "w", encoding="utf-8", buffering=1 << 20, closefd=False)
+    # Vers un fichier ou un tube, les très grands résultats sont écrits par morceaux (sans construire tout leur texte)
+    ecriture_directe = not sortie.isatty()
+    total_invalides = 0
+    try:
+        for fichier in arguments.fichiers or ["-"]:
             try:
-                base_origine_index = int(input("Choix : "))-1
-                if not base_origine_index in index_liste:
-                    raise ValueError
-                current_mode = 1
-                break
-            except ValueError:
-                print("Choix invalide")
-            except KeyboardInterrupt: # Si Ctrl-C pressé : Quitte le programme
-                exit()
-    
-    # Sélection de la base de destination
-    if current_mode == 1:
-        command(clear)
-        print(ascii_logo)
-        print("Pressez Ctrl-C pour revenir au menu précédent\n")
-        print("Choisissez votre base de destination")
+                # Plusieurs processus : uniquement pour les fichiers (découpés en morceaux)
+                if fichier != "-" and arguments.processus != 1:
+                    total_invalides += convert_fichier_parallele(fichier, sortie, arguments.base_origine, arguments.base_destination, arguments.processus or None, stderr, groupe=arguments.groupe, separateur=arguments.separateur)[1]
+                    continue
+                entree = stdin if fichier == "-" else open(fichier, encoding="utf-8", errors="replace", buffering=1 << 20)
+            except OSError as erreur:
+                stderr.write(f"{fichier}: {erreur.strerror}\n")
+                total_invalides += 1
+                continue
+            with entree:
+                total_invalides += convert_flux(entree, sortie, arguments.base_origine, arguments.base_destination, stderr, fichier, arguments.groupe, arguments.separateur, ecriture_directe)[1]
+        sortie.flush()
+    except BrokenPipeError: # Sortie fermée (ex : | head)
+        pass
+    except KeyboardInterrupt:
+        pass
+    if arguments.stats_cache:
+        statistiques = statistiques_cache()
+        if statistiques is None:
+            stderr.write("Cache : désactivé (utilisez --cache)\n")
+        else:
+            stderr.write(f"Cache : {statistiques['succes']} succès, {statistiques['echecs']} échecs "
+                         f"(taux de succès {statistiques['taux_succes']:.1%}), {statistiques['evictions']} évictions, "
+                         f"{statistiques['entrees']} entrées, {statistiques['octets']}/{statistiques['taille_max']} octets\n")
+    exit(1 if total_invalides else 0)
+
+# Mode interactif
+if __name__ == "__main__":
+    # Utilisation de la bonne commande pour vider l'écran
+    clear_commands = {"Windows": "cls",
+                      "Linux": "clear",
+                      "Darwin": "clear"}
+    clear = clear_commands[system()]
+
+    # Valeurs par défaut
+    bases_listes = ["Base 10 (Décimal)", "Base 2 (Binaire)", "Base 16 (Hexadécimal)"]
+    bases_valeurs = [10, 2, 16] # Base correspondante pour convert()
+    base_origine_index = None
+    base_converti_index = None
+    current_mode = 0
+
+    while True:
+        # Sélection de la base d'origine
+        if current_mode == 0:
+            command(clear)
+            print(ascii_logo)
+            print("Pressez Ctrl-C pour quitter\n")
+            print("Choisissez votre base d'origine")
         
-        # Affiche la liste des bases SAUF la base qui a été choisie précédemment
-        index_liste = []
-        for position in range(len(bases_listes)):
-            if bases_listes[base_origine_index] != bases_listes[position]:
+            # Affiche la liste des bases
+            index_liste = []
+            for position in range(len(bases_listes)):
                 print(f'{position+1}: {bases_listes[position]}')
                 index_liste.append(position)
+        
+            while True:
+                # Demande la base d'origine et vérifie si le choix est valide
+                try:
+                    base_origine_index = int(input("Choix : "))-1
+                    if not base_origine_index in index_liste:
+                        raise ValueError
+                    current_mode = 1
+                    break
+                except ValueError:
+                    print("Choix invalide")
+                except KeyboardInterrupt: # Si Ctrl-C pressé : Quitte le programme
+                    exit()
     
-        while True:
-            # Demande la base pour le nombre converti et vérifie si le choix est valide
-            try:
-                base_converti_index = int(input("Choix : "))-1
-                if not base_converti_index in index_liste:
-                    raise ValueError
-                current_mode = 2
-                break
-            except ValueError:
-                print("Choix invalide")
-            # Si Ctrl-C pressé : Reviens au menu précédent
-            except KeyboardInterrupt:
-                current_mode = 0
-                break
+        # Sélection de la base de destination
+        if current_mode == 1:
+            command(clear)
+            print(ascii_logo)
+            print("Pressez Ctrl-C pour revenir au menu précédent\n")
+            print("Choisissez votre base de destination")
+        
+            # Affiche la liste des bases SAUF la base qui a été choisie précédemment
+            index_liste = []
+            for position in range(len(bases_listes)):
+                if bases_listes[base_origine_index] != bases_listes[position]:
+                    print(f'{position+1}: {bases_listes[position]}')
+                    index_liste.append(position)
+    
+            while True:
+                # Demande la base pour le nombre converti et vérifie si le choix est valide
+                try:
+                    base_converti_index = int(input("Choix : "))-1
+                    if not base_converti_index in index_liste:
+                        raise ValueError
+                    current_mode = 2
+                    break
+                except ValueError:
+                    print("Choix invalide")
+                # Si Ctrl-C pressé : Reviens au menu précédent
+                except KeyboardInterrupt:
+                    current_mode = 0
+                    break
 
     
-    # Conversion
-    if current_mode == 2:
-        command(clear)
-        print(ascii_logo)
-        print("Pressez Ctrl-C pour revenir au menu précédent\n")
+        # Conversion
+        if current_mode == 2:
+            command(clear)
+            print(ascii_logo)
+            print("Pressez Ctrl-C pour revenir au menu précédent\n")
 
-        while True:
-            try:
-                # Demande le nombre à convertir
-                nb_a_convertir = input(f"Nombre en {bases_listes[base_origine_index]} à convertir : ")
-                nb_converti = None
-
-                if base_origine_index == 0: # Décimal -> ...
-                    nb_a_convertir = int(nb_a_convertir)
-                    if base_converti_index == 1: # Décimal -> Binaire
-                        nb_converti = dec_to_bin(nb_a_convertir)
-                    if base_converti_index == 2: # Décimal -> Hexadécimal
-                        nb_converti = dec_to_hexa(nb_a_convertir)
-                
-                if base_origine_index == 1: # Binaire -> ...
-                    if base_converti_index == 0: # Binaire -> Décimal
-                        nb_converti = bin_to_dec(nb_a_convertir)
-                    if base_converti_index == 2: # Binaire -> Hexadécimal
-                        nb_converti = bin_to_hexa(nb_a_convertir)
-                
-                if base_origine_index == 2: # Hexadécimal -> ...
-                    if base_converti_index == 0: # Hexadécimal -> Décimal
-                        nb_converti = hexa_to_dec(nb_a_convertir)
-                    if base_converti_index == 1: # Hexadécimal -> Binaire
-                        nb_converti = hexa_to_bin(nb_a_convertir)
-
-                # Affiche le nombre converti
-                print(f"Nombre converti en {bases_listes[base_converti_index]} : {nb_converti}")
-
-            # Message d'erreur pour nombre invalide
-            except ValueError:
-                print("Nombre invalide!") # Décimal et Binaire
-            except KeyError:
-                print("Nombre invalide!") # Hexadécimal
-
-            # Si Ctrl-C pressé : Reviens au menu précédent
-            except KeyboardInterrupt:
-                current_mode = 1
-                break
+            while True:
+                try:
+                    # Demande le nombre à convertir
+                    nb_a_convertir = input(f"Nombre en {bases_listes[base_origine_index]} à convertir : ")
+                    nb_converti = convert(nb_a_convertir.strip(), bases_valeurs[base_origine_index], bases_valeurs[base_converti_index])
+
+                    # Affiche le nombre converti
+                    print(f"Nombre converti en {bases_listes[base_converti_index]} : {nb_converti}")
+
+                # Message d'erreur pour nombre invalide
+                except ValueError:
+                    print("Nombre invalide!")
+
+                # Si Ctrl-C pressé : Reviens au menu précédent
+                except KeyboardInterrupt:
+                    current_mode = 1
+                    break
             
\ No newline at end of file
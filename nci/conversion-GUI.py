@@ -4,37 +4,89 @@
 # Version GUI
 # Par Nolan CACERES VASQUEZ et Merwan DE LA PENA TORTELLIER
 
+from time import perf_counter
+debut_demarrage = perf_counter() # Pour le rapport de démarrage
+
 from conversion import *
 from tkinter import *
 from tkinter import ttk # Pour la liste déroulante
-from pygame import mixer # Pour le son
+from sys import argv, executable, exit
+fin_imports = perf_counter()
 
-# Son d'explosion pour erreur
-mixer.init()
+# Son d'explosion pour erreur (pygame est importé seulement à la première erreur, il est long à charger)
 sound_file_path = 'src/deltarune_explosion.wav'
-mixer.music.load(sound_file_path)
+mixer = None
+
+def jouer_explosion():
+    global mixer
+    if mixer is None:
+        from pygame import mixer as module_mixer
+        module_mixer.init()
+        module_mixer.music.load(sound_file_path)
+        mixer = module_mixer
+    mixer.music.play()
+
+# Images décodées une seule fois (PhotoImage doit rester référencée pour rester affichée)
+images = {}
+
+def charger_image(nom):
+    if nom not in images:
+        images[nom] = PhotoImage(file=f'./src/{nom}')
+    return images[nom]
+
+# Base correspondante pour chaque choix du menu
+bases_valeurs = {"Décimal": 10, "Binaire": 2, "Hexadécimal": 16}
+
+# Dernier nombre converti (garde ses représentations pour les conversions dans l'autre sens)
+dernier_nombre = None
+
+# Conversion en arrière-plan
+TAILLE_ARRIERE_PLAN = 5000 # Nombre de chiffres à partir duquel la conversion se fait dans un autre processus
+INTERVALLE_VERIFICATION = 50 # Temps (ms) entre deux vérifications du résultat
+conversion_en_cours = None # ConversionArrierePlan en cours (None si aucune)
+numero_conversion = 0 # Augmente à chaque conversion, pour ignorer les vérifications d'une conversion remplacée
+
+def obtenir_nombre(texte, base):
+    """
+    obtenir_nombre : Number correspondant au texte, réutilise le dernier nombre converti si c'est le même
+    Arguments :
+    - texte : chaîne de caractères
+    - base : entier
+    Renvoie :
+    - nombre : Number
+    """
+    global dernier_nombre
+    if dernier_nombre is None or dernier_nombre.en_cache(base) != texte:
+        dernier_nombre = Number(texte, base)
+    return dernier_nombre
+
+# Popup d'erreur (créé à la première erreur puis seulement caché et réaffiché)
+error_window = None
 
-# Créer le popup d'erreur
 def summon_error_window():
-        # Config de la fenêtre
-        error_window = Toplevel()
-        error_window.title("Erreur")
-        error_window.geometry("200x60")
-        error_window.resizable(0, 0)
-
-        # Image de dynamite
-        dynamite = PhotoImage(file='./src/bomb_dynamite.png')
-        dynamite_label = Label(error_window, image=dynamite)
-        dynamite_label.photo = dynamite
-
-        error_label = Label(error_window, text="Nombre vide/invalide")
-
-        # Placement des widgets
-        dynamite_label.grid(row=0, column=1, padx=10, pady=10)
-        error_label.grid(row=0, column=2, padx=10, pady=10)
+        global error_window
+        if error_window is None:
+            # Config de la fenêtre
+            error_window = Toplevel()
+            error_window.title("Erreur")
+            error_window.geometry("200x60")
+            error_window.resizable(0, 0)
+            error_window.protocol("WM_DELETE_WINDOW", error_window.withdraw) # Cacher au lieu de détruire
+
+            # Image de dynamite
+            dynamite_label = Label(error_window, image=charger_image('bomb_dynamite.png'))
+
+            error_label = Label(error_window, text="Nombre vide/invalide")
+
+            # Placement des widgets
+            dynamite_label.grid(row=0, column=1, padx=10, pady=10)
+            error_label.grid(row=0, column=2, padx=10, pady=10)
+        else:
+            error_window.deiconify()
+        error_window.lift()
 
         # B O O M
-        mixer.music.play()
+        jouer_explosion()
 
 
 # Obtenir les nombres et les bases
@@ -43,136 +95,174 @@ def get_numbers_and_bases():
     numbers = [first_entry.get(), second_entry.get()]
     return [bases, numbers]
 
-# Convertir de gauche à droite
-def convert_first_to_second():
-    numbers_and_bases = get_numbers_and_bases()
-    number_to_convert = numbers_and_bases[1][0]
+# Afficher le résultat d'une conversion
+def afficher_resultat(entry, texte):
+    entry.delete(0,END)
+    entry.insert(0,texte)
+
+# Arrêter la conversion en cours (une nouvelle conversion remplace la précédente)
+def annuler_conversion():
+    global conversion_en_cours
+    if conversion_en_cours is not None:
+        conversion_en_cours.annuler()
+        conversion_en_cours = None
+    progression.stop()
+    progression_frame.grid_remove()
+
+# Lancer une conversion : directement si le nombre est court ou déjà converti, sinon dans un autre processus
+def lancer_conversion(number_to_convert, base_origine, base_destination, entry):
+    global conversion_en_cours, numero_conversion, dernier_nombre
+    annuler_conversion()
+    numero_conversion += 1
 
     # Vérifie si le nombre à convertir n'est pas vide et affiche la fenêtre d'erreur si oui
     if bool(number_to_convert.strip()) == False:
         summon_error_window()
+        return
+    number_to_convert = number_to_convert.strip()
 
-    else:
+    # Nombre court ou déjà converti : pas besoin d'un autre processus
+    if len(number_to_convert) < TAILLE_ARRIERE_PLAN or (dernier_nombre is not None and dernier_nombre.en_cache(base_origine) == number_to_convert):
         try:
-            if numbers_and_bases[0][0] == "Décimal":
-                number_to_convert = int(number_to_convert)
-                if numbers_and_bases[0][1] == "Binaire":
-                    converted_number = dec_to_bin(number_to_convert)
-                if numbers_and_bases[0][1] == "Hexadécimal":
-                   converted_number = dec_to_hexa(number_to_convert)
-
-            if numbers_and_bases[0][0] == "Binaire":
-                if numbers_and_bases[0][1] == "Décimal":
-                    converted_number = bin_to_dec(number_to_convert)
-                if numbers_and_bases[0][1] == "Hexadécimal":
-                    converted_number = bin_to_hexa(number_to_convert)
-
-            if numbers_and_bases[0][0] == "Hexadécimal":
-                if numbers_and_bases[0][1] == "Décimal":
-                    converted_number = hexa_to_dec(number_to_convert)
-                if numbers_and_bases[0][1] == "Binaire":
-                    converted_number = hexa_to_bin(number_to_convert)
-
-            converted_number = str(converted_number)
-            second_entry.delete(0,END)
-            second_entry.insert(0,converted_number)
-
-        # Nombres invalides (décimal et binaire)
+            number = obtenir_nombre(number_to_convert, base_origine)
+            afficher_resultat(entry, number.en_base(base_destination))
+
+        # Nombres invalides
         except ValueError:
             summon_error_window()
-        # Nombres invalides (hexadécimal)
-        except KeyError:
-            summon_error_window()
-        # Fix pour bug conversion binaire/binaire avec valeurs invalides
-        except UnboundLocalError:
-            summon_error_window()
+        return
+
+    # Grand nombre : conversion en arrière-plan, la fenêtre reste utilisable
+    conversion_en_cours = ConversionArrierePlan(number_to_convert, base_origine, base_destination)
+    progression_frame.grid()
+    progression.start(10)
+    gui.after(INTERVALLE_VERIFICATION, verifier_conversion, numero_conversion, base_destination, entry)
+
+# Vérifier régulièrement si la conversion en arrière-plan est finie (avec after(), sans bloquer la fenêtre)
+def verifier_conversion(numero, base_destination, entry):
+    global conversion_en_cours, dernier_nombre
+    if numero != numero_conversion or conversion_en_cours is None: # Conversion remplacée ou annulée
+        return
+
+    resultat = conversion_en_cours.resultat()
+    if resultat is None:
+        gui.after(INTERVALLE_VERIFICATION, verifier_conversion, numero, base_destination, entry)
+        return
+
+    conversion_en_cours = None
+    progression.stop()
+    progression_frame.grid_remove()
+    reussi, number = resultat
+    if reussi:
+        dernier_nombre = number
+        afficher_resultat(entry, number.en_base(base_destination))
+
+    # Nombres invalides
+    else:
+        summon_error_window()
+
+# Convertir de gauche à droite
+def convert_first_to_second():
+    numbers_and_bases = get_numbers_and_bases()
+    lancer_conversion(numbers_and_bases[1][0], bases_valeurs[numbers_and_bases[0][0]], bases_valeurs[numbers_and_bases[0][1]], second_entry)
 
 # Convertir de droite à gauche
 def convert_second_to_first():
     numbers_and_bases = get_numbers_and_bases()
-    number_to_convert = numbers_and_bases[1][1]
-
-    # Vérifie si le nombre à convertir n'est pas vide et affiche la fenêtre d'erreur si oui
-    if bool(number_to_convert.strip()) == False:
-        summon_error_window()
-
-    else:
-        try:
-            if numbers_and_bases[0][1] == "Décimal":
-                number_to_convert = int(number_to_convert)
-                if numbers_and_bases[0][0] == "Binaire":
-                    converted_number = dec_to_bin(number_to_convert)
-                if numbers_and_bases[0][0] == "Hexadécimal":
-                   converted_number = dec_to_hexa(number_to_convert)
-
-            if numbers_and_bases[0][1] == "Binaire":
-                if numbers_and_bases[0][0] == "Décimal":
-                    converted_number = bin_to_dec(number_to_convert)
-                if numbers_and_bases[0][0] == "Hexadécimal":
-                    converted_number = bin_to_hexa(number_to_convert)
-
-            if numbers_and_bases[0][1] == "Hexadécimal":
-                if numbers_and_bases[0][0] == "Décimal":
-                    converted_number = hexa_to_dec(number_to_convert)
-                if numbers_and_bases[0][0] == "Binaire":
-                    converted_number = hexa_to_bin(number_to_convert)
-
-            converted_number = str(converted_number)
-            first_entry.delete(0,END)
-            first_entry.insert(0,converted_number)
-
-        # Nombres invalides (décimal et binaire)
-        except ValueError:
-            summon_error_window()
-        # Nombres invalides (hexadécimal)
-        except KeyError:
-            summon_error_window()
-        # Fix pour bug conversion binaire/binaire avec valeurs invalides
-        except UnboundLocalError:
-            summon_error_window()
-
-# Configuration de l'interface graphique de la fenêtre principale
-gui = Tk()
-gui.title("NCI")
-gui.geometry("263x110")
-gui.resizable(0, 0)
-icon_small = PhotoImage(file="./src/icon-16.png")
-icon_big = PhotoImage(file="./src/icon-32.png")
-gui.iconphoto(True, icon_small, icon_big)
-
-# Arrière-plan
-background = PhotoImage(file='./src/bg.png')
-background_label = Label(gui, image=background)
-background_label.place(x=0, y=0, relwidth=1, relheight=1)
-
-# Menu des bases
-bases = ["Décimal", "Binaire", "Hexadécimal"]
-first_menu = ttk.Combobox(gui, values=bases, width=12, state="readonly")
-second_menu = ttk.Combobox(gui, values=bases, width=12, state="readonly")
-
-first_menu['values'] = ("Décimal", "Binaire", "Hexadécimal")
-second_menu['values'] = ("Décimal", "Binaire", "Hexadécimal")
-
-# Options par défaut pour le menu
-first_menu.current(0)
-second_menu.current(1)
-
-first_entry = Entry(gui, width=12, bg= '#000000', fg='#00d52e')
-second_entry = Entry(gui, width=12, bg= '#000000', fg='#00d52e')
-
-# Bouttons
-btn_frame = Frame(gui)
-btn_left_to_right = Button(btn_frame, text=">>>", height=1, bd=1, command=convert_first_to_second)
-btn_right_to_left = Button(btn_frame, text="<<<", height=1, bd=1, command=convert_second_to_first)
-btn_left_to_right.pack(side=TOP)
-btn_right_to_left.pack(side=BOTTOM)
-
-# Placement des widgets
-first_menu.grid(row=1, column=0, padx=10, pady=10)
-second_menu.grid(row=1, column=2, padx=10, pady=10)
-first_entry.grid(row=2, column=0)
-second_entry.grid(row=2, column=2)
-btn_frame.grid(row=2, column=1, pady=10)
-
-# Boucle infinie
-gui.mainloop()
+    lancer_conversion(numbers_and_bases[1][1], bases_valeurs[numbers_and_bases[0][1]], bases_valeurs[numbers_and_bases[0][0]], first_entry)
+
+# Rapport de démarrage : relance le programme avec python -X importtime et affiche le temps de chaque étape
+def rapport_demarrage(nb_imports=10):
+    import subprocess # Seulement pour le rapport (pas au démarrage normal)
+
+    debut = perf_counter()
+    processus = subprocess.run([executable, "-X", "importtime", __file__, "--mesurer-demarrage"], capture_output=True, text=True)
+    temps_total = perf_counter() - debut
+    if processus.returncode != 0:
+        print("\n".join(ligne for ligne in processus.stderr.splitlines() if not ligne.startswith("import time:")))
+        exit(1)
+
+    # Lignes "import time: propre [us] | cumulé [us] | module" (les sous-modules sont indentés)
+    imports = []
+    for ligne in processus.stderr.splitlines():
+        if not ligne.startswith("import time:") or "[us]" in ligne:
+            continue
+        _, cumule, module = ligne[len("import time:"):].split("|")
+        if not module[1:].startswith(" "): # Import de premier niveau
+            imports.append((int(cumule) / 1000, module.strip()))
+    imports.sort(reverse=True)
+    temps_imports, temps_programme = map(float, processus.stdout.split()[-2:])
+
+    print("Rapport de démarrage (python -X importtime)")
+    print(f"Démarrage jusqu'à l'affichage de la fenêtre : {temps_total * 1000:8.1f} ms")
+    print(f"- Interpréteur Python (démarrage, arrêt)   : {(temps_total - temps_programme) * 1000:8.1f} ms")
+    print(f"- Imports du programme                     : {temps_imports * 1000:8.1f} ms")
+    print(f"- Création de la fenêtre                   : {(temps_programme - temps_imports) * 1000:8.1f} ms")
+    print("\nImports les plus longs :")
+    for temps, module in imports[:nb_imports]:
+        print(f"- {module:<40} : {temps:8.1f} ms")
+
+if __name__ == "__main__" and "--rapport-demarrage" in argv:
+    rapport_demarrage()
+    exit(0)
+
+if __name__ == "__main__":
+    # Configuration de l'interface graphique de la fenêtre principale
+    gui = Tk()
+    gui.title("NCI")
+    gui.geometry("263x140")
+    gui.resizable(0, 0)
+    gui.iconphoto(True, charger_image("icon-16.png"), charger_image("icon-32.png"))
+
+    # Arrière-plan
+    background_label = Label(gui, image=charger_image('bg.png'))
+    background_label.place(x=0, y=0, relwidth=1, relheight=1)
+
+    # Menu des bases
+    bases = ["Décimal", "Binaire", "Hexadécimal"]
+    first_menu = ttk.Combobox(gui, values=bases, width=12, state="readonly")
+    second_menu = ttk.Combobox(gui, values=bases, width=12, state="readonly")
+
+    first_menu['values'] = ("Décimal", "Binaire", "Hexadécimal")
+    second_menu['values'] = ("Décimal", "Binaire", "Hexadécimal")
+
+    # Options par défaut pour le menu
+    first_menu.current(0)
+    second_menu.current(1)
+
+    first_entry = Entry(gui, width=12, bg= '#000000', fg='#00d52e')
+    second_entry = Entry(gui, width=12, bg= '#000000', fg='#00d52e')
+
+    # Bouttons
+    btn_frame = Frame(gui)
+    btn_left_to_right = Button(btn_frame, text=">>>", height=1, bd=1, command=convert_first_to_second)
+    btn_right_to_left = Button(btn_frame, text="<<<", height=1, bd=1, command=convert_second_to_first)
+    btn_left_to_right.pack(side=TOP)
+    btn_right_to_left.pack(side=BOTTOM)
+
+    # Placement des widgets
+    first_menu.grid(row=1, column=0, padx=10, pady=10)
+    second_menu.grid(row=1, column=2, padx=10, pady=10)
+    first_entry.grid(row=2, column=0)
+    second_entry.grid(row=2, column=2)
+    btn_frame.grid(row=2, column=1, pady=10)
+
+    # Indicateur de progression (visible seulement pendant une conversion en arrière-plan)
+    progression_frame = Frame(gui)
+    progression = ttk.Progressbar(progression_frame, mode="indeterminate", length=170)
+    btn_annuler = Button(progression_frame, text="Annuler", height=1, bd=1, command=annuler_conversion)
+    progression.pack(side=LEFT, padx=5)
+    btn_annuler.pack(side=RIGHT)
+    progression_frame.grid(row=3, column=0, columnspan=3)
+    progression_frame.grid_remove()
+    gui.bind("<Escape>", lambda event: annuler_conversion())
+
+    # Mesure du démarrage (voir rapport_demarrage) : affiche la fenêtre puis quitte
+    if "--mesurer-demarrage" in argv:
+        gui.update()
+        print(fin_imports - debut_demarrage, perf_counter() - debut_demarrage)
+        gui.destroy()
+        exit(0)
+
+    # Boucle infinie
+    gui.mainloop()
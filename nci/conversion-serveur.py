@@ -0,0 +1,223 @@
+# Numerical
+# Conversion
+# Interface
+# Version serveur (JSON lines sur socket Unix ou TCP local)
+# Par Nolan CACERES VASQUEZ et Merwan DE LA PENA TORTELLIER
+#
+# Protocole : une requête par ligne, une réponse par ligne, dans le même ordre (plusieurs requêtes peuvent
+# être envoyées sans attendre les réponses sur la même connexion)
+# - requête : {"id": 1, "nombre": "FF", "base_origine": 16, "base_destination": 10}  ("id" est optionnel)
+# - réponse : {"id": 1, "resultat": "255"} ou {"id": 1, "erreur": "Chiffre invalide 'G' à la position 0"}
+# - lot : une liste de requêtes sur une seule ligne, la réponse est la liste des réponses
+
+from conversion import *
+from concurrent.futures import ProcessPoolExecutor # Pour les très grandes conversions
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from sys import exit, stderr
+import argparse
+import asyncio
+import json
+import os
+import signal
+
+SEUIL_EXECUTEUR = 20000 # Nombre de chiffres à partir duquel une conversion est faite dans un autre processus
+TAILLE_LIGNE_MAX = 64 << 20 # Taille maximum d'une ligne (en octets)
+REPONSES_EN_ATTENTE = 1024 # Nombre de lignes lues en avance sur une connexion (au-delà, la lecture attend)
+
+executeur = None # ProcessPoolExecutor (créé au démarrage du serveur, recréé si un de ses processus s'arrête brutalement)
+nb_processus = None # Nombre de processus de l'exécuteur (None : un par coeur)
+
+def creer_executeur():
+    """
+    creer_executeur : crée l'exécuteur des très grandes conversions (l'ancien, s'il y en a un, est arrêté)
+    """
+    global executeur
+    ancien = executeur
+    # "spawn" : les processus créés avec fork garderaient une copie des sockets des clients déjà connectés
+    executeur = ProcessPoolExecutor(nb_processus, mp_context=get_context("spawn"))
+    if ancien is not None:
+        ancien.shutdown(wait=False, cancel_futures=True)
+
+def convertir_requete(requete):
+    """
+    convertir_requete : exécute une requête de conversion
+    Arguments :
+    - requete : dictionnaire {"nombre", "base_origine", "base_destination", "id" (optionnel)}
+    Renvoie :
+    - reponse : dictionnaire {"id" (si présent dans la requête), "resultat" ou "erreur"}
+    """
+    if not isinstance(requete, dict):
+        return {"erreur": "Requête invalide (objet JSON attendu)"}
+    reponse = {"id": requete["id"]} if "id" in requete else {}
+    try:
+        nombre = requete["nombre"]
+        base_origine = requete["base_origine"]
+        base_destination = requete["base_destination"]
+        if not isinstance(nombre, str) or not nombre:
+            raise ValueError("Nombre vide ou qui n'est pas une chaîne de caractères")
+        for base in (base_origine, base_destination):
+            if isinstance(base, bool) or not isinstance(base, (int, str)):
+                raise ValueError("Base invalide (entier ou alphabet attendu)")
+        reponse["resultat"] = convert(nombre, base_origine, base_destination)
+    except KeyError as cle:
+        reponse["erreur"] = f"Champ manquant : {cle.args[0]}"
+    except ValueError as erreur:
+        reponse["erreur"] = str(erreur)
+    return reponse
+
+def est_grande(requete):
+    return isinstance(requete, dict) and isinstance(requete.get("nombre"), str) and len(requete["nombre"]) >= SEUIL_EXECUTEUR
+
+def encoder(reponse):
+    return json.dumps(reponse, ensure_ascii=False).encode("utf-8") + b"\n"
+
+async def convertir_lot(requetes):
+    """
+    convertir_lot : exécute des requêtes dont certaines sont très grandes (envoyées à l'exécuteur)
+    Arguments :
+    - requetes : liste de requêtes
+    Renvoie :
+    - reponses : liste de réponses (dans l'ordre des requêtes)
+    """
+    boucle = asyncio.get_running_loop()
+    utilise = executeur
+    taches = []
+    try:
+        for requete in requetes:
+            if est_grande(requete):
+                taches.append(boucle.run_in_executor(utilise, convertir_requete, requete))
+            else:
+                resultat = boucle.create_future()
+                resultat.set_result(convertir_requete(requete))
+                taches.append(resultat)
+        return await asyncio.gather(*taches)
+    except BrokenProcessPool: # Processus arrêté brutalement (ex : mémoire insuffisante) : l'exécuteur est inutilisable
+        for tache in taches:
+            tache.cancel()
+        if executeur is utilise: # Pas encore recréé pour une autre requête
+            creer_executeur()
+        raise
+
+async def reponse_asynchrone(requetes, lot):
+    reponses = await convertir_lot(requetes)
+    return encoder(reponses if lot else reponses[0])
+
+def traiter_ligne(ligne):
+    """
+    traiter_ligne : traite une ligne reçue
+    Arguments :
+    - ligne : bytes
+    Renvoie :
+    - reponse : bytes (petites conversions, faites tout de suite) ou asyncio.Task (au moins une très grande conversion)
+    """
+    try:
+        requete = json.loads(ligne)
+    except ValueError: # JSON invalide ou mauvais encodage
+        return encoder({"erreur": "JSON invalide"})
+    lot = isinstance(requete, list)
+    requetes = requete if lot else [requete]
+    if any(est_grande(requete) for requete in requetes):
+        return asyncio.create_task(reponse_asynchrone(requetes, lot))
+    reponses = [convertir_requete(requete) for requete in requetes]
+    return encoder(reponses if lot else reponses[0])
+
+async def ecrire_reponses(reponses, ecrivain):
+    """
+    ecrire_reponses : envoie les réponses d'une connexion dans l'ordre des requêtes
+    Arguments :
+    - reponses : asyncio.Queue de bytes ou de asyncio.Task (None pour terminer)
+    - ecrivain : asyncio.StreamWriter
+    """
+    connecte = True
+    while True:
+        reponse = await reponses.get()
+        if reponse is None:
+            break
+        if not isinstance(reponse, bytes):
+            if not connecte:
+                reponse.cancel()
+                continue
+            try:
+                reponse = await reponse
+            except Exception as erreur: # Conversion interrompue : la connexion continue avec les lignes suivantes
+                reponse = encoder({"erreur": f"Erreur interne du serveur : {type(erreur).__name__}"})
+        if not connecte: # Client parti : vide la file pour ne pas bloquer la lecture
+            continue
+        try:
+            ecrivain.write(reponse)
+            if reponses.empty(): # Envoie les réponses groupées quand il n'y en a plus en attente
+                await ecrivain.drain()
+        except ConnectionError:
+            connecte = False
+    if connecte:
+        await ecrivain.drain()
+
+async def servir_connexion(lecteur, ecrivain):
+    reponses = asyncio.Queue(REPONSES_EN_ATTENTE)
+    ecriture = asyncio.create_task(ecrire_reponses(reponses, ecrivain))
+    try:
+        while True:
+            try:
+                ligne = await lecteur.readline()
+            except ValueError: # Ligne trop longue : impossible de retrouver le début de la suivante
+                await reponses.put(encoder({"erreur": f"Ligne trop longue (plus de {TAILLE_LIGNE_MAX} octets)"}))
+                break
+            except ConnectionError: # Client parti
+                break
+            if not ligne:
+                break
+            if ligne.strip():
+                await reponses.put(traiter_ligne(ligne))
+        await reponses.put(None)
+        await ecriture
+    except ConnectionError:
+        pass
+    finally:
+        ecriture.cancel()
+        ecrivain.close()
+
+async def lancer_serveur(unix, hote, port):
+    if unix:
+        serveur = await asyncio.start_unix_server(servir_connexion, path=unix, limit=TAILLE_LIGNE_MAX)
+        adresse = unix
+    else:
+        serveur = await asyncio.start_server(servir_connexion, hote, port, limit=TAILLE_LIGNE_MAX)
+        adresse = ", ".join(f"{socket.getsockname()[0]}:{socket.getsockname()[1]}" for socket in serveur.sockets)
+    stderr.write(f"Serveur NCI en écoute sur {adresse} (Ctrl-C pour arrêter)\n")
+    try:
+        async with serveur:
+            await serveur.serve_forever()
+    finally:
+        if unix and os.path.exists(unix): # Supprime le fichier du socket
+            os.remove(unix)
+
+def arreter(numero, pile):
+    raise KeyboardInterrupt # Arrêt (kill) traité comme Ctrl-C : le socket Unix est supprimé
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serveur de conversion (une requête JSON par ligne)")
+    ecoute = parser.add_mutually_exclusive_group()
+    ecoute.add_argument("--unix", metavar="CHEMIN", help="écouter sur un socket Unix")
+    ecoute.add_argument("--port", type=int, default=8462, help="écouter sur ce port TCP (8462 par défaut)")
+    parser.add_argument("--hote", default="127.0.0.1", help="adresse TCP (127.0.0.1 par défaut : accessible seulement en local)")
+    parser.add_argument("-j", "--processus", type=int, default=0, help="nombre de processus pour les très grandes conversions (0 : un par coeur)")
+    parser.add_argument("--seuil", type=int, default=SEUIL_EXECUTEUR, help="nombre de chiffres à partir duquel une conversion est faite dans un autre processus")
+    parser.add_argument("--cache", type=int, metavar="MO", default=0, help="garder les conversions récentes en cache (taille en Mo)")
+    arguments = parser.parse_args()
+
+    SEUIL_EXECUTEUR = arguments.seuil
+    if arguments.cache:
+        activer_cache(arguments.cache << 20)
+    nb_processus = arguments.processus or None
+    creer_executeur()
+    signal.signal(signal.SIGTERM, arreter)
+    try:
+        asyncio.run(lancer_serveur(arguments.unix, arguments.hote, arguments.port))
+    except KeyboardInterrupt:
+        pass
+    except OSError as erreur:
+        stderr.write(f"{erreur.strerror}\n")
+        exit(1)
+    finally:
+        executeur.shutdown(cancel_futures=True)
@@ -1,7 +1,1054 @@
 # conversion : Module pour conversion-CLI.py et conversion-GUI.py
 # Par Nolan CACERES VASQUEZ et Merwan DE LA PENA TORTELLIER
 
+import math # Pour estimer le nombre de chiffres
+import re # Pour vérifier les chiffres en un seul passage
+from functools import total_ordering, wraps # Pour comparer des Number et pour le cache
+from collections import OrderedDict # Pour le cache des conversions
+from itertools import chain # Pour remettre le début d'un flux devant la suite
+from sys import getsizeof, stderr # Pour la taille des entrées du cache et le rapport d'instrumentation
+from sys import byteorder # Pour les entiers de taille fixe
+from array import array # Pour les entiers de taille fixe
+import threading # Pour protéger le cache
+import os # Pour la conversion en parallèle
+from time import perf_counter # Pour l'instrumentation
+# decimal, multiprocessing, tempfile, mmap, json, atexit et tracemalloc sont importés dans les fonctions qui s'en servent
+# (ils ne servent qu'à la base 10, au parallélisme, au flux, au dump et à l'instrumentation, pas au démarrage)
+
+np = None # NumPy (optionnel) : importé seulement au premier appel de convert_batch ou parse_batch (long à importer)
+
+## Moteur de conversion (diviser pour régner)
+CHIFFRES = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+FORMATS_NATIFS = {2: "b", 8: "o", 16: "X"} # Bases puissances de 2 gérées directement par format()
+
+SEUIL_FEUILLE = 5 # Niveau (2**5 = 32 chiffres) en dessous duquel on convertit chiffre par chiffre
+SEUIL_FEUILLE_TEXTE = 10 # Niveau (2**10 = 1024 chiffres) en dessous duquel int() lit directement le texte
+BITS_FEUILLE_DECIMAL = 1024 # Taille (en bits) en dessous de laquelle decimal.Decimal convertit directement
+BITS_DECOUPAGE_DECIMAL = 1 << 17 # Taille (en bits) à partir de laquelle les autres bases sont découpées avec decimal.Decimal
+NIVEAU_ENTIER = 8 # Niveau (2**8 = 256 chiffres) en dessous duquel les morceaux decimal.Decimal redeviennent des entiers
+
+# Puissances mises en cache : base -> [base**1, base**2, base**4, base**8, ...]
+_cache_puissances = {}
+# Motifs des caractères refusés : (base, separateurs acceptés) -> expression régulière compilée
+_cache_motifs_invalides = {}
+PREFIXES = {2: "0b", 8: "0o", 16: "0x"} # Préfixes acceptés (comme en Python)
+# Puissances de 2 en decimal.Decimal : [2**1, 2**2, 2**4, 2**8, ...]
+_cache_puissances_2_decimal = []
+# Puissances en decimal.Decimal : base -> [base**1, base**2, base**4, base**8, ...]
+_cache_puissances_decimal = {}
+
+def _contexte_exact():
+    """
+    _contexte_exact : contexte decimal sans arrondi (précision maximale)
+    Renvoie :
+    - contexte : decimal.Context
+    """
+    import decimal
+    return decimal.Context(prec=decimal.MAX_PREC, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+
+def _puissances(base, niveau):
+    """
+    _puissances : liste des puissances base**(2**i) pour i allant de 0 à niveau (au moins)
+    Arguments :
+    - base : entier
+    - niveau : entier
+    Renvoie :
+    - puissances : liste d'entiers (partagée avec le cache, ne pas modifier)
+    """
+    puissances = _cache_puissances.setdefault(base, [base])
+    while len(puissances) <= niveau:
+        puissances.append(puissances[-1] * puissances[-1])
+    return puissances
+
+def _puissances_decimal(base, niveau):
+    """
+    _puissances_decimal : comme _puissances, en decimal.Decimal
+    Arguments :
+    - base : entier
+    - niveau : entier
+    Renvoie :
+    - puissances : liste de decimal.Decimal (partagée avec le cache, ne pas modifier)
+    """
+    import decimal
+    puissances = _cache_puissances_decimal.get(base)
+    if puissances is None:
+        puissances = _cache_puissances_decimal[base] = [decimal.Decimal(base)]
+    contexte = _contexte_exact()
+    while len(puissances) <= niveau:
+        puissances.append(contexte.multiply(puissances[-1], puissances[-1]))
+    return puissances
+
+def _chiffres_feuille(entier, base, largeur):
+    """
+    _chiffres_feuille : convertit un petit entier chiffre par chiffre
+    Arguments :
+    - entier : entier positif
+    - base : entier
+    - largeur : nombre de chiffres minimum (complété par des zéros), 0 pour aucun
+    Renvoie :
+    - chiffres : chaîne de caractères
+    """
+    if base in FORMATS_NATIFS:
+        return format(entier, f"0{largeur}{FORMATS_NATIFS[base]}")
+    chiffres = []
+    while entier:
+        entier, reste = divmod(entier, base)
+        chiffres.append(CHIFFRES[reste])
+    chiffres.reverse()
+    return ''.join(chiffres).rjust(largeur, "0")
+
+def _entier_vers_decimal(entier):
+    """
+    _entier_vers_decimal : convertit un entier en base 10 en le découpant selon des puissances de 2
+    (les multiplications de decimal.Decimal sont sous-quadratiques, contrairement à str())
+    Arguments :
+    - entier : entier positif
+    Renvoie :
+    - decimal : chaîne de caractères
+    """
+    return str(_entier_vers_objet_decimal(entier))
+
+def _entier_vers_objet_decimal(entier):
+    """
+    _entier_vers_objet_decimal : comme _entier_vers_decimal, mais sans produire la chaîne de caractères
+    Arguments :
+    - entier : entier positif
+    Renvoie :
+    - nombre : decimal.Decimal (entier, exposant 0)
+    """
+    import decimal
+    contexte = _contexte_exact()
+
+    def convertir(n, niveau):
+        # n < 2**(2**niveau)
+        if n.bit_length() <= BITS_FEUILLE_DECIMAL:
+            return decimal.Decimal(n)
+        while len(_cache_puissances_2_decimal) < niveau:
+            if _cache_puissances_2_decimal:
+                precedente = _cache_puissances_2_decimal[-1]
+                _cache_puissances_2_decimal.append(contexte.multiply(precedente, precedente))
+            else:
+                _cache_puissances_2_decimal.append(decimal.Decimal(2))
+        decalage = 1 << (niveau - 1)
+        haut = n >> decalage
+        bas = n & ((1 << decalage) - 1)
+        return contexte.add(contexte.multiply(convertir(haut, niveau - 1), _cache_puissances_2_decimal[niveau - 1]), convertir(bas, niveau - 1))
+
+    niveau = max(entier.bit_length() - 1, 1).bit_length()
+    return convertir(entier, niveau)
+
+def entier_vers_texte(entier, base):
+    """
+    entier_vers_texte : convertit un entier positif dans une base entre 2 et 36
+    (temps linéaire pour les puissances de 2, sous-quadratique pour les autres bases grâce à decimal.Decimal)
+    Arguments :
+    - entier : entier positif
+    - base : entier entre 2 et 36
+    Renvoie :
+    - texte : chaîne de caractères (chiffres en majuscules)
+    """
+    if entier < 0:
+        raise ValueError("Nombre négatif")
+    if base in FORMATS_NATIFS: # Bases 2, 8 et 16 : conversion directe en temps linéaire
+        return format(entier, FORMATS_NATIFS[base])
+    if base == 10:
+        if entier.bit_length() <= BITS_FEUILLE_DECIMAL: # Petit nombre : str() suffit
+            return str(entier)
+        return _entier_vers_decimal(entier)
+
+    return ''.join(generer_chiffres(entier, base)) or "0"
+
+def generer_chiffres(entier, base, depuis_la_fin=False, niveau_feuille=SEUIL_FEUILLE):
+    """
+    generer_chiffres : produit les chiffres d'un entier positif morceau par morceau (diviser pour régner)
+    Les grands entiers dans une base qui n'est pas une puissance de 2 sont découpés en decimal.Decimal :
+    divmod() sur les entiers est quadratique, la division de decimal.Decimal ne l'est pas
+    Arguments :
+    - entier : entier positif
+    - base : entier entre 2 et 36
+    - depuis_la_fin : True pour commencer par les chiffres de poids faible (chaque morceau est alors inversé)
+    - niveau_feuille : les morceaux font au plus 2**niveau_feuille chiffres
+    Renvoie :
+    - morceaux : générateur de chaînes de caractères (rien pour 0)
+    """
+    if entier < 0:
+        raise ValueError("Nombre négatif")
+    bits = base.bit_length() - 1 if base & (base - 1) == 0 else 0 # Base puissance de 2 : décalages
+    # Morceaux en decimal.Decimal au-dessus de niveau_entier (plus de 6 bits par chiffre en base 36 : niveau > niveau_entier)
+    niveau_entier = max(NIVEAU_ENTIER, niveau_feuille)
+    par_decimal = not bits and entier.bit_length() > max(BITS_DECOUPAGE_DECIMAL, 6 << niveau_entier)
+
+    # Trouve le niveau tel que entier < base**(2**niveau)
+    niveau = 0
+    if bits:
+        while bits << niveau < entier.bit_length():
+            niveau += 1
+    elif par_decimal:
+        contexte = _contexte_exact()
+        nombre = _entier_vers_objet_decimal(entier)
+        puissances_decimal = _puissances_decimal(base, niveau)
+        while puissances_decimal[niveau] <= nombre:
+            niveau += 1
+            puissances_decimal = _puissances_decimal(base, niveau)
+        puissances = _puissances(base, niveau_entier)
+    else:
+        puissances = _puissances(base, niveau)
+        while puissances[niveau] <= entier:
+            niveau += 1
+            puissances = _puissances(base, niveau)
+
+    def convertir(n, niveau, remplir):
+        # n < base**(2**niveau), remplir : compléter avec des zéros à gauche
+        if niveau <= niveau_feuille:
+            if niveau <= SEUIL_FEUILLE:
+                feuille = _chiffres_feuille(n, base, (1 << niveau) if remplir else 0)
+            else: # Grande feuille : conversion rapide de tout le morceau
+                feuille = entier_vers_texte(n, base).rjust((1 << niveau) if remplir else 0, "0")
+            yield feuille[::-1] if depuis_la_fin else feuille
+            return
+        if bits:
+            decalage = bits << (niveau - 1)
+            haut, bas = n >> decalage, n & ((1 << decalage) - 1)
+        elif par_decimal and niveau > niveau_entier: # n est un decimal.Decimal
+            haut, bas = contexte.divmod(n, puissances_decimal[niveau - 1])
+            if niveau - 1 == niveau_entier:
+                haut, bas = int(haut), int(bas)
+        else:
+            haut, bas = divmod(n, puissances[niveau - 1])
+        if haut or remplir:
+            if depuis_la_fin:
+                yield from convertir(bas, niveau - 1, True)
+                yield from convertir(haut, niveau - 1, remplir)
+            else:
+                yield from convertir(haut, niveau - 1, remplir)
+                yield from convertir(bas, niveau - 1, True)
+        else:
+            yield from convertir(bas, niveau - 1, False)
+
+    if entier:
+        yield from convertir(nombre if par_decimal else entier, niveau, False)
+
+def _puissance(base, exposant):
+    """
+    _puissance : calcule base**exposant à partir des puissances en cache (base**(2**i))
+    Arguments :
+    - base : entier
+    - exposant : entier positif
+    Renvoie :
+    - puissance : entier
+    """
+    if base & (base - 1) == 0:
+        return 1 << ((base.bit_length() - 1) * exposant)
+    puissances = _puissances(base, exposant.bit_length())
+    puissance = 1
+    for i in range(exposant.bit_length()):
+        if exposant >> i & 1:
+            puissance *= puissances[i]
+    return puissance
+
+class Chiffres:
+    """
+    Chiffres : chiffres d'un entier dans une base, calculés uniquement quand ils sont demandés
+    - len(chiffres) : nombre de chiffres (sans produire la chaîne)
+    - chiffres[:64], chiffres[-10:], chiffres[5] : chiffres de poids fort/faible
+    - for chiffre in chiffres / reversed(chiffres) : chiffres un par un depuis le début/la fin
+
+    Exemple :
+    >>> chiffres = Chiffres(3**1000000, 10)
+    >>> len(chiffres)
+    477122
+    >>> chiffres[:5]
+    '17977'
+    """
+    __slots__ = ("entier", "base", "_longueur")
+
+    def __init__(self, entier, base):
+        if entier < 0:
+            raise ValueError("Nombre négatif")
+        if not 2 <= base <= len(CHIFFRES):
+            raise ValueError("Base invalide")
+        self.entier = entier
+        self.base = base
+        self._longueur = None
+
+    def __len__(self):
+        if self._longueur is None:
+            if self.entier == 0:
+                self._longueur = 1
+            elif self.base & (self.base - 1) == 0:
+                bits = self.base.bit_length() - 1
+                self._longueur = -(-self.entier.bit_length() // bits)
+            else:
+                # Estimation avec le logarithme puis correction avec les puissances en cache
+                longueur = max(int((self.entier.bit_length() - 1) * math.log(2) / math.log(self.base)), 1)
+                borne = _puissance(self.base, longueur - 1)
+                while borne > self.entier:
+                    borne //= self.base
+                    longueur -= 1
+                while borne * self.base <= self.entier:
+                    borne *= self.base
+                    longueur += 1
+                self._longueur = longueur
+        return self._longueur
+
+    def _extraire(self, debut, fin):
+        # Chiffres de debut à fin (exclu), comptés depuis le début (poids fort)
+        longueur = len(self)
+        if debut >= fin:
+            return ""
+        valeur = self.entier
+        if fin < longueur:
+            valeur //= _puissance(self.base, longueur - fin)
+        if debut > 0:
+            valeur %= _puissance(self.base, fin - debut)
+        return entier_vers_texte(valeur, self.base).rjust(fin - debut, "0")
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            debut, fin, pas = position.indices(len(self))
+            if pas == 1:
+                return self._extraire(debut, fin)
+            if pas > 0:
+                return self._extraire(debut, fin)[::pas]
+            return self._extraire(fin + 1, debut + 1)[::-1][::-pas]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("Position en dehors du nombre")
+        return self._extraire(position, position + 1)
+
+    def __iter__(self):
+        if self.entier == 0:
+            yield "0"
+        for morceau in generer_chiffres(self.entier, self.base):
+            yield from morceau
+
+    def __reversed__(self):
+        if self.entier == 0:
+            yield "0"
+        for morceau in generer_chiffres(self.entier, self.base, depuis_la_fin=True):
+            yield from morceau
+
+    def __str__(self):
+        return entier_vers_texte(self.entier, self.base)
+
+    def __repr__(self):
+        return f"Chiffres(<{len(self)} chiffres>, base={self.base})"
+
+def _motif_invalide(base, separateurs=True):
+    """
+    _motif_invalide : expression régulière qui trouve le premier caractère refusé dans une base
+    Arguments :
+    - base : entier entre 2 et 36
+    - separateurs : True pour accepter "_" entre les chiffres
+    Renvoie :
+    - motif : expression régulière compilée
+    """
+    cle = (base, separateurs)
+    motif = _cache_motifs_invalides.get(cle)
+    if motif is None:
+        chiffres = CHIFFRES[:base] + CHIFFRES[:base].lower() + ("_" if separateurs else "")
+        motif = re.compile(f"[^{re.escape(chiffres)}]")
+        _cache_motifs_invalides[cle] = motif
+    return motif
+
+# Séparateur mal placé : "_" au début, à la fin ou doublé
+_SEPARATEUR_INVALIDE = re.compile(r"_(?![0-9A-Za-z])")
+
+def _verifier_chiffres(texte, base):
+    """
+    _verifier_chiffres : vérifie un nombre sans le copier (préfixe 0b/0o/0x et séparateurs "_" acceptés)
+    Déclenche ValueError avec la position du premier caractère invalide
+    Arguments :
+    - texte : chaîne de caractères
+    - base : entier entre 2 et 36
+    Renvoie :
+    - debut : position du premier chiffre (2 si le texte a un préfixe, 0 sinon)
+    """
+    debut = 0
+    prefixe = PREFIXES.get(base)
+    if prefixe and texte[:2].lower() == prefixe:
+        debut = 2
+        if len(texte) == 2:
+            raise ValueError("Aucun chiffre après le préfixe")
+
+    invalide = _motif_invalide(base).search(texte, debut)
+    if invalide:
+        raise ValueError(f"Chiffre invalide '{invalide.group()}' à la position {invalide.start()}")
+    if texte.find("_", debut) != -1:
+        invalide = _SEPARATEUR_INVALIDE.search(texte, debut)
+        if texte[debut:debut + 1] == "_":
+            raise ValueError(f"Séparateur invalide à la position {debut}")
+        if invalide:
+            raise ValueError(f"Séparateur invalide à la position {invalide.start()}")
+    return debut
+
+def _nettoyer(texte, base):
+    """
+    _nettoyer : vérifie un nombre et enlève son préfixe et ses séparateurs (copie uniquement s'il y en a)
+    Arguments :
+    - texte : chaîne de caractères
+    - base : entier entre 2 et 36
+    Renvoie :
+    - chiffres : chaîne de caractères
+    """
+    debut = _verifier_chiffres(texte, base)
+    if debut or texte.find("_") != -1:
+        texte = texte[debut:].replace("_", "")
+    return texte
+
+def texte_vers_entier(texte, base):
+    """
+    texte_vers_entier : convertit une chaîne de chiffres dans une base entre 2 et 36 en entier
+    Arguments :
+    - texte : chaîne de caractères (majuscules ou minuscules, préfixe 0b/0o/0x et séparateurs "_" acceptés, chaîne vide -> 0)
+    - base : entier entre 2 et 36
+    Renvoie :
+    - entier : entier positif
+    """
+    # Vérifie si il s'agit d'un nombre valide en un seul passage, déclenche une exception sinon
+    debut = _verifier_chiffres(texte, base)
+    if not texte:
+        return 0
+    if base & (base - 1) == 0 or len(texte) <= 1 << SEUIL_FEUILLE_TEXTE: # Bases puissances de 2 : int() est déjà linéaire
+        return int(texte, base) # (int() accepte aussi le préfixe et les séparateurs, sans copie)
+    if debut or texte.find("_") != -1:
+        texte = texte[debut:].replace("_", "")
+
+    def convertir(debut, fin):
+        # Découpe texte[debut:fin] en deux : les 2**niveau derniers chiffres et le reste
+        longueur = fin - debut
+        if longueur <= 1 << SEUIL_FEUILLE_TEXTE:
+            return int(texte[debut:fin], base)
+        niveau = (longueur - 1).bit_length() - 1
+        milieu = fin - (1 << niveau)
+        return convertir(debut, milieu) * _puissances(base, niveau)[niveau] + convertir(milieu, fin)
+
+    return convertir(0, len(texte))
+
+## Nombre avec ses représentations en cache
+def _valeur(nombre):
+    """
+    _valeur : entier représenté par un Number ou un entier
+    Arguments :
+    - nombre : Number ou entier
+    Renvoie :
+    - valeur : entier (NotImplemented pour les autres types)
+    """
+    if isinstance(nombre, Number):
+        return nombre.valeur
+    if isinstance(nombre, int):
+        return nombre
+    return NotImplemented
+
+def _operation(fonction):
+    """
+    _operation : crée une méthode de Number qui calcule sur les entiers et renvoie un nouveau Number
+    Arguments :
+    - fonction : fonction (entier, entier) -> entier
+    Renvoie :
+    - methode : fonction (Number, Number ou entier) -> Number
+    """
+    def methode(self, autre):
+        autre = _valeur(autre)
+        if autre is NotImplemented:
+            return NotImplemented
+        return Number(fonction(self.valeur, autre))
+    return methode
+
+def _reconstruire_number(valeur, representations):
+    """
+    _reconstruire_number : recrée un Number avec ses représentations (utilisé par pickle, ex : entre processus)
+    Arguments :
+    - valeur : entier
+    - representations : dictionnaire base -> texte
+    Renvoie :
+    - nombre : Number
+    """
+    nombre = Number(valeur)
+    nombre._representations.update(representations)
+    return nombre
+
+@total_ordering
+class Number:
+    """
+    Number : nombre entier positif immuable qui calcule chaque représentation (base) au plus une fois
+    Les opérations (+, -, *, //, %, **, &, |, ^, <<, >>) se font directement sur l'entier et renvoient un Number
+
+    Exemple :
+    >>> masque = Number("FF00", 16)
+    >>> masque.en_base(2)
+    '1111111100000000'
+    >>> (masque >> 8).en_base(10)
+    '255'
+    """
+    __slots__ = ("valeur", "_representations")
+
+    def __init__(self, valeur, base=10):
+        representations = {}
+        if isinstance(valeur, Number):
+            representations = dict(valeur._representations)
+            valeur = valeur.valeur
+        elif isinstance(valeur, str):
+            texte = valeur
+            valeur = texte_vers_entier(texte, base)
+            # Garde le texte s'il est déjà sous la forme renvoyée par entier_vers_texte (sans préfixe, séparateur, zéro à gauche ni minuscule)
+            if texte and (texte[0] != "0" or texte == "0") and texte.find("_") == -1 and (base <= 10 or texte.isdigit() or texte.isupper()):
+                representations[base] = texte
+        elif not isinstance(valeur, int):
+            raise TypeError("Entier ou chaîne de caractères attendu")
+        if valeur < 0:
+            raise ValueError("Nombre négatif")
+        object.__setattr__(self, "valeur", valeur)
+        object.__setattr__(self, "_representations", representations)
+
+    def __setattr__(self, nom, valeur):
+        raise AttributeError("Number est immuable")
+
+    def __delattr__(self, nom):
+        raise AttributeError("Number est immuable")
+
+    def en_base(self, base):
+        """
+        en_base : représentation du nombre dans une base (calculée au premier appel seulement)
+        Arguments :
+        - base : entier entre 2 et 36
+        Renvoie :
+        - texte : chaîne de caractères
+        """
+        texte = self._representations.get(base)
+        if texte is None:
+            texte = entier_vers_texte(self.valeur, base)
+            self._representations[base] = texte
+        return texte
+
+    def en_cache(self, base):
+        """
+        en_cache : représentation déjà calculée dans une base
+        Arguments :
+        - base : entier entre 2 et 36
+        Renvoie :
+        - texte : chaîne de caractères (None si pas encore calculée)
+        """
+        return self._representations.get(base)
+
+    def ecrire(self, base, sortie, groupe=0, separateur=" "):
+        """
+        ecrire : écrit la représentation dans une base dans un fichier, par morceaux (voir ecrire_entier)
+        Arguments :
+        - base : entier entre 2 et 36
+        - sortie : fichier texte ouvert en écriture (méthode write)
+        - groupe : nombre de chiffres par groupe (0 pour ne pas grouper)
+        - separateur : chaîne de caractères entre deux groupes
+        Renvoie :
+        - nb_caracteres : nombre de caractères écrits
+        """
+        texte = self._representations.get(base)
+        if texte is None: # Pas gardée en cache : elle pourrait être très grande
+            return ecrire_entier(self.valeur, base, sortie, groupe, separateur)
+        texte = grouper(texte, groupe, separateur)
+        sortie.write(texte)
+        return len(texte)
+
+    def chiffres(self, base):
+        """
+        chiffres : chiffres du nombre dans une base, calculés à la demande (voir Chiffres)
+        Arguments :
+        - base : entier entre 2 et 36
+        Renvoie :
+        - chiffres : Chiffres
+        """
+        return Chiffres(self.valeur, base)
+
+    def __int__(self):
+        return self.valeur
+
+    __index__ = __int__
+
+    def __bool__(self):
+        return self.valeur != 0
+
+    def __hash__(self):
+        return hash(self.valeur)
+
+    def __eq__(self, autre):
+        autre = _valeur(autre)
+        return NotImplemented if autre is NotImplemented else self.valeur == autre
+
+    def __lt__(self, autre):
+        autre = _valeur(autre)
+        return NotImplemented if autre is NotImplemented else self.valeur < autre
+
+    def __str__(self):
+        return self.en_base(10)
+
+    def __reduce__(self):
+        # __setattr__ est bloqué : pickle doit passer par _reconstruire_number
+        return (_reconstruire_number, (self.valeur, self._representations))
+
+    def __repr__(self):
+        if self.valeur.bit_length() > 256:
+            return f"Number(<{self.valeur.bit_length()} bits>)"
+        return f"Number({self.valeur})"
+
+    __add__ = __radd__ = _operation(lambda a, b: a + b)
+    __sub__ = _operation(lambda a, b: a - b)
+    __rsub__ = _operation(lambda a, b: b - a)
+    __mul__ = __rmul__ = _operation(lambda a, b: a * b)
+    __floordiv__ = _operation(lambda a, b: a // b)
+    __rfloordiv__ = _operation(lambda a, b: b // a)
+    __mod__ = _operation(lambda a, b: a % b)
+    __rmod__ = _operation(lambda a, b: b % a)
+    __pow__ = _operation(lambda a, b: a ** b)
+    __rpow__ = _operation(lambda a, b: b ** a)
+    __and__ = __rand__ = _operation(lambda a, b: a & b)
+    __or__ = __ror__ = _operation(lambda a, b: a | b)
+    __xor__ = __rxor__ = _operation(lambda a, b: a ^ b)
+    __lshift__ = _operation(lambda a, b: a << b)
+    __rlshift__ = _operation(lambda a, b: b << a)
+    __rshift__ = _operation(lambda a, b: a >> b)
+    __rrshift__ = _operation(lambda a, b: b >> a)
+
+## Transcodage direct binaire <-> hexadécimal (1 chiffre hexadécimal = 4 bits, sans passer par un entier)
+TAILLE_MORCEAU = 1 << 16 # Nombre de chiffres lus à la fois par les transcodeurs
+BITS_PAR_BLOC = 4096 # Nombre de bits convertis à la fois en hexadécimal (petit entier)
+
+# Table de traduction : chiffre hexadécimal -> 4 chiffres binaires
+TABLE_HEXA_VERS_BIN = str.maketrans({chiffre: format(int(chiffre, 16), "04b") for chiffre in "0123456789abcdefABCDEF"})
+
+def _decouper(texte, taille=TAILLE_MORCEAU):
+    """
+    _decouper : découpe une chaîne en morceaux de taille fixe
+    Arguments :
+    - texte : chaîne de caractères
+    - taille : nombre de caractères par morceau
+    Renvoie :
+    - morceaux : générateur de chaînes de caractères
+    """
+    for debut in range(0, len(texte), taille):
+        yield texte[debut:debut + taille]
+
+def _regrouper(chiffres, base, exposant):
+    """
+    _regrouper : convertit des chiffres en base vers la base base**exposant, bloc par bloc
+    Arguments :
+    - chiffres : chaîne de caractères (longueur multiple de exposant)
+    - base : entier
+    - exposant : nombre de chiffres regroupés en un seul chiffre
+    Renvoie :
+    - regroupes : chaîne de caractères (un chiffre par groupe de exposant chiffres)
+    """
+    taille_bloc = BITS_PAR_BLOC // exposant * exposant
+    blocs = []
+    for debut in range(0, len(chiffres), taille_bloc):
+        bloc = chiffres[debut:debut + taille_bloc]
+        blocs.append(entier_vers_texte(int(bloc, base), base ** exposant).rjust(len(bloc) // exposant, "0"))
+    return ''.join(blocs)
+
+def _nettoyer_morceaux(morceaux, base):
+    """
+    _nettoyer_morceaux : comme _nettoyer, pour un nombre découpé en morceaux (préfixe 0b/0o/0x et séparateurs "_" acceptés)
+    Déclenche ValueError avec la position (dans tout le nombre) du premier caractère invalide
+    Arguments :
+    - morceaux : itérable de chaînes de caractères
+    - base : entier entre 2 et 36
+    Renvoie :
+    - chiffres : générateur de chaînes de caractères (sans préfixe ni séparateurs)
+    """
+    invalide = _motif_invalide(base)
+    morceaux = iter(morceaux)
+    # Le préfixe peut être coupé entre deux morceaux : on lit d'abord au moins 2 caractères
+    premier = ""
+    for morceau in morceaux:
+        premier += morceau
+        if len(premier) >= 2:
+            break
+    position = 0 # Position du début du morceau dans le nombre
+    prefixe = PREFIXES.get(base)
+    if prefixe and premier[:2].lower() == prefixe:
+        premier = premier[2:]
+        position = 2
+
+    vide = True # Aucun caractère après le préfixe pour l'instant
+    separateur = None # Position d'un "_" à la fin du morceau précédent (doit être suivi d'un chiffre)
+    for morceau in chain((premier,), morceaux):
+        if not morceau:
+            continue
+        caractere = invalide.search(morceau)
+        if caractere:
+            raise ValueError(f"Chiffre invalide '{caractere.group()}' à la position {position + caractere.start()}")
+        if morceau.find("_") != -1:
+            if morceau[0] == "_" and (vide or separateur is not None):
+                raise ValueError(f"Séparateur invalide à la position {position if vide else separateur}")
+            caractere = _SEPARATEUR_INVALIDE.search(morceau)
+            if caractere and caractere.start() < len(morceau) - 1: # Un "_" final dépend du morceau suivant
+                raise ValueError(f"Séparateur invalide à la position {position + caractere.start()}")
+            separateur = position + len(morceau) - 1 if morceau[-1] == "_" else None
+            chiffres = morceau.replace("_", "")
+        else:
+            separateur = None
+            chiffres = morceau
+        position += len(morceau)
+        vide = False
+        if chiffres:
+            yield chiffres
+    if separateur is not None:
+        raise ValueError(f"Séparateur invalide à la position {separateur}")
+    if vide and position:
+        raise ValueError("Aucun chiffre après le préfixe")
+
+def transcoder_hexa_vers_bin(morceaux):
+    """
+    transcoder_hexa_vers_bin : convertit des morceaux de texte hexadécimal en morceaux de texte binaire
+    Arguments :
+    - morceaux : itérable de chaînes de caractères (chiffres hexadécimaux, préfixe 0x et séparateurs "_" acceptés)
+    Renvoie :
+    - binaire : générateur de chaînes de caractères (sans zéros inutiles à gauche)
+    """
+    debut = True
+    for morceau in _nettoyer_morceaux(morceaux, 16):
+        binaire = morceau.translate(TABLE_HEXA_VERS_BIN)
+        if debut: # Enlève les zéros à gauche du nombre
+            binaire = binaire.lstrip("0")
+            if not binaire:
+                continue
+            debut = False
+        yield binaire
+    if debut: # Nombre nul ou vide
+        yield "0"
+
+def transcoder_bin_vers_hexa(morceaux, longueur):
+    """
+    transcoder_bin_vers_hexa : convertit des morceaux de texte binaire en morceaux de texte hexadécimal
+    Arguments :
+    - morceaux : itérable de chaînes de caractères (chiffres binaires, préfixe 0b et séparateurs "_" acceptés)
+    - longueur : nombre total de chiffres binaires, sans le préfixe ni les séparateurs (les groupes de 4 bits partent de la droite)
+    Renvoie :
+    - hexadecimal : générateur de chaînes de caractères (sans zéros inutiles à gauche)
+    """
+    tampon = "0" * (-longueur % 4) # Complète le premier groupe de 4 bits
+    debut = True
+    for morceau in _nettoyer_morceaux(morceaux, 2):
+        tampon += morceau
+        coupure = len(tampon) - len(tampon) % 4
+        hexadecimal = _regrouper(tampon[:coupure], 2, 4)
+        tampon = tampon[coupure:]
+        if debut: # Enlève les zéros à gauche du nombre
+            hexadecimal = hexadecimal.lstrip("0")
+            if not hexadecimal:
+                continue
+            debut = False
+        yield hexadecimal
+    if tampon:
+        raise ValueError("Longueur incorrecte")
+    if debut: # Nombre nul ou vide
+        yield "0"
+
+def _lire_chiffres(fichier, taille=TAILLE_MORCEAU):
+    """
+    _lire_chiffres : lit un fichier texte morceau par morceau en ignorant les espaces et fins de ligne
+    Arguments :
+    - fichier : fichier texte ouvert en lecture
+    - taille : nombre de caractères lus à la fois
+    Renvoie :
+    - morceaux : générateur de chaînes de caractères
+    """
+    while True:
+        morceau = fichier.read(taille)
+        if not morceau:
+            break
+        yield "".join(morceau.split())
+
+def transcoder_flux(entree, sortie, base_origine, base_destination, taille=TAILLE_MORCEAU):
+    """
+    transcoder_flux : convertit un seul nombre (binaire <-> hexadécimal) lu dans un fichier, morceau par morceau
+    La mémoire utilisée ne dépend pas de la taille du nombre
+    Arguments :
+    - entree : fichier texte ouvert en lecture (l'entrée standard est d'abord copiée dans un fichier temporaire pour le binaire)
+    - sortie : fichier texte ouvert en écriture
+    - base_origine : 2 ou 16
+    - base_destination : 16 ou 2
+    - taille : nombre de caractères lus à la fois
+    Renvoie :
+    - None
+    """
+    if (base_origine, base_destination) == (16, 2):
+        for morceau in transcoder_hexa_vers_bin(_lire_chiffres(entree, taille)):
+            sortie.write(morceau)
+    elif (base_origine, base_destination) == (2, 16):
+        # Les groupes de 4 bits partent de la droite : il faut connaître le nombre de chiffres avant de commencer
+        temporaire = None
+        if not entree.seekable():
+            import tempfile
+            temporaire = tempfile.TemporaryFile("w+", encoding="utf-8")
+            for morceau in _lire_chiffres(entree, taille):
+                temporaire.write(morceau)
+            temporaire.seek(0)
+            entree = temporaire
+        try:
+            debut = entree.tell()
+            longueur = sum(len(morceau) for morceau in _nettoyer_morceaux(_lire_chiffres(entree, taille), 2))
+            entree.seek(debut)
+            for morceau in transcoder_bin_vers_hexa(_lire_chiffres(entree, taille), longueur):
+                sortie.write(morceau)
+        finally:
+            if temporaire is not None:
+                temporaire.close()
+    else:
+        raise ValueError("Transcodage en flux possible uniquement entre binaire et hexadécimal")
+    sortie.write("\n")
+
+## Écriture par morceaux (sans construire tout le texte du résultat)
+def _morceaux_decimal(nombre, taille):
+    """
+    _morceaux_decimal : chiffres d'un decimal.Decimal entier par morceaux de taille chiffres au plus
+    (découpé avec des décalages de la virgule, linéaires en base 10)
+    Arguments :
+    - nombre : decimal.Decimal entier positif
+    - taille : nombre de chiffres maximum par morceau
+    Renvoie :
+    - morceaux : générateur de chaînes de caractères
+    """
+    import decimal
+    contexte = _contexte_exact()
+    contexte.rounding = decimal.ROUND_DOWN
+
+    def decouper(n, nb_chiffres, remplir):
+        # n < 10**nb_chiffres, remplir : compléter avec des zéros à gauche
+        if nb_chiffres <= taille:
+            texte = str(n)
+            yield texte.rjust(nb_chiffres, "0") if remplir else texte
+            return
+        nb_chiffres_bas = nb_chiffres // 2
+        haut = contexte.to_integral_value(contexte.scaleb(n, -nb_chiffres_bas))
+        bas = contexte.subtract(n, contexte.scaleb(haut, nb_chiffres_bas))
+        n = None # Libère le nombre découpé pendant l'écriture de ses morceaux
+        if haut or remplir:
+            yield from decouper(haut, nb_chiffres - nb_chiffres_bas, remplir)
+            yield from decouper(bas, nb_chiffres_bas, True)
+        else:
+            yield from decouper(bas, nb_chiffres_bas, False)
+
+    morceaux = decouper(nombre, nombre.adjusted() + 1, False)
+    del nombre # Seul decouper garde le nombre (libéré dès qu'il est découpé)
+    yield from morceaux
+
+def _morceaux_entier(entier, base, taille):
+    """
+    _morceaux_entier : nombre de chiffres d'un entier et générateur de ses chiffres par morceaux
+    Arguments :
+    - entier : entier positif
+    - base : entier entre 2 et 36
+    - taille : nombre de chiffres maximum par morceau (arrondi à une puissance de 2 inférieure)
+    Renvoie :
+    - (nb_chiffres, morceaux) : tuple (entier, générateur de chaînes de caractères)
+    """
+    if entier < 0:
+        raise ValueError("Nombre négatif")
+    if not 2 <= base <= len(CHIFFRES):
+        raise ValueError("Base invalide")
+    if base == 10 and entier.bit_length() > BITS_FEUILLE_DECIMAL:
+        nombre = _entier_vers_objet_decimal(entier)
+        return nombre.adjusted() + 1, _morceaux_decimal(nombre, taille)
+    nb_chiffres = len(Chiffres(entier, base))
+    if nb_chiffres <= taille or entier.bit_length() <= BITS_FEUILLE_DECIMAL:
+        return nb_chiffres, iter([entier_vers_texte(entier, base)])
+    return nb_chiffres, generer_chiffres(entier, base, niveau_feuille=max(taille.bit_length() - 1, SEUIL_FEUILLE))
+
+def grouper(texte, groupe, separateur=" "):
+    """
+    grouper : sépare les chiffres par groupes en partant de la droite (ex : milliers, quartets)
+    Arguments :
+    - texte : chaîne de caractères
+    - groupe : nombre de chiffres par groupe (0 pour ne rien changer)
+    - separateur : chaîne de caractères entre deux groupes
+    Renvoie :
+    - texte : chaîne de caractères
+
+    Exemple :
+    >>> grouper("1234567", 3)
+    '1 234 567'
+    """
+    if groupe <= 0 or len(texte) <= groupe:
+        return texte
+    debut = len(texte) % groupe or groupe
+    return separateur.join([texte[:debut]] + [texte[position:position + groupe] for position in range(debut, len(texte), groupe)])
+
+def ecrire_entier(entier, base, sortie, groupe=0, separateur=" ", taille=TAILLE_MORCEAU):
+    """
+    ecrire_entier : écrit les chiffres d'un entier dans un fichier (ou io.StringIO) par morceaux,
+    sans garder tout le texte en mémoire
+    Arguments :
+    - entier : entier positif
+    - base : entier entre 2 et 36
+    - sortie : fichier texte ouvert en écriture (méthode write)
+    - groupe : nombre de chiffres par groupe, en partant de la droite (0 pour ne pas grouper)
+    - separateur : chaîne de caractères entre deux groupes
+    - taille : nombre de chiffres (environ) par écriture
+    Renvoie :
+    - nb_caracteres : nombre de caractères écrits
+
+    Exemple :
+    >>> sortie = io.StringIO()
+    >>> ecrire_entier(0xDEADBEEF, 2, sortie, groupe=4)
+    39
+    >>> sortie.getvalue()[:14]
+    '1101 1110 1010'
+    """
+    nb_chiffres, morceaux = _morceaux_entier(entier, base, taille)
+    nb_caracteres = 0
+    ecrits = 0 # Nombre de chiffres déjà traités
+    paquet = [] # Morceaux en attente d'écriture
+    taille_paquet = 0
+    for morceau in morceaux:
+        if groupe > 0:
+            # Chiffres avant le prochain séparateur (les groupes sont alignés sur la fin du nombre)
+            debut = (nb_chiffres - ecrits) % groupe
+            parties = [morceau[:debut]] if debut else []
+            parties += [morceau[position:position + groupe] for position in range(debut, len(morceau), groupe)]
+            texte = separateur.join(parties)
+            if ecrits and not debut: # Le morceau commence un nouveau groupe
+                texte = separateur + texte
+        else:
+            texte = morceau
+        ecrits += len(morceau)
+        paquet.append(texte)
+        taille_paquet += len(texte)
+        if taille_paquet >= taille:
+            sortie.write(''.join(paquet))
+            nb_caracteres += taille_paquet
+            paquet.clear()
+            taille_paquet = 0
+    if paquet:
+        sortie.write(''.join(paquet))
+        nb_caracteres += taille_paquet
+    return nb_caracteres
+
+## Cache des conversions (optionnel, désactivé par défaut)
+PART_MAX_ENTREE = 8 # Une entrée ne peut pas occuper plus de 1/8 du cache
+
+class CacheLRU:
+    """
+    CacheLRU : cache des conversions les plus récentes, limité en octets (les moins récentes sont supprimées en premier)
+    Une conversion trop grande (plus de 1/PART_MAX_ENTREE de la taille du cache) n'est pas gardée
+    """
+    __slots__ = ("taille_max", "octets", "succes", "echecs", "evictions", "_entrees", "_verrou")
+
+    def __init__(self, taille_max):
+        self.taille_max = taille_max
+        self.octets = 0
+        self.succes = 0
+        self.echecs = 0
+        self.evictions = 0
+        self._entrees = OrderedDict() # clé -> (résultat, taille en octets)
+        self._verrou = threading.Lock()
+
+    def chercher(self, cle):
+        """
+        chercher : résultat en cache pour une clé
+        Arguments :
+        - cle : tuple (valeur, base_origine, base_destination)
+        Renvoie :
+        - (trouve, resultat) : tuple (booléen, résultat ou None)
+        """
+        with self._verrou:
+            entree = self._entrees.get(cle)
+            if entree is None:
+                self.echecs += 1
+                return False, None
+            self._entrees.move_to_end(cle)
+            self.succes += 1
+            return True, entree[0]
+
+    def ajouter(self, cle, resultat):
+        """
+        ajouter : garde un résultat en cache et supprime les plus anciens si la taille maximum est dépassée
+        Arguments :
+        - cle : tuple (valeur, base_origine, base_destination)
+        - resultat : chaîne de caractères ou entier
+        Renvoie :
+        - None
+        """
+        taille = getsizeof(cle[0]) + getsizeof(resultat)
+        if taille > self.taille_max // PART_MAX_ENTREE:
+            return
+        with self._verrou:
+            if cle in self._entrees:
+                return
+            self._entrees[cle] = (resultat, taille)
+            self.octets += taille
+            while self.octets > self.taille_max:
+                _, (_, taille_supprimee) = self._entrees.popitem(last=False)
+                self.octets -= taille_supprimee
+                self.evictions += 1
+
+    def statistiques(self):
+        """
+        statistiques : compteurs du cache
+        Renvoie :
+        - statistiques : dictionnaire
+        """
+        with self._verrou:
+            total = self.succes + self.echecs
+            return {"succes": self.succes, "echecs": self.echecs, "evictions": self.evictions,
+                    "taux_succes": self.succes / total if total else 0.0,
+                    "entrees": len(self._entrees), "octets": self.octets, "taille_max": self.taille_max}
+
+_cache_conversions = None
+
+def activer_cache(taille_max=64 << 20):
+    """
+    activer_cache : active le cache des conversions (vide)
+    Arguments :
+    - taille_max : taille maximum du cache en octets (64 Mo par défaut)
+    Renvoie :
+    - cache : CacheLRU
+    """
+    global _cache_conversions
+    _cache_conversions = CacheLRU(taille_max)
+    return _cache_conversions
+
+def desactiver_cache():
+    """
+    desactiver_cache : désactive et vide le cache des conversions
+    """
+    global _cache_conversions
+    _cache_conversions = None
+
+def statistiques_cache():
+    """
+    statistiques_cache : compteurs du cache des conversions
+    Renvoie :
+    - statistiques : dictionnaire (None si le cache n'est pas activé)
+    """
+    return None if _cache_conversions is None else _cache_conversions.statistiques()
+
+def _avec_cache(base_origine, base_destination):
+    """
+    _avec_cache : décorateur qui passe par le cache (s'il est activé) pour une fonction de conversion à un argument
+    Arguments :
+    - base_origine : base de l'argument
+    - base_destination : base du résultat (None si le résultat est un entier)
+    Renvoie :
+    - decorateur : fonction
+    """
+    def decorateur(fonction):
+        @wraps(fonction)
+        def fonction_avec_cache(valeur):
+            cache = _cache_conversions
+            if cache is None:
+                return fonction(valeur)
+            cle = (valeur, base_origine, base_destination)
+            trouve, resultat = cache.chercher(cle)
+            if not trouve:
+                resultat = fonction(valeur)
+                cache.ajouter(cle, resultat)
+            return resultat
+        return fonction_avec_cache
+    return decorateur
+
 ## Décimal -> Binaire
+@_avec_cache(10, 2)
 def dec_to_bin(decimal):
     """
     dec_to_bin : convertit décimal en binaire
@@ -11,19 +1058,10 @@ def dec_to_bin(decimal):
     - binaire : chaîne de caractères
     """
 
-    chiffres_bin = []
-    while True:
-        quotient = decimal // 2
-        reste = decimal % 2
-        chiffres_bin.insert(0, str(reste)) # str(reste) pour que ''.join fonctionne
-
-        if quotient == 0:
-            break
-
-        decimal = quotient
-    return ''.join(chiffres_bin)
+    return entier_vers_texte(decimal, 2)
 
 ## Décimal -> Hexadécimal
+@_avec_cache(10, 16)
 def dec_to_hexa(decimal):
     """
     dec_to_hexa : convertit décimal en hexadécimal
@@ -33,39 +1071,10 @@ def dec_to_hexa(decimal):
     - hexadecimal : chaîne de caractères
     """
 
-    dict_chiffres_dec_hexa = {
-        "0" : "0",
-        "1" : "1",
-        "2" : "2",
-        "3" : "3",
-        "4" : "4",
-        "5" : "5",
-        "6" : "6",
-        "7" : "7",
-        "8" : "8",
-        "9" : "9",
-        "10" : "A",
-        "11" : "B",
-        "12" : "C",
-        "13" : "D",
-        "14" : "E",
-        "15" : "F"
-    }
-
-    chiffres_hexa = []
-
-    while True:
-        quotient = decimal // 16
-        reste = decimal % 16
-        chiffres_hexa.insert(0, dict_chiffres_dec_hexa[str(reste)])
-
-        if quotient == 0:
-            break
-
-        decimal = quotient
-    return ''.join(chiffres_hexa)
+    return entier_vers_texte(decimal, 16)
 
 ## Binaire -> Décimal
+@_avec_cache(2, None)
 def bin_to_dec(binaire):
     """
     bin_to_dec : convertit binaire en décimal
@@ -75,20 +1084,10 @@ def bin_to_dec(binaire):
     - Entier
     """
 
-    # Vérifie si il s'agit d'un nombre binaire valide, déclenche une exception sinon
-    chiffres_invalides = ["2", "3", "4", "5", "6", "7", "8", "9"]
-    for chiffre in chiffres_invalides:
-        if chiffre in binaire:
-            raise ValueError("Chiffres invalides")
-
-    binaire = binaire[::-1] # Corrige l'ordre
-    decimal = 0
-    for i in range(len(binaire)):
-        decimal += int(binaire[i])*2**i
-
-    return decimal
+    return texte_vers_entier(binaire, 2)
 
 ## Binaire -> Hexadécimal
+@_avec_cache(2, 16)
 def bin_to_hexa(binaire):
     """
     bin_to_hexa : convertit binaire en hexadécimal
@@ -98,11 +1097,11 @@ def bin_to_hexa(binaire):
     - hexadecimal : chaîne de caractères
     """
 
-    decimal = bin_to_dec(binaire)
-    hexadecimal = dec_to_hexa(decimal)
-    return hexadecimal
+    binaire = _nettoyer(binaire, 2)
+    return ''.join(transcoder_bin_vers_hexa(_decouper(binaire), len(binaire)))
 
 ## Hexadécimal -> Décimal
+@_avec_cache(16, None)
 def hexa_to_dec(hexadecimal):
     """
     hexa_to_dec : convertit hexadécimal en décimal
@@ -111,32 +1110,11 @@ def hexa_to_dec(hexadecimal):
     Renvoie :
     - decimal : entier
     """
-    chiffres_hexa = {
-        "0": 0,
-        "1": 1,
-        "2": 2,
-        "3": 3,
-        "4": 4,
-        "5": 5,
-        "6": 6,
-        "7": 7,
-        "8": 8,
-        "9": 9,
-        "A": 10,
-        "B": 11,
-        "C": 12,
-        "D": 13,
-        "E": 14,
-        "F": 15
-    }
-    hexadecimal = hexadecimal[::-1].upper() # Corrige l'ordre et permet d'ignorer la casse
-    decimal = 0
-    for i in range(len(hexadecimal)):
-        decimal += chiffres_hexa[hexadecimal[i]]*16**i
-
-    return decimal
+
+    return texte_vers_entier(hexadecimal, 16)
 
 ## Hexadécimal -> Binaire
+@_avec_cache(16, 2)
 def hexa_to_bin(hexadecimal):
     """
     hexa_to_bin : convertit hexadécimal en binaire
@@ -145,6 +1123,970 @@ def hexa_to_bin(hexadecimal):
     Renvoie :
     - binaire : chaîne de caractères
     """
-    decimal = hexa_to_dec(hexadecimal)
-    binaire = dec_to_bin(decimal)
-    return binaire
+
+    hexadecimal = _nettoyer(hexadecimal, 16)
+    return ''.join(transcoder_hexa_vers_bin(_decouper(hexadecimal)))
+
+## Conversion quelconque (bases 2 à 36 et alphabets personnalisés)
+# Plans mis en cache : (base_origine, base_destination) -> dictionnaire
+_cache_plans = {}
+
+def _alphabet(base):
+    """
+    _alphabet : chiffres d'une base donnée par un entier ou par un alphabet personnalisé
+    Arguments :
+    - base : entier entre 2 et 36 ou chaîne de caractères (chiffres dans l'ordre)
+    Renvoie :
+    - alphabet : chaîne de caractères
+    """
+    if isinstance(base, int):
+        if not 2 <= base <= len(CHIFFRES):
+            raise ValueError("Base invalide")
+        return CHIFFRES[:base]
+    if not 2 <= len(base) <= len(CHIFFRES) or len(set(base)) != len(base):
+        raise ValueError("Alphabet invalide")
+    return base
+
+def _exposant(petite_base, grande_base):
+    """
+    _exposant : k tel que petite_base**k == grande_base
+    Arguments :
+    - petite_base : entier
+    - grande_base : entier
+    Renvoie :
+    - k : entier (None si grande_base n'est pas une puissance de petite_base)
+    """
+    puissance = petite_base
+    exposant = 1
+    while puissance < grande_base:
+        puissance *= petite_base
+        exposant += 1
+    return exposant if puissance == grande_base else None
+
+def plan_conversion(base_origine, base_destination):
+    """
+    plan_conversion : prépare (une seule fois par couple de bases) les tables de conversion
+    Arguments :
+    - base_origine : entier entre 2 et 36 ou alphabet
+    - base_destination : entier entre 2 et 36 ou alphabet
+    Renvoie :
+    - plan : dictionnaire (ne pas modifier)
+    """
+    cle = (base_origine, base_destination)
+    plan = _cache_plans.get(cle)
+    if plan is not None:
+        return plan
+
+    alphabet_origine = _alphabet(base_origine)
+    alphabet_destination = _alphabet(base_destination)
+    n = len(alphabet_origine)
+    m = len(alphabet_destination)
+    plan = {"base_origine": n, "base_destination": m,
+            "valides": None, "entree": None, "sortie": None,
+            "route": "entier", "exposant": None, "table": None}
+
+    # Alphabets personnalisés : traduits vers les chiffres standards (et inversement)
+    if isinstance(base_origine, str):
+        plan["valides"] = frozenset(alphabet_origine)
+        plan["entree"] = str.maketrans(alphabet_origine, CHIFFRES[:n])
+    if isinstance(base_destination, str):
+        plan["sortie"] = str.maketrans(CHIFFRES[:m], alphabet_destination)
+
+    # Route directe si une base est une puissance de l'autre (1 chiffre = exposant chiffres)
+    if m < n and _exposant(m, n):
+        exposant = _exposant(m, n)
+        plan["route"] = "descendre"
+        plan["exposant"] = exposant
+        plan["table"] = str.maketrans({chiffre: entier_vers_texte(int(chiffre, n), m).rjust(exposant, "0")
+                                       for chiffre in CHIFFRES[:n] + CHIFFRES[:n].lower()})
+    elif n < m and _exposant(n, m):
+        plan["route"] = "monter"
+        plan["exposant"] = _exposant(n, m)
+    else:
+        _puissances(n, 0) # Prépare la table des puissances des deux bases
+        _puissances(m, 0)
+
+    _cache_plans[cle] = plan
+    return plan
+
+def convert(nombre, base_origine, base_destination):
+    """
+    convert : convertit un nombre d'une base quelconque vers une autre
+    Arguments :
+    - nombre : chaîne de caractères (chiffres dans base_origine, vide ou seulement des espaces : ValueError) ou entier positif
+    - base_origine : entier entre 2 et 36 ou alphabet (ex : "01", "0123456789abcdef")
+    - base_destination : entier entre 2 et 36 ou alphabet
+    Renvoie :
+    - converti : chaîne de caractères
+    """
+    cache = _cache_conversions
+    if cache is not None:
+        cle = (nombre, base_origine, base_destination)
+        trouve, converti = cache.chercher(cle)
+        if trouve:
+            return converti
+        converti = _convert(nombre, base_origine, base_destination)
+        cache.ajouter(cle, converti)
+        return converti
+    return _convert(nombre, base_origine, base_destination)
+
+def _convert(nombre, base_origine, base_destination):
+    """
+    _convert : convertit un nombre sans passer par le cache (voir convert)
+    """
+    plan = plan_conversion(base_origine, base_destination)
+    n = plan["base_origine"]
+    m = plan["base_destination"]
+
+    if isinstance(nombre, int):
+        converti = entier_vers_texte(nombre, m)
+    else:
+        if not nombre or nombre.isspace(): # Comme les lignes vides de convert_flux (texte_vers_entier renverrait 0)
+            raise ValueError("Nombre vide")
+        if plan["valides"] is not None: # Alphabet personnalisé : vérifie puis traduit en chiffres standards
+            if not plan["valides"].issuperset(nombre):
+                raise ValueError("Chiffres invalides")
+            nombre = nombre.translate(plan["entree"])
+        elif plan["route"] != "entier": # (texte_vers_entier vérifie déjà)
+            nombre = _nettoyer(nombre, n)
+
+        if plan["route"] == "descendre":
+            converti = nombre.translate(plan["table"]).lstrip("0") or "0"
+        elif plan["route"] == "monter":
+            exposant = plan["exposant"]
+            nombre = nombre.rjust(len(nombre) + (-len(nombre) % exposant), "0")
+            converti = _regrouper(nombre, n, exposant).lstrip("0") or "0"
+        else:
+            converti = entier_vers_texte(texte_vers_entier(nombre, n), m)
+
+    if plan["sortie"] is not None:
+        converti = converti.translate(plan["sortie"])
+    return converti
+
+## Conversion en flux (une valeur par ligne)
+LIGNES_PAR_ECRITURE = 4096 # Nombre de lignes converties écrites en une seule fois
+SEUIL_ECRITURE_DIRECTE = TAILLE_MORCEAU # Nombre de chiffres à partir duquel le résultat est écrit par morceaux
+
+CARACTERE_REMPLACEMENT = "\ufffd" # Remplace les octets non UTF-8 (lecture avec errors="replace")
+
+def _verifier_ligne(nombre):
+    """
+    _verifier_ligne : refuse une ligne vide ou qui contenait des octets non UTF-8
+    Arguments :
+    - nombre : chaîne de caractères (ligne sans les espaces autour)
+    Renvoie :
+    - None
+    """
+    if not nombre:
+        raise ValueError("Nombre vide")
+    position = nombre.find(CARACTERE_REMPLACEMENT)
+    if position != -1:
+        raise ValueError(f"Octet non UTF-8 à la position {position}")
+
+def convert_flux(entree, sortie, base_origine, base_destination, erreurs=None, nom_entree="-", groupe=0, separateur=" ", ecriture_directe=True):
+    """
+    convert_flux : convertit chaque ligne d'un fichier texte et écrit les résultats au fur et à mesure
+    Arguments :
+    - entree : fichier texte ouvert en lecture (ou itérable de lignes)
+    - sortie : fichier texte ouvert en écriture
+    - base_origine : entier entre 2 et 36 ou alphabet
+    - base_destination : entier entre 2 et 36 ou alphabet
+    - erreurs : fichier texte pour signaler les lignes invalides (None pour ne rien signaler)
+    - nom_entree : nom du fichier affiché dans les messages d'erreur
+    - groupe : nombre de chiffres par groupe dans les résultats (0 pour ne pas grouper)
+    - separateur : chaîne de caractères entre deux groupes
+    - ecriture_directe : écrire les très grands résultats par morceaux (bases 2 à 36 seulement) au lieu de construire leur texte
+    Renvoie :
+    - (nb_converties, nb_invalides) : tuple d'entiers
+    (une entrée ouverte avec errors="replace" signale ses octets non UTF-8 comme des lignes invalides)
+    """
+    plan_conversion(base_origine, base_destination) # Vérifie les bases avant de lire l'entrée
+    nb_converties = 0
+    nb_invalides = 0
+    resultats = []
+    for numero_ligne, ligne in enumerate(entree, 1):
+        nombre = ligne.strip()
+        try:
+            _verifier_ligne(nombre)
+            if ecriture_directe and len(nombre) > SEUIL_ECRITURE_DIRECTE and isinstance(base_origine, int) and isinstance(base_destination, int):
+                entier = texte_vers_entier(nombre, base_origine)
+                # Écrit d'abord les résultats précédents pour garder l'ordre des lignes
+                resultats.append("")
+                sortie.write("\n".join(resultats))
+                resultats.clear()
+                ecrire_entier(entier, base_destination, sortie, groupe, separateur)
+                sortie.write("\n")
+            else:
+                resultats.append(grouper(convert(nombre, base_origine, base_destination), groupe, separateur))
+            nb_converties += 1
+        except ValueError as erreur:
+            nb_invalides += 1
+            if erreurs is not None:
+                erreurs.write(f"{nom_entree}:{numero_ligne}: {erreur}\n")
+
+        # Écrit les résultats par paquets pour limiter le nombre d'écritures (et la mémoire utilisée)
+        if len(resultats) >= LIGNES_PAR_ECRITURE:
+            resultats.append("")
+            sortie.write("\n".join(resultats))
+            resultats.clear()
+
+    if resultats:
+        resultats.append("")
+        sortie.write("\n".join(resultats))
+    return nb_converties, nb_invalides
+
+## Conversion en parallèle d'un fichier (morceaux découpés sur des fins de ligne)
+TAILLE_MORCEAU_FICHIER = 8 << 20 # Nombre d'octets (environ) convertis par tâche
+
+def _decouper_fichier(chemin, taille_morceau):
+    """
+    _decouper_fichier : découpe un fichier en intervalles d'octets qui commencent et finissent sur une fin de ligne
+    Arguments :
+    - chemin : chemin d'accès au fichier
+    - taille_morceau : taille approximative d'un intervalle (en octets)
+    Renvoie :
+    - intervalles : liste de tuples (debut, fin)
+    """
+    taille = os.path.getsize(chemin)
+    limites = [0]
+    with open(chemin, "rb") as fichier:
+        position = taille_morceau
+        while position < taille:
+            fichier.seek(position)
+            fichier.readline() # Avance jusqu'au début de la ligne suivante
+            limite = fichier.tell()
+            if limite >= taille:
+                break
+            limites.append(limite)
+            position = limite + taille_morceau
+    limites.append(taille)
+    return list(zip(limites, limites[1:]))
+
+def _convertir_morceau(tache):
+    """
+    _convertir_morceau : convertit les lignes d'un intervalle d'octets (exécuté par un processus du pool)
+    Arguments :
+    - tache : tuple (chemin, debut, fin, base_origine, base_destination, groupe, separateur)
+    Renvoie :
+    - (texte, nb_lignes, erreurs) : texte converti, nombre de lignes lues et liste de tuples (numéro de ligne dans le morceau, message)
+    """
+    chemin, debut, fin, base_origine, base_destination, groupe, separateur = tache
+    with open(chemin, "rb") as fichier:
+        fichier.seek(debut)
+        lignes = fichier.read(fin - debut).decode("utf-8", "replace").split("\n")
+    if lignes[-1] == "": # Dernière fin de ligne du morceau
+        lignes.pop()
+
+    resultats = []
+    erreurs = []
+    for numero_ligne, ligne in enumerate(lignes, 1):
+        nombre = ligne.strip()
+        try:
+            _verifier_ligne(nombre)
+            resultats.append(grouper(convert(nombre, base_origine, base_destination), groupe, separateur))
+        except ValueError as erreur:
+            erreurs.append((numero_ligne, str(erreur)))
+    resultats.append("")
+    return "\n".join(resultats) if len(resultats) > 1 else "", len(lignes), erreurs
+
+def convert_fichier_parallele(chemin, sortie, base_origine, base_destination, nb_processus=None, erreurs=None, taille_morceau=TAILLE_MORCEAU_FICHIER, groupe=0, separateur=" "):
+    """
+    convert_fichier_parallele : convertit chaque ligne d'un fichier avec plusieurs processus, dans l'ordre d'origine
+    Arguments :
+    - chemin : chemin d'accès au fichier
+    - sortie : fichier texte ouvert en écriture
+    - base_origine : entier entre 2 et 36 ou alphabet
+    - base_destination : entier entre 2 et 36 ou alphabet
+    - nb_processus : nombre de processus (None pour le nombre de coeurs)
+    - erreurs : fichier texte pour signaler les lignes invalides (None pour ne rien signaler)
+    - taille_morceau : taille approximative (en octets) d'un morceau converti par un processus
+    - groupe : nombre de chiffres par groupe dans les résultats (0 pour ne pas grouper)
+    - separateur : chaîne de caractères entre deux groupes
+    Renvoie :
+    - (nb_converties, nb_invalides) : tuple d'entiers
+    """
+    plan_conversion(base_origine, base_destination) # Vérifie les bases avant de lancer les processus
+    taches = [(chemin, debut, fin, base_origine, base_destination, groupe, separateur) for debut, fin in _decouper_fichier(chemin, taille_morceau)]
+    nb_converties = 0
+    nb_invalides = 0
+    lignes_precedentes = 0 # Pour numéroter les lignes invalides dans tout le fichier
+
+    from multiprocessing import Pool
+    with Pool(nb_processus or os.cpu_count()) as pool:
+        # imap renvoie les résultats dans l'ordre des tâches
+        for texte, nb_lignes, erreurs_morceau in pool.imap(_convertir_morceau, taches):
+            sortie.write(texte)
+            nb_converties += nb_lignes - len(erreurs_morceau)
+            nb_invalides += len(erreurs_morceau)
+            if erreurs is not None:
+                for numero_ligne, message in erreurs_morceau:
+                    erreurs.write(f"{chemin}:{lignes_precedentes + numero_ligne}: {message}\n")
+            lignes_precedentes += nb_lignes
+    return nb_converties, nb_invalides
+
+## Conversion en arrière-plan (dans un autre processus, annulable)
+def _convertir_en_arriere_plan(connexion, texte, base_origine, base_destination):
+    """
+    _convertir_en_arriere_plan : fonction exécutée par le processus de ConversionArrierePlan
+    Arguments :
+    - connexion : extrémité d'un Pipe pour envoyer le résultat
+    - texte : chaîne de caractères
+    - base_origine : entier entre 2 et 36
+    - base_destination : entier entre 2 et 36
+    Renvoie :
+    - None (envoie (True, Number) ou (False, message d'erreur))
+    """
+    try:
+        nombre = Number(texte, base_origine)
+        nombre.en_base(base_destination) # Calculé ici pour être envoyé avec le nombre
+        connexion.send((True, nombre))
+    except ValueError as erreur:
+        connexion.send((False, str(erreur)))
+    finally:
+        connexion.close()
+
+class ConversionArrierePlan:
+    """
+    ConversionArrierePlan : convertit un nombre dans un autre processus pour ne pas bloquer l'appelant
+    (ex : l'interface graphique), et peut être annulée à tout moment
+
+    Exemple :
+    >>> conversion = ConversionArrierePlan("1" * 200000, 10, 16)
+    >>> while conversion.resultat() is None: ...  # ou vérifier régulièrement avec after() dans Tkinter
+    >>> reussi, nombre = conversion.resultat()
+    >>> nombre.en_base(16)[:8]
+    '575E8249'
+    """
+    __slots__ = ("_connexion", "_processus", "_resultat")
+
+    def __init__(self, texte, base_origine, base_destination):
+        from multiprocessing import Pipe, Process
+        self._connexion, connexion_processus = Pipe(duplex=False)
+        self._processus = Process(target=_convertir_en_arriere_plan, args=(connexion_processus, texte, base_origine, base_destination), daemon=True)
+        self._processus.start()
+        connexion_processus.close() # Seul le processus écrit dans le Pipe
+        self._resultat = None
+
+    def resultat(self):
+        """
+        resultat : résultat de la conversion, sans attendre
+        Renvoie :
+        - resultat : None si la conversion n'est pas finie, (True, Number) si elle a réussi, (False, message) sinon
+        """
+        if self._resultat is None and self._processus is not None:
+            try:
+                if not self._connexion.poll():
+                    return None
+                self._resultat = self._connexion.recv()
+            except EOFError: # Processus arrêté sans résultat
+                self._resultat = (False, "Conversion interrompue")
+            self._terminer()
+        return self._resultat
+
+    def annuler(self):
+        """
+        annuler : arrête la conversion si elle n'est pas finie (resultat() renverra toujours None)
+        Renvoie :
+        - None
+        """
+        if self._processus is not None and self._resultat is None:
+            self._processus.terminate()
+            self._terminer()
+
+    def _terminer(self):
+        self._processus.join()
+        self._processus.close()
+        self._processus = None
+        self._connexion.close()
+
+## Dump d'un fichier binaire en hexadécimal ou en binaire (comme xxd)
+# Nombre d'octets par ligne et par groupe selon la base du dump
+FORMATS_DUMP = {16: (16, 2), 2: (6, 1)}
+TABLE_ASCII = bytes(octet if 32 <= octet < 127 else ord(".") for octet in range(256)) # Caractères non affichables -> "."
+OCTETS_BIN = [format(octet, "08b") for octet in range(256)]
+
+def _ligne_dump(octets, base, groupe):
+    """
+    _ligne_dump : chiffres d'une ligne de dump, séparés par groupes d'octets
+    Arguments :
+    - octets : memoryview
+    - base : 16 ou 2
+    - groupe : nombre d'octets par groupe
+    Renvoie :
+    - chiffres : chaîne de caractères
+    """
+    if base == 16:
+        return octets.hex(" ", -groupe) # Groupes comptés depuis la gauche
+    return " ".join([OCTETS_BIN[octet] for octet in octets])
+
+def dump_fichier(chemin, sortie, base=16):
+    """
+    dump_fichier : écrit le contenu d'un fichier en hexadécimal ou en binaire avec les positions (format de xxd)
+    Le fichier est projeté en mémoire (mmap) et parcouru sans copie : sa taille peut dépasser la mémoire vive
+    Arguments :
+    - chemin : chemin d'accès au fichier
+    - sortie : fichier texte ouvert en écriture
+    - base : 16 (hexadécimal) ou 2 (binaire)
+    Renvoie :
+    - None
+    """
+    if base not in FORMATS_DUMP:
+        raise ValueError("Base invalide")
+    octets_par_ligne, groupe = FORMATS_DUMP[base]
+    largeur = len(_ligne_dump(memoryview(bytes(octets_par_ligne)), base, groupe)) # Largeur d'une ligne complète
+
+    import mmap
+    with open(chemin, "rb") as fichier:
+        if os.fstat(fichier.fileno()).st_size == 0: # mmap refuse les fichiers vides
+            return
+        with mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ) as carte:
+            vue = memoryview(carte)
+            try:
+                lignes = []
+                for position in range(0, len(vue), octets_par_ligne):
+                    octets = vue[position:position + octets_par_ligne]
+                    texte = octets.tobytes().translate(TABLE_ASCII).decode("ascii")
+                    lignes.append(f"{position:08x}: {_ligne_dump(octets, base, groupe):<{largeur}}  {texte}\n")
+                    octets.release()
+                    if len(lignes) >= LIGNES_PAR_ECRITURE:
+                        sortie.write("".join(lignes))
+                        lignes.clear()
+                sortie.write("".join(lignes))
+            finally:
+                vue.release() # Obligatoire avant de fermer le mmap
+
+def restaurer_dump(entree, sortie, base=16):
+    """
+    restaurer_dump : reconstruit les octets d'un fichier à partir de son dump (inverse de dump_fichier)
+    Arguments :
+    - entree : fichier texte ouvert en lecture (ou itérable de lignes)
+    - sortie : fichier binaire ouvert en écriture
+    - base : 16 (hexadécimal) ou 2 (binaire)
+    Renvoie :
+    - nb_octets : nombre d'octets écrits
+    """
+    if base not in FORMATS_DUMP:
+        raise ValueError("Base invalide")
+    position_sortie = 0
+    for numero_ligne, ligne in enumerate(entree, 1):
+        ligne = ligne.rstrip("\r\n")
+        if not ligne.strip():
+            continue
+        try:
+            position, _, reste = ligne.partition(": ")
+            position = int(position, 16)
+            chiffres = reste.split("  ", 1)[0].replace(" ", "") # Colonne ASCII ignorée
+            if base == 16:
+                octets = bytes.fromhex(chiffres)
+            else:
+                if len(chiffres) % 8 or _motif_invalide(2, separateurs=False).search(chiffres):
+                    raise ValueError
+                octets = int(chiffres, 2).to_bytes(len(chiffres) // 8, "big") if chiffres else b""
+        except ValueError:
+            raise ValueError(f"Ligne {numero_ligne} invalide")
+
+        if position < position_sortie:
+            raise ValueError(f"Ligne {numero_ligne} : position déjà écrite")
+        if position > position_sortie: # Trou dans le dump : complété par des zéros
+            sortie.write(bytes(position - position_sortie))
+        sortie.write(octets)
+        position_sortie = position + len(octets)
+    return position_sortie
+
+## Conversion par lots (tableaux NumPy d'entiers de 64 bits au plus)
+def _verifier_numpy():
+    """
+    _verifier_numpy : importe NumPy au premier appel, déclenche une exception s'il n'est pas installé
+    """
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("NumPy est nécessaire pour les conversions par lots") from None
+        np = numpy
+
+def convert_batch(tableau, base_destination, largeur=0):
+    """
+    convert_batch : convertit un tableau d'entiers positifs en chaînes de chiffres
+    Arguments :
+    - tableau : tableau NumPy d'entiers (ou liste)
+    - base_destination : entier entre 2 et 36 ou alphabet
+    - largeur : nombre de chiffres minimum de chaque nombre (complété par des zéros), 0 pour aucun
+      (un nombre plus long garde tous ses chiffres, comme str.rjust)
+    Renvoie :
+    - textes : tableau NumPy de chaînes de caractères (même forme que tableau)
+    """
+    _verifier_numpy()
+    alphabet = _alphabet(base_destination)
+    base = len(alphabet)
+    tableau = np.asarray(tableau)
+    if tableau.dtype.kind not in "iu":
+        raise ValueError("Tableau d'entiers attendu")
+    if tableau.dtype.kind == "i" and tableau.size and tableau.min() < 0:
+        raise ValueError("Nombre négatif")
+    valeurs = tableau.astype(np.uint64).ravel()
+
+    # Nombre de colonnes de chiffres nécessaires pour le plus grand nombre
+    maximum = int(valeurs.max()) if valeurs.size else 0
+    nb_chiffres = len(entier_vers_texte(maximum, base))
+
+    # Extraction de tous les chiffres en même temps (de droite à gauche)
+    chiffres = np.empty((valeurs.size, nb_chiffres), dtype=np.uint8)
+    if base & (base - 1) == 0: # Base puissance de 2 : décalages et masques
+        bits = base.bit_length() - 1
+        masque = np.uint64(base - 1)
+        for position in range(nb_chiffres - 1, -1, -1):
+            chiffres[:, position] = valeurs & masque
+            valeurs = valeurs >> np.uint64(bits)
+    else:
+        diviseur = np.uint64(base)
+        for position in range(nb_chiffres - 1, -1, -1):
+            valeurs, restes = np.divmod(valeurs, diviseur)
+            chiffres[:, position] = restes
+
+    # Chiffre -> caractère avec une table, puis une chaîne par ligne
+    table = np.frombuffer(alphabet.encode("ascii"), dtype=np.uint8)
+    textes = table[chiffres].view(f"S{nb_chiffres}").ravel()
+    # Enlève les zéros à gauche (en gardant au moins un chiffre), puis complète chaque nombre jusqu'à largeur
+    zero = alphabet[0].encode("ascii")
+    textes = np.char.lstrip(textes, zero)
+    textes[textes == b""] = zero
+    if largeur:
+        textes = np.char.rjust(textes, largeur, zero)
+    return textes.astype(str).reshape(tableau.shape)
+
+def parse_batch(tableau, base_origine):
+    """
+    parse_batch : convertit un tableau de chaînes de chiffres en entiers
+    Arguments :
+    - tableau : tableau NumPy de chaînes de caractères (ou liste)
+    - base_origine : entier entre 2 et 36 ou alphabet
+    Renvoie :
+    - entiers : tableau NumPy d'entiers (uint64, même forme que tableau)
+    """
+    _verifier_numpy()
+    alphabet = _alphabet(base_origine)
+    base = len(alphabet)
+    tableau = np.asarray(tableau)
+    textes = tableau.astype("S").ravel() # Chaînes ASCII de largeur fixe (complétées par des octets nuls)
+    nb_chiffres = textes.dtype.itemsize
+    depassement_possible = base ** nb_chiffres > 2 ** 64
+
+    # Table caractère -> chiffre (255 : caractère invalide)
+    table = np.full(256, 255, dtype=np.uint8)
+    table[0] = 0
+    for valeur, chiffre in enumerate(alphabet):
+        table[ord(chiffre)] = valeur
+        if isinstance(base_origine, int): # Bases standards : majuscules et minuscules
+            table[ord(chiffre.lower())] = valeur
+    octets = textes.view(np.uint8).reshape(textes.size, nb_chiffres)
+    chiffres = table[octets]
+    if (chiffres == 255).any():
+        ligne, colonne = np.argwhere(chiffres == 255)[0]
+        raise ValueError(f"Chiffre invalide (nombre {ligne}, position {colonne})")
+
+    # Méthode de Horner sur toutes les lignes en même temps (les octets nuls de fin sont ignorés)
+    entiers = np.zeros(textes.size, dtype=np.uint64)
+    base_numpy = np.uint64(base)
+    for position in range(nb_chiffres):
+        presents = octets[:, position] != 0
+        if depassement_possible: # Vérifie que entiers * base + chiffre tient sur 64 bits
+            limite = (np.uint64(2 ** 64 - 1) - chiffres[:, position]) // base_numpy
+            if (presents & (entiers > limite)).any():
+                raise ValueError("Nombres trop grands pour 64 bits")
+        entiers = np.where(presents, entiers * base_numpy + chiffres[:, position], entiers)
+    return entiers.reshape(tableau.shape)
+
+## Entiers de taille fixe (8, 16, 32 ou 64 bits, complément à deux) par paquets
+# En binaire et en hexadécimal, les bits sont affichés tels quels (complément à deux pour les entiers signés) :
+# seule la conversion en décimal dépend du signe
+LARGEURS = (8, 16, 32, 64)
+_cache_motifs_paquets = {} # (base, largeur, signe) -> motif d'un texte valide
+_ESPACES = re.compile(r"\s+")
+
+def vers_complement_a_deux(valeur, largeur):
+    """
+    vers_complement_a_deux : bits d'un entier signé sur une largeur fixe (ex : -1 sur 8 bits -> 255)
+    Arguments :
+    - valeur : entier (positif ou négatif)
+    - largeur : nombre de bits
+    Renvoie :
+    - bits : entier positif (à convertir avec entier_vers_texte ou Number)
+    """
+    if not -(1 << (largeur - 1)) <= valeur < 1 << (largeur - 1):
+        raise ValueError(f"Nombre hors limites pour {largeur} bits")
+    return valeur & ((1 << largeur) - 1)
+
+def depuis_complement_a_deux(bits, largeur):
+    """
+    depuis_complement_a_deux : entier signé représenté par des bits en complément à deux (ex : 255 sur 8 bits -> -1)
+    Arguments :
+    - bits : entier positif
+    - largeur : nombre de bits
+    Renvoie :
+    - valeur : entier
+    """
+    if not 0 <= bits < 1 << largeur:
+        raise ValueError(f"Nombre hors limites pour {largeur} bits")
+    return bits - (1 << largeur) if bits >> (largeur - 1) else bits
+
+def _type_array(largeur, signe):
+    """
+    _type_array : code de type du module array pour des entiers de taille fixe
+    Arguments :
+    - largeur : 8, 16, 32 ou 64 (bits)
+    - signe : booléen
+    Renvoie :
+    - code : caractère
+    """
+    if largeur not in LARGEURS:
+        raise ValueError("Largeur invalide (8, 16, 32 ou 64 bits)")
+    for code in ("bhilq" if signe else "BHILQ"):
+        if array(code).itemsize * 8 == largeur:
+            return code
+
+def _verifier_ordre(ordre):
+    if ordre not in ("little", "big"):
+        raise ValueError("Ordre des octets invalide (little ou big)")
+
+def _octets(donnees, largeur):
+    """
+    _octets : octets d'un objet bytes, bytearray, memoryview ou array (sans copie)
+    Arguments :
+    - donnees : objet compatible avec memoryview
+    - largeur : nombre de bits par entier
+    Renvoie :
+    - octets : memoryview d'octets
+    """
+    octets = memoryview(donnees).cast("B")
+    if len(octets) % (largeur // 8):
+        raise ValueError(f"Taille des données non multiple de {largeur // 8} octets")
+    return octets
+
+def _changer_ordre(octets, largeur):
+    """
+    _changer_ordre : inverse l'ordre des octets de chaque entier (little <-> big endian)
+    Arguments :
+    - octets : objet bytes-like
+    - largeur : nombre de bits par entier
+    Renvoie :
+    - mots : array (compatible avec memoryview et bytes)
+    """
+    mots = array(_type_array(largeur, False))
+    mots.frombytes(octets)
+    mots.byteswap()
+    return mots
+
+def convert_paquets(donnees, largeur, base_destination, signe=False, ordre="little", separateur=" "):
+    """
+    convert_paquets : convertit des entiers de taille fixe placés les uns après les autres dans un tampon
+    (en binaire et en hexadécimal : sans créer d'objet Python par entier)
+    Arguments :
+    - donnees : bytes, bytearray, memoryview ou array
+    - largeur : 8, 16, 32 ou 64 (bits par entier)
+    - base_destination : 2, 10 ou 16
+    - signe : entiers signés (complément à deux), utilisé seulement pour la base 10
+    - ordre : ordre des octets de chaque entier ("little" ou "big")
+    - separateur : caractère ASCII entre deux entiers (pas une lettre ni un chiffre)
+    Renvoie :
+    - texte : chaîne de caractères (chiffres complétés par des zéros à gauche en base 2 et 16)
+
+    Exemple :
+    >>> convert_paquets(bytes([0xFF, 0xFF, 0x02, 0x00]), 16, 10, signe=True)
+    '-1 2'
+    >>> convert_paquets(bytes([0xFF, 0xFF, 0x02, 0x00]), 16, 16)
+    'FFFF 0002'
+    """
+    code = _type_array(largeur, signe)
+    _verifier_ordre(ordre)
+    octets = _octets(donnees, largeur)
+
+    if base_destination == 10:
+        valeurs = array(code)
+        valeurs.frombytes(octets)
+        if ordre != byteorder:
+            valeurs.byteswap()
+        return separateur.join(map(str, valeurs))
+
+    if base_destination not in (2, 16):
+        raise ValueError("Base de destination invalide (2, 10 ou 16)")
+    if len(separateur) != 1 or separateur.isalnum() or not separateur.isascii():
+        raise ValueError("Séparateur invalide (un caractère ASCII, ni lettre ni chiffre)")
+    if ordre == "little" and largeur > 8:
+        octets = memoryview(_changer_ordre(octets, largeur)).cast("B")
+    if base_destination == 16:
+        # bytes.hex() écrit les octets dans l'ordre, avec le séparateur tous les largeur // 8 octets
+        return octets.hex(separateur, largeur // 8).upper()
+
+    # Tous les bits d'un coup (format() est linéaire en base 2), puis chaque colonne de bits est recopiée
+    # à sa place dans le résultat (largeur copies en C au lieu d'une opération par entier)
+    nb_nombres = len(octets) * 8 // largeur
+    if nb_nombres == 0:
+        return ""
+    bits = format(int.from_bytes(octets, "big"), f"0{nb_nombres * largeur}b").encode("ascii")
+    texte = bytearray(nb_nombres * (largeur + 1) - 1)
+    for colonne in range(largeur):
+        texte[colonne::largeur + 1] = bits[colonne::largeur]
+    texte[largeur::largeur + 1] = separateur.encode() * (nb_nombres - 1)
+    return texte.decode("ascii")
+
+def _motif_paquets(base, largeur, signe):
+    """
+    _motif_paquets : motif d'un texte d'entiers de taille fixe séparés par des espaces
+    Arguments :
+    - base : 2, 10 ou 16
+    - largeur : nombre de bits par entier
+    - signe : booléen (signe "-" autorisé en base 10)
+    Renvoie :
+    - motif : expression régulière compilée
+    """
+    cle = (base, largeur, signe)
+    if cle not in _cache_motifs_paquets:
+        if base == 10:
+            nombre = "-?[0-9]+" if signe else "[0-9]+"
+        elif base == 16:
+            nombre = f"[0-9A-Fa-f]{{{largeur // 4}}}"
+        elif base == 2:
+            nombre = f"[01]{{{largeur}}}"
+        else:
+            raise ValueError("Base d'origine invalide (2, 10 ou 16)")
+        _cache_motifs_paquets[cle] = re.compile(rf"\s*(?:{nombre}(?:\s+|\Z))*")
+    return _cache_motifs_paquets[cle]
+
+def _lire_paquets(texte, largeur, base_origine, signe):
+    """
+    _lire_paquets : lecture rapide (sans expression régulière) d'entiers de taille fixe séparés par des espaces
+    En base 2 et 16, les nombres doivent être séparés par un seul caractère, toujours le même (comme avec convert_paquets)
+    Arguments :
+    - texte : chaîne de caractères non vide
+    - largeur : nombre de bits par entier
+    - base_origine : 2, 10 ou 16
+    - signe : booléen
+    Renvoie :
+    - valeurs : array (base 10, ordre des octets de la machine) ou bytes (bases 2 et 16, big endian)
+    (déclenche ValueError si le texte est invalide ou si les séparateurs ne sont pas réguliers)
+    """
+    if base_origine == 10:
+        # Seulement des chiffres et des espaces : int() accepterait aussi "+", "_" et les chiffres non ASCII
+        if texte.encode("ascii").translate(None, b"0123456789 \t\n\r\x0b\x0c" + (b"-" if signe else b"")):
+            raise ValueError("Caractère invalide")
+        return array(_type_array(largeur, signe), map(int, texte.split()))
+
+    nb_chiffres = largeur // 4 if base_origine == 16 else largeur
+    separateur = texte[nb_chiffres:nb_chiffres + 1] or " "
+    if not separateur.isspace():
+        raise ValueError("Séparateur invalide")
+    chiffres = texte.replace(separateur, "")
+    nb_nombres = len(chiffres) // nb_chiffres
+    if len(chiffres) % nb_chiffres or len(texte) != len(chiffres) + nb_nombres - 1 or texte[nb_chiffres::nb_chiffres + 1] != separateur * (nb_nombres - 1):
+        raise ValueError("Séparateurs irréguliers")
+    if base_origine == 16:
+        octets = bytes.fromhex(chiffres)
+        if len(octets) * 2 != len(chiffres): # bytes.fromhex ignore les autres espaces
+            raise ValueError("Espace dans un nombre")
+        return octets
+    if chiffres.encode("ascii").translate(None, b"01"):
+        raise ValueError("Chiffre invalide")
+    return int(chiffres, 2).to_bytes(len(chiffres) // 8, "big")
+
+def parse_paquets(texte, largeur, base_origine, signe=False, ordre="little"):
+    """
+    parse_paquets : inverse de convert_paquets, entiers séparés par des espaces -> tampon d'entiers de taille fixe
+    Arguments :
+    - texte : chaîne de caractères (en base 2 et 16 : exactement largeur bits par entier, zéros à gauche compris)
+    - largeur : 8, 16, 32 ou 64 (bits par entier)
+    - base_origine : 2, 10 ou 16
+    - signe : entiers signés (complément à deux), utilisé seulement pour la base 10
+    - ordre : ordre des octets de chaque entier ("little" ou "big")
+    Renvoie :
+    - octets : bytes
+
+    Exemple :
+    >>> parse_paquets("-1 2", 16, 10, signe=True)
+    b'\\xff\\xff\\x02\\x00'
+    """
+    _type_array(largeur, signe)
+    _verifier_ordre(ordre)
+    motif = _motif_paquets(base_origine, largeur, signe)
+    if not texte or texte.isspace():
+        return b""
+
+    try:
+        try:
+            valeurs = _lire_paquets(texte, largeur, base_origine, signe)
+        except ValueError:
+            # Texte invalide ou espaces irréguliers : vérification complète pour trouver la position de l'erreur
+            valide = motif.match(texte)
+            if valide.end() != len(texte):
+                raise ValueError(f"Nombre invalide à la position {valide.end()}") from None
+            valeurs = _lire_paquets(" ".join(texte.split()), largeur, base_origine, signe)
+    except OverflowError:
+        raise ValueError(f"Nombre hors limites pour {largeur} bits{'' if signe else ' (non signé)'}") from None
+
+    if base_origine == 10:
+        if ordre != byteorder:
+            valeurs.byteswap()
+        return valeurs.tobytes()
+    if ordre == "little" and largeur > 8:
+        return _changer_ordre(valeurs, largeur).tobytes()
+    return valeurs
+
+## Instrumentation (optionnelle, désactivée par défaut : les fonctions ne sont remplacées qu'à l'activation)
+# Activée par la variable d'environnement NCI_PROFIL (texte ou json), NCI_PROFIL_FICHIER (sinon sortie d'erreur)
+# et NCI_PROFIL_MEMOIRE=1 (pic mémoire avec tracemalloc, ralentit beaucoup), ou par activer_profil()
+# Seul le processus principal est mesuré (pas les processus de convert_fichier_parallele)
+FONCTIONS_INSTRUMENTEES = ("convert", "_convert", "convert_flux", "convert_fichier_parallele", "transcoder_flux",
+                           "dec_to_bin", "dec_to_hexa", "bin_to_dec", "bin_to_hexa", "hexa_to_dec", "hexa_to_bin",
+                           "_verifier_chiffres", "_nettoyer", "texte_vers_entier", "entier_vers_texte", "_entier_vers_decimal",
+                           "dump_fichier", "restaurer_dump", "convert_batch", "parse_batch", "convert_paquets", "parse_paquets", "ecrire_entier")
+_profil = None # nom de fonction -> statistiques (None : instrumentation désactivée)
+_options_profil = {"format": "texte", "fichier": None, "memoire": False}
+_pile_profil = threading.local() # Appels instrumentés en cours (par thread), pour le temps propre et le pic mémoire
+
+def _taille(argument):
+    """
+    _taille : taille du premier argument d'une fonction instrumentée
+    Arguments :
+    - argument : valeur quelconque
+    Renvoie :
+    - (taille, unite) : tuple (entier, chaîne de caractères), (None, None) si la taille n'a pas de sens
+    """
+    if isinstance(argument, int):
+        return argument.bit_length(), "bits"
+    if isinstance(argument, str):
+        return len(argument), "caractères"
+    if isinstance(argument, (bytes, bytearray, memoryview)):
+        return len(argument), "octets"
+    return None, None
+
+def _instrumenter(nom, fonction):
+    """
+    _instrumenter : ajoute la mesure des appels, du temps, de la taille des arguments et du pic mémoire à une fonction
+    Arguments :
+    - nom : nom de la fonction dans les statistiques
+    - fonction : fonction à mesurer
+    Renvoie :
+    - fonction_instrumentee : fonction
+    """
+    import tracemalloc
+    statistiques = _profil[nom] = {"appels": 0, "temps_cumule": 0.0, "temps_propre": 0.0, "pic_memoire": 0, "unite": None, "tailles": {}}
+
+    @wraps(fonction)
+    def fonction_instrumentee(*args, **kwargs):
+        pile = _pile_profil.__dict__.setdefault("appels", [])
+        statistiques["appels"] += 1
+        taille, unite = _taille(args[0]) if args else (None, None)
+        if taille is not None:
+            # Histogramme par ordre de grandeur : "<10^3" = moins de 1000
+            cle = f"<10^{len(str(taille))}"
+            statistiques["tailles"][cle] = statistiques["tailles"].get(cle, 0) + 1
+            statistiques["unite"] = unite
+
+        # [temps des appels imbriqués, mémoire au début, pic avant le dernier appel imbriqué]
+        appel = [0.0, 0, 0]
+        memoire = _options_profil["memoire"] and tracemalloc.is_tracing()
+        if memoire:
+            courant, pic = tracemalloc.get_traced_memory()
+            if pile: # Garde le pic de l'appelant avant de remettre le pic à zéro
+                pile[-1][2] = max(pile[-1][2], pic)
+            tracemalloc.reset_peak()
+            appel[1] = courant
+        pile.append(appel)
+        debut = perf_counter()
+        try:
+            return fonction(*args, **kwargs)
+        finally:
+            temps = perf_counter() - debut
+            pile.pop()
+            statistiques["temps_cumule"] += temps
+            statistiques["temps_propre"] += temps - appel[0]
+            if pile:
+                pile[-1][0] += temps
+            if memoire:
+                pic = max(appel[2], tracemalloc.get_traced_memory()[1])
+                statistiques["pic_memoire"] = max(statistiques["pic_memoire"], pic - appel[1])
+                if pile:
+                    pile[-1][2] = max(pile[-1][2], pic)
+    return fonction_instrumentee
+
+def activer_profil(format_sortie="texte", fichier=None, memoire=False):
+    """
+    activer_profil : active l'instrumentation des fonctions de FONCTIONS_INSTRUMENTEES, rapport écrit à la fin du programme
+    Arguments :
+    - format_sortie : "texte" (tableau) ou "json"
+    - fichier : chemin du fichier du rapport (None pour la sortie d'erreur)
+    - memoire : mesurer le pic mémoire de chaque fonction avec tracemalloc (beaucoup plus lent)
+    Renvoie :
+    - None
+    """
+    global _profil
+    import atexit, tracemalloc
+    if format_sortie not in ("texte", "json"):
+        raise ValueError("Format du rapport invalide (texte ou json)")
+    _options_profil.update(format=format_sortie, fichier=fichier, memoire=memoire)
+    if memoire and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if _profil is None:
+        _profil = {}
+        module = globals()
+        for nom in FONCTIONS_INSTRUMENTEES:
+            module[nom] = _instrumenter(nom, module[nom])
+        atexit.register(_ecrire_profil)
+
+def statistiques_profil():
+    """
+    statistiques_profil : statistiques de l'instrumentation
+    Renvoie :
+    - statistiques : dictionnaire {"fonctions": {nom: {...}}, "pic_memoire": octets ou None} (None si désactivée)
+    """
+    import tracemalloc
+    if _profil is None:
+        return None
+    fonctions = {nom: dict(statistiques, tailles=dict(statistiques["tailles"])) for nom, statistiques in _profil.items() if statistiques["appels"]}
+    pic_memoire = tracemalloc.get_traced_memory()[1] if _options_profil["memoire"] and tracemalloc.is_tracing() else None
+    return {"fonctions": fonctions, "pic_memoire": pic_memoire}
+
+def rapport_profil(format_sortie="texte"):
+    """
+    rapport_profil : rapport de l'instrumentation (fonctions triées par temps propre décroissant)
+    Arguments :
+    - format_sortie : "texte" (tableau) ou "json"
+    Renvoie :
+    - rapport : chaîne de caractères
+    """
+    statistiques = statistiques_profil()
+    if statistiques is None:
+        return "Instrumentation désactivée\n"
+    if format_sortie == "json":
+        import json
+        return json.dumps(statistiques, indent=2, ensure_ascii=False) + "\n"
+
+    memoire = statistiques["pic_memoire"] is not None
+    lignes = [f"{'Fonction':<26} {'Appels':>9} {'Cumulé (s)':>11} {'Propre (s)':>11}" + (f" {'Pic (Ko)':>10}" if memoire else "")]
+    fonctions = sorted(statistiques["fonctions"].items(), key=lambda element: element[1]["temps_propre"], reverse=True)
+    for nom, resultat in fonctions:
+        ligne = f"{nom:<26} {resultat['appels']:>9} {resultat['temps_cumule']:>11.6f} {resultat['temps_propre']:>11.6f}"
+        if memoire:
+            ligne += f" {resultat['pic_memoire'] / 1024:>10.1f}"
+        lignes.append(ligne)
+        if resultat["tailles"]:
+            tailles = sorted(resultat["tailles"].items(), key=lambda element: int(element[0][4:]))
+            lignes.append(f"    tailles ({resultat['unite']}) : " + ", ".join(f"{cle} : {nombre}" for cle, nombre in tailles))
+    if memoire:
+        lignes.append(f"Pic mémoire total : {statistiques['pic_memoire'] / 1024:.1f} Ko")
+    return "\n".join(lignes) + "\n"
+
+def _ecrire_profil():
+    """
+    _ecrire_profil : écrit le rapport à la fin du programme (enregistrée avec atexit)
+    """
+    rapport = rapport_profil(_options_profil["format"])
+    if _options_profil["fichier"] is None:
+        stderr.write(rapport)
+    else:
+        with open(_options_profil["fichier"], "w", encoding="utf-8") as fichier:
+            fichier.write(rapport)
+
+if os.environ.get("NCI_PROFIL"):
+    activer_profil(os.environ["NCI_PROFIL"], os.environ.get("NCI_PROFIL_FICHIER"), os.environ.get("NCI_PROFIL_MEMOIRE") == "1")